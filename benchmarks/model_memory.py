@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""Benchmarks the memory held by model instances, with and without
+HBNB_COMPACT_MODELS
+
+Usage: ./benchmarks/model_memory.py [<number of objects>]
+
+Builds that many Review and Place objects (100,000 each by default) the
+way FileStorage.reload() does, once per mode in a fresh interpreter since
+the mode is picked at import time, and prints the bytes per object
+before and after to_dict() was called on them.
+"""
+import os
+import subprocess
+import sys
+import tracemalloc
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+def measure(count):
+    """Prints the bytes allocated per Review and per Place"""
+    from models.place import Place
+    from models.review import Review
+
+    stamp = '2023-12-07T09:49:07.936066'
+    rows = {
+            Review: {'place_id': 'p' * 36, 'user_id': 'u' * 36,
+                     'text': 'Great stay'},
+            Place: {'city_id': 'c' * 36, 'user_id': 'u' * 36,
+                    'name': 'Loft', 'number_rooms': 2, 'max_guest': 4,
+                    'price_by_night': 120, 'latitude': 37.7,
+                    'longitude': -122.4}
+           }
+    for cls, row in rows.items():
+        tracemalloc.start()
+        objs = [cls(id='{:036d}'.format(i), created_at=stamp,
+                    updated_at=stamp, **row) for i in range(count)]
+        built = tracemalloc.get_traced_memory()[0] / count
+        for obj in objs:
+            # what save() does, it gives plain instances a real __dict__
+            obj.to_dict()
+        saved = tracemalloc.get_traced_memory()[0] / count
+        tracemalloc.stop()
+        print("{:<8}{:>8.0f} bytes/object, {:.0f} once saved".format(
+              cls.__name__, built, saved))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--measure':
+        measure(int(sys.argv[2]))
+        sys.exit(0)
+    count = sys.argv[1] if len(sys.argv) > 1 else '100000'
+    for mode in ('0', '1'):
+        print("HBNB_COMPACT_MODELS={}".format(mode))
+        env = dict(os.environ, HBNB_COMPACT_MODELS=mode)
+        env.pop('HBNB_TYPE_STORAGE', None)
+        subprocess.run([sys.executable, __file__, '--measure', count],
+                       env=env, check=True)
@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""Benchmarks filtering Places on their numeric columns
+
+Usage: ./benchmarks/place_filter.py [<number of places>]
+
+Fills the ColumnStore FileStorage keeps for Place with that many rows
+(5,000,000 by default) and times a price and guest count filter, with
+NumPy when it is installed and with the plain loop.
+"""
+import os
+import random
+import sys
+import time
+from unittest.mock import patch
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models.engine import columns  # noqa: E402
+from models.engine.registry import Registry  # noqa: E402
+
+
+def timed(label, func, *args):
+    """Prints how long func(*args) takes and returns its result"""
+    start = time.perf_counter()
+    result = func(*args)
+    print("{:<32}{:>8.3f}s".format(label, time.perf_counter() - start))
+    return result
+
+
+def fill(store, count):
+    """Puts count random places in store"""
+    rand = random.Random(0)
+    for i in range(count):
+        store.put('Place.{}'.format(i), {
+                  'price_by_night': rand.randrange(20, 500),
+                  'max_guest': rand.randrange(1, 12),
+                  'number_rooms': rand.randrange(1, 6),
+                  'number_bathrooms': rand.randrange(1, 4),
+                  'latitude': rand.uniform(-90, 90),
+                  'longitude': rand.uniform(-180, 180)})
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000000
+    store = columns.ColumnStore(Registry.numeric_fields['Place'])
+    timed("fill {} places".format(count), fill, store, count)
+    conditions = {'price_by_night': (None, 100), 'max_guest': (6, None)}
+    if columns.numpy is not None:
+        found = timed("where() with numpy",
+                      lambda: store.where(**conditions))
+    with patch.object(columns, 'numpy', None):
+        found = timed("where() without numpy",
+                      lambda: store.where(**conditions))
+    print("{} matches".format(len(found)))
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""Benchmarks nearest places queries on the spatial index
+
+Usage: ./benchmarks/place_nearby.py [<number of places>]
+
+Fills the GeoIndex FileStorage keeps for Place with that many points
+(1,000,000 by default), half spread over the globe and half packed in a
+few cities, then times nearby() for the 50 nearest places around random
+spots of those cities against a scan of every point.
+"""
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models.engine.geo_index import GeoIndex, distance  # noqa: E402
+
+CITIES = [(48.8566, 2.3522), (40.7128, -74.0060), (35.6762, 139.6503),
+          (-33.8688, 151.2093), (-22.9068, -43.1729)]
+
+
+def fill(index, count):
+    """Puts count random points in index"""
+    rand = random.Random(0)
+    for i in range(count):
+        if i % 2:
+            lat, lon = rand.uniform(-60, 70), rand.uniform(-180, 180)
+        else:
+            lat, lon = rand.choice(CITIES)
+            lat, lon = rand.gauss(lat, 0.1), rand.gauss(lon, 0.1)
+        index.put('Place.{}'.format(i), lat, lon)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    index = GeoIndex()
+    start = time.perf_counter()
+    fill(index, count)
+    print("fill {} places{:>20.3f}s".format(count,
+                                            time.perf_counter() - start))
+    rand = random.Random(1)
+    spots = [(rand.gauss(lat, 0.05), rand.gauss(lon, 0.05))
+             for lat, lon in CITIES for i in range(200)]
+    start = time.perf_counter()
+    for lat, lon in spots:
+        index.nearby(lat, lon, 25, 50)
+    took = (time.perf_counter() - start) / len(spots)
+    print("nearby(), 50 within 25 km{:>16.3f}ms".format(took * 1000))
+    lat, lon = spots[0]
+    start = time.perf_counter()
+    index.within_bbox(lat - 0.01, lon - 0.01, lat + 0.01, lon + 0.01)
+    print("within_bbox(), 0.02 degrees{:>15.3f}ms".format(
+          (time.perf_counter() - start) * 1000))
+    points = [(lat + i * 1e-6, lon) for i in range(count)]
+    start = time.perf_counter()
+    sorted(distance(lat, lon, *point) for point in points)[:50]
+    print("full scan with haversine{:>18.3f}ms".format(
+          (time.perf_counter() - start) * 1000))
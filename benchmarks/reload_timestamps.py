@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""Benchmarks timestamp parsing on a FileStorage reload
+
+Usage: ./benchmarks/reload_timestamps.py [<number of objects>]
+
+Writes a file.json of Review objects (1,000,000 by default) in a
+temporary directory, times FileStorage.reload() on it, then times the
+two timestamps per object with the former strptime() call and with
+parse_time().
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from models.base_model import format_time, parse_time  # noqa: E402
+from models.engine.file_storage import FileStorage  # noqa: E402
+
+
+def timed(label, func, *args):
+    """Prints how long func(*args) takes and returns its result"""
+    start = time.perf_counter()
+    result = func(*args)
+    print("{:<32}{:>8.2f}s".format(label, time.perf_counter() - start))
+    return result
+
+
+def make_store(path, count):
+    """Writes count Review objects to path"""
+    base = datetime(2023, 12, 7, 9, 49, 7, 936066)
+    with open(path, 'w') as f:
+        f.write('{')
+        for i in range(count):
+            stamp = format_time(base + timedelta(microseconds=i))
+            obj = {'id': str(i), 'created_at': stamp, 'updated_at': stamp,
+                   'place_id': 'p', 'user_id': 'u', 'text': 'review',
+                   '__class__': 'Review'}
+            f.write('{}"Review.{}": {}'.format(', ' if i else '', i,
+                                               json.dumps(obj)))
+        f.write('}')
+    return [format_time(base + timedelta(microseconds=i))
+            for i in range(count)] * 2
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, 'file.json')
+        stamps = timed("write {} objects".format(count), make_store,
+                       FileStorage._FileStorage__file_path, count)
+        timed("FileStorage.reload()", FileStorage().reload)
+    tf = "%Y-%m-%dT%H:%M:%S.%f"
+    timed("strptime() x {}".format(len(stamps)),
+          lambda: [datetime.strptime(s, tf) for s in stamps])
+    timed("parse_time() x {}".format(len(stamps)),
+          lambda: [parse_time(s) for s in stamps])
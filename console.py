@@ -10,7 +10,6 @@ from models.state import State
 from models.city import City
 from models.amenity import Amenity
 from models.review import Review
-from os import getenv
 
 
 class HBNBCommand(cmd.Cmd):
@@ -24,7 +23,7 @@ class HBNBCommand(cmd.Cmd):
                'State': State, 'City': City, 'Amenity': Amenity,
                'Review': Review
               }
-    dot_cmds = ['all', 'count', 'show', 'destroy', 'update']
+    dot_cmds = ['all', 'count', 'show', 'destroy', 'update', 'search']
     types = {
              'number_rooms': int, 'number_bathrooms': int,
              'max_guest': int, 'price_by_night': int,
@@ -126,9 +125,20 @@ class HBNBCommand(cmd.Cmd):
             print("** class doesn't exist **")
             return
 
+        parameters = HBNBCommand.parse_params(params)
+        new_instance = HBNBCommand.classes[class_name](**parameters)
+        print(new_instance.id)
+        new_instance.save()
+        storage.save()
+
+    @staticmethod
+    def parse_params(params):
+        """ Parses key=value parameters into a dictionary """
         parameters = {}
         for param in params:
-            key, val = param.split('=')
+            key, sep, val = param.partition('=')
+            if not sep:
+                continue
             if val.startswith('"') and val.endswith('"'):
                 val = val.replace('\"', '')
                 val = val.replace('_', ' ')
@@ -143,12 +153,7 @@ class HBNBCommand(cmd.Cmd):
                 except ValueError:
                     continue
             parameters[key] = val
-            # print(f"{key}: {val}")
-
-        new_instance = HBNBCommand.classes[class_name](**parameters)
-        print(new_instance.id)
-        new_instance.save()
-        storage.save()
+        return parameters
 
     def help_create(self):
         """ Help information for the create method """
@@ -177,11 +182,11 @@ class HBNBCommand(cmd.Cmd):
             print("** instance id missing **")
             return
 
-        key = c_name + "." + c_id
-        try:
-            print(storage._FileStorage__objects[key])
-        except KeyError:
+        obj = storage.get(c_name, c_id)
+        if obj is None:
             print("** no instance found **")
+            return
+        print(obj)
 
     def help_show(self):
         """ Help information for the show command """
@@ -208,13 +213,12 @@ class HBNBCommand(cmd.Cmd):
             print("** instance id missing **")
             return
 
-        key = c_name + "." + c_id
-
-        try:
-            del (storage.all()[key])
-            storage.save()
-        except KeyError:
+        obj = storage.get(c_name, c_id)
+        if obj is None:
             print("** no instance found **")
+            return
+        storage.delete(obj)
+        storage.save()
 
     def help_destroy(self):
         """ Help information for the destroy command """
@@ -223,31 +227,17 @@ class HBNBCommand(cmd.Cmd):
 
     def do_all(self, args):
         """ Shows all objects, or all objects of a class"""
-        print_list = []
         if args:
             args = args.split(' ')[0]  # remove possible trailing args
             if args not in HBNBCommand.classes:
                 print("** class doesn't exist **")
                 return
-            if getenv("HBNB_TYPE_STORAGE") == "db":
-                dicts = storage.all(args)
-                for key in dicts:
-                    if key.split('.')[0] == args:
-                        print_list.append(str(dicts[key]))
-            else:
-                for k, v in storage._FileStorage__objects.items():
-                    if k.split('.')[0] == args:
-                        print_list.append(str(v))
-        else:
-            if getenv("HBNB_TYPE_STORAGE") == "db":
-                dicts = storage.all()
-                for key in dicts:
-                    print_list.append(str(dicts[key]))
-            else:
-                for k, v in storage._FileStorage__objects.items():
-                    print_list.append(str(v))
-        print("[", end="")
-        print(", ".join(print_list), end="]\n")
+        # stream the objects rather than building them all at once
+        prefix = "["
+        for obj in storage.iter(args or None):
+            print(prefix, obj, sep="", end="")
+            prefix = ", "
+        print("[]" if prefix == "[" else "]")
 
     def help_all(self):
         """ Help information for the all command """
@@ -256,15 +246,72 @@ class HBNBCommand(cmd.Cmd):
 
     def do_count(self, args):
         """Count current number of class instances"""
-        count = 0
-        for k, v in storage._FileStorage__objects.items():
-            if args == k.split('.')[0]:
-                count += 1
-        print(count)
+        if not args:
+            print("** class name missing **")
+            return
+
+        c_name, *params = args.split()
+
+        if c_name not in HBNBCommand.classes:
+            print("** class doesn't exist **")
+            return
+
+        filters = HBNBCommand.parse_params(params)
+        cls = HBNBCommand.classes[c_name]
+        for attr in filters:
+            if not HBNBCommand.is_field(cls, attr):
+                print("** attribute doesn't exist **")
+                return
+
+        print(storage.count(c_name, **filters))
+
+    @staticmethod
+    def is_field(cls, name):
+        """ Checks if name is a stored field of cls, a column of its table
+        in DB mode and a plain class attribute in file mode, which methods,
+        properties and relationships are not """
+        if name in ('id', 'created_at', 'updated_at'):
+            return True
+        table = getattr(cls, '__table__', None)
+        if table is not None:
+            return name in table.columns
+        defaults = getattr(cls, '_defaults', None)
+        if defaults is not None:
+            return name in defaults
+        attr = getattr(cls, name, None)
+        return hasattr(cls, name) and not callable(attr) and \
+            not isinstance(attr, property)
 
     def help_count(self):
         """ """
-        print("Usage: count <class_name>")
+        print("Usage: count <class_name> [<key>=<value> ...]")
+
+    def do_search(self, args):
+        """ Shows the objects of a class best matching a text query """
+        c_name, sep, query = args.partition(" ")
+        if not c_name:
+            print("** class name missing **")
+            return
+
+        if c_name not in HBNBCommand.classes:
+            print("** class doesn't exist **")
+            return
+
+        query = query.strip().strip('"')
+        if not query:
+            print("** query missing **")
+            return
+
+        found = storage.search(c_name, query)
+        print("[", end="")
+        print(", ".join(str(obj) for obj in found), end="]\n")
+
+    def help_search(self):
+        """ Help information for the search command """
+        print("Shows the 10 objects of a class best matching a query,")
+        print("searching the name and description of places, and the text")
+        print("of reviews")
+        print("[Usage]: search <className> <query>\n")
 
     def do_update(self, args):
         """ Updates a certain object with new info """
@@ -289,11 +336,9 @@ class HBNBCommand(cmd.Cmd):
             print("** instance id missing **")
             return
 
-        # generate key from class and id
-        key = c_name + "." + c_id
-
-        # determine if key is present
-        if key not in storage.all():
+        # look the object up by class and id
+        new_dict = storage.get(c_name, c_id)
+        if new_dict is None:
             print("** no instance found **")
             return
 
@@ -326,8 +371,12 @@ class HBNBCommand(cmd.Cmd):
 
             args = [att_name, att_val]
 
-        # retrieve dictionary of current objects
-        new_dict = storage.all()[key]
+        # refuse read-only properties and relationships before changing any
+        for att_name in args[::2]:
+            if att_name and \
+                    not HBNBCommand.settable(type(new_dict), att_name):
+                print("** attribute can't be set **")
+                return
 
         # iterate through attr names and values
         for i, att_name in enumerate(args):
@@ -344,11 +393,21 @@ class HBNBCommand(cmd.Cmd):
                 if att_name in HBNBCommand.types:
                     att_val = HBNBCommand.types[att_name](att_val)
 
-                # update dictionary with name, value pair
-                new_dict.__dict__.update({att_name: att_val})
+                # set the attribute, models may not have a __dict__
+                setattr(new_dict, att_name, att_val)
 
         new_dict.save()  # save updates to file
 
+    @staticmethod
+    def settable(cls, name):
+        """ Checks if the attribute name of cls can be set with update,
+        which property getters without a setter and relationships can't """
+        attr = getattr(cls, name, None)
+        if isinstance(attr, property):
+            return attr.fset is not None
+        mapper = getattr(cls, '__mapper__', None)
+        return mapper is None or name not in mapper.relationships
+
     def help_update(self):
         """ Help information for the update class """
         print("Updates an object with new information")
@@ -0,0 +1,22 @@
+#!/usr/bin/python3
+"""Converts a FileStorage snapshot between formats
+
+Usage: ./convert_snapshot.py <source> <destination>
+
+The formats are picked from the file extensions: .bin for binary, .snap
+for mapped, anything else for JSON.
+"""
+import os
+import sys
+
+# importing models would otherwise load the storage of the current
+# directory before converting anything
+os.environ["HBNB_SKIP_RELOAD"] = "1"
+from models.engine.serializers import convert  # noqa: E402
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: {} <source> <destination>".format(sys.argv[0]))
+        sys.exit(1)
+    convert(sys.argv[1], sys.argv[2])
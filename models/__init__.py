@@ -9,4 +9,5 @@ if getenv("HBNB_TYPE_STORAGE") == "db":
 else:
     storage = FileStorage()
 
-storage.reload()
+if getenv("HBNB_SKIP_RELOAD") != "1":
+    storage.reload()
@@ -11,9 +11,59 @@ if getenv("HBNB_TYPE_STORAGE") == 'db':
     Base = declarative_base()
 else:
     Base = object
+compact = getenv("HBNB_COMPACT_MODELS") == "1" and \
+    getenv("HBNB_TYPE_STORAGE") != 'db'
 
 
-class BaseModel:
+def parse_time(value):
+    """Returns the datetime of a timestamp written by format_time()"""
+    if type(value) is datetime:
+        return value
+    # about 50 times faster than strptime("%Y-%m-%dT%H:%M:%S.%f")
+    return datetime.fromisoformat(value)
+
+
+def format_time(value):
+    """Returns a fixed width ISO 8601 timestamp with microseconds"""
+    return value.isoformat(timespec='microseconds')
+
+
+class CompactModel(type):
+    """Metaclass keeping the fields of a model in __slots__
+
+    Used in file mode when HBNB_COMPACT_MODELS=1. Every public data
+    attribute of a class body becomes a slot and its value moves to
+    _defaults, where BaseModel.__getattr__ finds it until the slot is set.
+    The names an instance set, in the order it set them, are kept in its
+    _order slot as a tuple shared by every instance that set the same
+    names in the same order, so __dict__ lists them as a plain instance
+    would.
+    """
+
+    orders = {}
+
+    def __new__(mcs, name, bases, namespace):
+        """Creates a model class with a slot per field"""
+        defaults, fields = {}, []
+        for base in bases:
+            defaults.update(getattr(base, '_defaults', {}))
+            fields.extend(getattr(base, '_fields', ()))
+        slots = list(namespace.get('__slots__', ()))
+        for key, value in list(namespace.items()):
+            if key.startswith('_') or callable(value) or \
+                    isinstance(value, (property, classmethod, staticmethod)):
+                continue
+            if key not in defaults:
+                slots.append(key)
+            defaults[key] = namespace.pop(key)
+        namespace['__slots__'] = tuple(slots)
+        namespace['_defaults'] = defaults
+        namespace['_fields'] = tuple(fields) + tuple(
+            slot for slot in slots if not slot.startswith('_'))
+        return super().__new__(mcs, name, bases, namespace)
+
+
+class BaseModel(metaclass=CompactModel if compact else type):
     """A base class for all hbnb models"""
 
     if getenv("HBNB_TYPE_STORAGE") == 'db':
@@ -21,6 +71,74 @@ class BaseModel:
         created_at = Column(DATETIME, default=datetime.utcnow, nullable=False)
         updated_at = Column(DATETIME, default=datetime.utcnow, nullable=False)
 
+    if compact:
+        # fields live in slots, attributes set by hand in the _extra dict
+        __slots__ = ('id', 'created_at', 'updated_at', '_extra', '_order')
+
+        def __getattr__(self, name):
+            """Returns hand set attributes and defaults of unset fields"""
+            if name == '_extra':
+                return None
+            if name == '_order':
+                return ()
+            extra = self._extra
+            if extra is not None and name in extra:
+                return extra[name]
+            try:
+                return self._defaults[name]
+            except KeyError:
+                raise AttributeError("{!r} object has no attribute {!r}"
+                                     .format(type(self).__name__, name))
+
+        @property
+        def __dict__(self):
+            """Returns a new dict of the attributes set on the instance
+
+            Changing it does not change the instance, use setattr().
+            """
+            attrs = {}
+            extra = self._extra or {}
+            for name in self._order:
+                if name in extra:
+                    attrs[name] = extra[name]
+                else:
+                    try:
+                        attrs[name] = object.__getattribute__(self, name)
+                    except AttributeError:
+                        pass
+            # fields set without going through __setattr__
+            for name in self._fields:
+                if name not in attrs:
+                    try:
+                        attrs[name] = object.__getattribute__(self, name)
+                    except AttributeError:
+                        pass
+            return attrs
+
+        def __put(self, name, value):
+            """Sets a field, or an attribute set by hand"""
+            if hasattr(getattr(type(self), name, None), '__set__'):
+                try:
+                    object.__getattribute__(self, name)
+                    new = False
+                except AttributeError:
+                    new = True
+                object.__setattr__(self, name, value)
+            else:
+                if self._extra is None:
+                    object.__setattr__(self, '_extra', {})
+                new = name not in self._extra
+                self._extra[name] = value
+            if new:
+                order = self._order
+                orders = CompactModel.orders
+                grown = orders.get((order, name))
+                if grown is None:
+                    grown = orders[(order, name)] = order + (name,)
+                object.__setattr__(self, '_order', grown)
+    else:
+        __put = object.__setattr__
+
     def __init__(self, *args, **kwargs):
         """Instatntiates a new model"""
         if not kwargs:
@@ -28,22 +146,26 @@ class BaseModel:
             self.created_at = datetime.now()
             self.updated_at = datetime.now()
         else:
-            tf = "%Y-%m-%dT%H:%M:%S.%f"
             if "updated_at" in kwargs:
-                kwargs["updated_at"] = datetime.strptime(kwargs["updated_at"],
-                                                         tf)
+                kwargs["updated_at"] = parse_time(kwargs["updated_at"])
             else:
                 self.updated_at = datetime.now()
             if "created_at" in kwargs:
-                kwargs["created_at"] = datetime.strptime(kwargs["created_at"],
-                                                         tf)
+                kwargs["created_at"] = parse_time(kwargs["created_at"])
             else:
                 self.created_at = datetime.now()
             if "id" not in kwargs:
                 self.id = str(uuid.uuid4())
             for key in kwargs:
                 if key != "__class__":
-                    setattr(self, key, kwargs[key])
+                    # not stored yet, no need to go through __setattr__
+                    self.__put(key, kwargs[key])
+
+    if getenv("HBNB_TYPE_STORAGE") != 'db':
+        def __setattr__(self, name, value):
+            """Sets an attribute and flags the instance as changed"""
+            self.__put(name, value)
+            models.storage.touch(self, name)
 
     def __str__(self):
         """Returns a string representation of the instance"""
@@ -65,8 +187,8 @@ class BaseModel:
         dictionary.update(self.__dict__)
         dictionary.update({'__class__':
                           (str(type(self)).split('.')[-1]).split('\'')[0]})
-        dictionary['created_at'] = self.created_at.isoformat()
-        dictionary['updated_at'] = self.updated_at.isoformat()
+        dictionary['created_at'] = format_time(self.created_at)
+        dictionary['updated_at'] = format_time(self.updated_at)
         if "_sa_instance_state" in dictionary:
             del dictionary["_sa_instance_state"]
         return dictionary
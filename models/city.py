@@ -3,7 +3,9 @@
 from models.base_model import BaseModel, Base
 from sqlalchemy import Column, String, ForeignKey
 from sqlalchemy.orm import relationship
+from models.place import Place
 from os import getenv
+import models
 
 
 class City(BaseModel, Base):
@@ -17,3 +19,8 @@ class City(BaseModel, Base):
     else:
         state_id = ""
         name = ""
+
+        @property
+        def places(self):
+            """getter for list of places"""
+            return models.storage.related(Place, 'city_id', self.id)
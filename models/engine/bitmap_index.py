@@ -0,0 +1,130 @@
+#!/usr/bin/python3
+"""This module defines the bitmap index storage keeps of place amenities"""
+
+
+class BitmapIndex:
+    """Sets of values of stored objects, as one bitset per value
+
+    Every object gets an ordinal, reused once it is removed, and every
+    value a bitset whose bit n is set when the object of ordinal n holds
+    the value. As in roaring bitmaps a bitset is split in containers of
+    2 ** 16 ordinals, each a Python int, so setting a bit copies one
+    small int instead of the whole set and empty containers take no
+    room. all_of() and any_of() then come down to a bitwise and / or of
+    a few ints per container, whatever the number of objects.
+    """
+
+    shift = 16
+    __low = (1 << shift) - 1
+
+    def __init__(self):
+        """Instantiates an empty index"""
+        self.bits = {}
+        self.__keys = []
+        self.__ordinals = {}
+        self.__values = {}
+        self.__free = []
+
+    def __len__(self):
+        """Returns the number of indexed objects"""
+        return len(self.__ordinals)
+
+    def put(self, key, values):
+        """Stores the values held by the object under key
+
+        Values other than a list, tuple or set count as no values.
+        """
+        if type(values) not in (list, tuple, set, frozenset):
+            values = ()
+        values = frozenset(value for value in values if type(value) is str)
+        old = self.__values.get(key, frozenset())
+        if values == old and key in self.__ordinals:
+            return
+        ordinal = self.__ordinals.get(key)
+        if ordinal is None:
+            ordinal = self.__free.pop() if self.__free else len(self.__keys)
+            if ordinal == len(self.__keys):
+                self.__keys.append(key)
+            else:
+                self.__keys[ordinal] = key
+            self.__ordinals[key] = ordinal
+        for value in old - values:
+            self.__clear(value, ordinal)
+        high, bit = ordinal >> self.shift, 1 << (ordinal & self.__low)
+        for value in values - old:
+            containers = self.bits.get(value)
+            if containers is None:
+                containers = self.bits[value] = {}
+            containers[high] = containers.get(high, 0) | bit
+        self.__values[key] = values
+
+    def remove(self, key):
+        """Drops the object under key"""
+        ordinal = self.__ordinals.pop(key, None)
+        if ordinal is None:
+            return
+        for value in self.__values.pop(key):
+            self.__clear(value, ordinal)
+        self.__keys[ordinal] = None
+        self.__free.append(ordinal)
+
+    def clear(self):
+        """Drops every object"""
+        self.bits.clear()
+        self.__keys.clear()
+        self.__ordinals.clear()
+        self.__values.clear()
+        self.__free.clear()
+
+    def all_of(self, values):
+        """Returns the keys of the objects holding every one of values"""
+        values = list(values)
+        if not values:
+            return [key for key in self.__keys if key is not None]
+        bitsets = sorted((self.bits.get(value, {}) for value in values),
+                         key=len)
+        found = {}
+        for high, mask in bitsets[0].items():
+            for containers in bitsets[1:]:
+                mask &= containers.get(high, 0)
+                if not mask:
+                    break
+            if mask:
+                found[high] = mask
+        return self.keys(found)
+
+    def any_of(self, values):
+        """Returns the keys of the objects holding any one of values"""
+        found = {}
+        for value in values:
+            for high, mask in self.bits.get(value, {}).items():
+                found[high] = found.get(high, 0) | mask
+        return self.keys(found)
+
+    def keys(self, containers):
+        """Returns the keys of the ordinals set in a {container: int}
+        bitset, lowest ordinal first
+        """
+        keys = self.__keys
+        found = []
+        for high in sorted(containers):
+            base = high << self.shift
+            # one pass over the binary digits of the container
+            digits = bin(containers[high])[:1:-1]
+            low = digits.find('1')
+            while low != -1:
+                found.append(keys[base + low])
+                low = digits.find('1', low + 1)
+        return found
+
+    def __clear(self, value, ordinal):
+        """Unsets the bit of ordinal in the bitset of value"""
+        containers = self.bits[value]
+        high = ordinal >> self.shift
+        mask = containers[high] & ~(1 << (ordinal & self.__low))
+        if mask:
+            containers[high] = mask
+        elif len(containers) > 1:
+            del containers[high]
+        else:
+            del self.bits[value]
@@ -4,13 +4,20 @@ import models
 from models.amenity import Amenity
 from models.base_model import BaseModel, Base
 from models.city import City
+from models.engine.geo_index import bounding_boxes, boxes, distance
+from models.engine.query import Query
+from models.engine.registry import Registry
+from models.engine.text_index import TextIndex
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
 from os import getenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import and_, create_engine, event, func, literal, or_, \
+    select
+from sqlalchemy.orm import joinedload, scoped_session, selectinload, \
+    sessionmaker
+from sys import stderr
 
 
 models = {"User": User, "State": State, "City": City,
@@ -19,8 +26,11 @@ models = {"User": User, "State": State, "City": City,
 
 class DBStorage:
     """This class manages dbstorage of hbnb models in JSON format"""
+    batch_size = 500
+    queries = 0
     __engine = None
     __session = None
+    __texts = None
 
     def __init__(self):
         """ init dbstorage"""
@@ -32,6 +42,9 @@ class DBStorage:
                                       format(USER, PWD, HOST, DB,
                                              "?charset=latin1"),
                                       pool_pre_ping=True)
+        self.__texts = {}
+        self.__debug = getenv('HBNB_DEBUG_QUERIES') == "1"
+        event.listen(self.__engine, "before_cursor_execute", self.__counted)
 
         if getenv('HBNB_ENV') == "test":
             Base.metadata.drop_all(self.__engine)
@@ -49,6 +62,118 @@ class DBStorage:
                     objs[obj.__class__.__name__ + '.' + obj.id] = obj
         return objs
 
+    def iter(self, cls=None, batch_size=None):
+        """ yields the objects of cls, or of every class, fetching
+        batch_size rows at a time through a server side cursor """
+        batch_size = batch_size or self.batch_size
+        if cls is None:
+            classes = models.values()
+        else:
+            classes = [cls if type(cls) != str else models[cls]]
+        for cls in classes:
+            yield from self.__session.query(cls).execution_options(
+                stream_results=True).yield_per(batch_size)
+
+    def query(self, cls):
+        """ returns a Query on the objects of cls, run as one SELECT with
+        its WHERE, ORDER BY, LIMIT and OFFSET """
+        cls = cls if type(cls) != str else models[cls]
+        return Query(cls.__name__, self.__run_query,
+                     lambda query: self.count(cls, **query.conditions))
+
+    def __select(self, query, columns=None):
+        """ returns the SQLAlchemy query of the conditions of query """
+        cls = models[query.name]
+        sql = self.__session.query(*(columns or [cls]))
+        if columns is not None:
+            sql = sql.select_from(cls)
+        for attr, cond in query.conditions.items():
+            column = getattr(cls, attr)
+            if type(cond) is not tuple:
+                sql = sql.filter(column == cond)
+                continue
+            low, high = cond
+            if low is not None:
+                sql = sql.filter(column >= low)
+            if high is not None:
+                sql = sql.filter(column <= high)
+        return sql
+
+    def __run_query(self, query):
+        """ returns the results of a Query made by query() """
+        cls = models[query.name]
+        columns = None
+        if query.fields is not None:
+            columns = [getattr(cls, field) for field in query.fields]
+        sql = self.__select(query, columns)
+        for attr, descending in query.ordering:
+            column = getattr(cls, attr)
+            # NULLs last, as FileStorage sorts them
+            sql = sql.order_by(column.is_(None),
+                               column.desc() if descending else column)
+        if query.start:
+            sql = sql.offset(query.start)
+        if query.stop is not None:
+            sql = sql.limit(query.stop)
+        if columns is None:
+            sql = sql.options(*(self.__loader(cls, path)
+                                for path in query.loads))
+            return sql.all()
+        return [dict(zip(query.fields, row)) for row in sql]
+
+    @staticmethod
+    def __loader(cls, path):
+        """ returns the option eagerly loading a dotted path of
+        relationships of cls: a joined load for a single object, one
+        SELECT ... IN per relationship for a collection """
+        option = None
+        for attr in path.split('.'):
+            relation = getattr(cls, attr)
+            many = relation.property.uselist
+            if option is None:
+                option = selectinload(relation) if many \
+                    else joinedload(relation)
+            else:
+                option = option.selectinload(relation) if many \
+                    else option.joinedload(relation)
+            cls = relation.property.mapper.class_
+        return option
+
+    def count(self, cls=None, **filters):
+        """ returns the number of objects, or of objects of cls matching
+        the conditions of filters, with SELECT COUNT(*) """
+        if cls is None:
+            if filters:
+                raise ValueError("count() filters need a class")
+            return sum(self.count(model) for model in models.values())
+        query = self.query(cls).filter(**filters)
+        return self.__select(query, [func.count()]).scalar()
+
+    def exists(self, cls, id):
+        """ checks if an object of cls with that id is stored, with
+        SELECT 1 ... LIMIT 1 """
+        cls = cls if type(cls) != str else models[cls]
+        found = self.__session.query(literal(1)).filter(cls.id == id)
+        return found.limit(1).scalar() is not None
+
+    def get(self, cls, id):
+        """ returns the object of cls with that id, or None, looked up by
+        primary key """
+        cls = cls if type(cls) != str else models[cls]
+        return self.__session.get(cls, id)
+
+    def get_many(self, cls, ids):
+        """ returns the objects of cls with those ids, in the order of
+        ids, read with one IN list per batch_size ids """
+        cls = cls if type(cls) != str else models[cls]
+        ids = list(dict.fromkeys(ids))
+        objs = {}
+        for start in range(0, len(ids), self.batch_size):
+            batch = ids[start:start + self.batch_size]
+            objs.update((obj.id, obj) for obj in self.__session.query(cls)
+                        .filter(cls.id.in_(batch)))
+        return [objs[id] for id in ids if id in objs]
+
     def new(self, obj):
         ''' add the object to the current database session '''
         self.__session.add(obj)
@@ -56,18 +181,124 @@ class DBStorage:
     def save(self):
         ''' saves or writeto db '''
         self.__session.commit()
+        self.__texts = {}
 
     def delete(self, obj=None):
         """ delete from the current database session """
         if obj is not None:
             self.__session.delete(obj)
 
+    def delete_many(self, objs):
+        """ deletes every object of objs then commits once """
+        count = 0
+        for obj in objs:
+            self.__session.delete(obj)
+            count += 1
+        if count:
+            self.save()
+        return count
+
+    def delete_where(self, cls, predicate):
+        """ deletes the objects of cls for which predicate(obj) is true """
+        cls = cls if type(cls) != str else models[cls]
+        return self.delete_many([obj for obj in self.__session.query(cls)
+                                 if predicate(obj)])
+
+    def nearby(self, lat, lon, radius_km, limit=None):
+        """ returns the places at most radius_km from (lat, lon),
+        nearest first, at most limit of them """
+        found = []
+        for place in self.__in_boxes(bounding_boxes(lat, lon, radius_km)):
+            d = distance(lat, lon, place.latitude, place.longitude)
+            if d <= radius_km:
+                found.append((d, place))
+        found.sort(key=lambda item: item[0])
+        return [place for d, place in found[:limit]]
+
+    def within_bbox(self, south, west, north, east):
+        """ returns the places inside a bounding box, which crosses the
+        180th meridian when west is east of east """
+        return self.__in_boxes(boxes(south, west, north, east))
+
+    def __in_boxes(self, boxes):
+        """ returns the places inside any of the boxes, a range scan of
+        the (latitude, longitude) index of places """
+        query = self.__session.query(Place).filter(or_(*[
+            and_(Place.latitude.between(south, north),
+                 Place.longitude.between(west, east))
+            for south, west, north, east in boxes]))
+        return query.all()
+
+    def with_amenities(self, amenities, match_any=False):
+        """ returns the places offering every one of amenities, or any
+        one of them if match_any is true, with a single query grouping
+        place_amenity by place """
+        ids = list(dict.fromkeys(getattr(amenity, 'id', amenity)
+                                 for amenity in amenities))
+        places = self.__session.query(Place)
+        if not ids:
+            return [] if match_any else places.all()
+        table = Base.metadata.tables['place_amenity']
+        matching = select(table.c.place_id) \
+            .where(table.c.amenity_id.in_(ids))
+        if not match_any:
+            matching = matching.group_by(table.c.place_id).having(
+                func.count(table.c.amenity_id.distinct()) == len(ids))
+        return places.filter(Place.id.in_(matching)).all()
+
+    def search(self, cls, query, limit=10):
+        """ returns the objects of cls whose text best matches query, at
+        most limit of them, ranked with BM25 """
+        cls = cls if type(cls) != str else models[cls]
+        fields = Registry.text_fields.get(cls.__name__)
+        if fields is None:
+            return []
+        index = self.__text_index(cls, fields)
+        found = [id for score, id in index.search(query, limit)]
+        if not found:
+            return []
+        objs = {obj.id: obj for obj in self.__session.query(cls)
+                .filter(cls.id.in_(found))}
+        return [objs[id] for id in found if id in objs]
+
+    def __text_index(self, cls, fields):
+        """ returns the text index of cls, indexing its table again when
+        its row count or latest updated_at moved since it was built, as
+        other processes may have changed it """
+        stamp = tuple(self.__session.query(func.max(cls.updated_at),
+                                           func.count(cls.id)).one())
+        stamp_index = self.__texts.get(cls.__name__)
+        if stamp_index is not None and stamp_index[0] == stamp:
+            return stamp_index[1]
+        # texts that did not change are not tokenized again
+        index = TextIndex() if stamp_index is None else stamp_index[1]
+        columns = [getattr(cls, field) for field in fields]
+        stored = set()
+        for row in self.__session.query(cls.id, *columns):
+            index.put(row[0], ' '.join(value for value in row[1:]
+                                       if type(value) is str))
+            stored.add(row[0])
+        for id in index.keys():
+            if id not in stored:
+                index.remove(id)
+        self.__texts[cls.__name__] = (stamp, index)
+        return index
+
     def close(self):
-        """ removes the session """
+        """ removes the session, reporting the number of queries it ran
+        when HBNB_DEBUG_QUERIES is 1 """
         self.__session.close()
+        if self.__debug:
+            print("{} queries".format(self.queries), file=stderr)
+        self.queries = 0
+
+    def __counted(self, *args):
+        """ counts a statement sent to the database """
+        self.queries += 1
 
     def reload(self):
         ''' create all tables in the database '''
         Base.metadata.create_all(self.__engine)
         session = sessionmaker(bind=self.__engine, expire_on_commit=False)
         self.__session = scoped_session(session)
+        self.__texts = {}
@@ -1,47 +1,815 @@
 #!/usr/bin/python3
 """This module defines a class to manage file storage for hbnb clone"""
+import atexit
+import gc
 import json
+import os
+import threading
+from copy import deepcopy
+from heapq import nsmallest
+from itertools import chain, islice
+from os import getenv
+from sys import stderr
+from models.engine.bitmap_index import BitmapIndex
+from models.engine.fsync_policy import FsyncPolicy
+from models.engine.geo_index import GeoIndex
+from models.engine.journal import Journal
+from models.engine.json_stream import ObjectStream
+from models.engine.lazy_object import LazyObject
+from models.engine.mapped_snapshot import MappedSnapshot
+from models.engine.query import Query
+from models.engine.registry import Registry
+from models.engine.serializers import serializer
+from models.engine.symbols import SymbolTable
+from models.engine.text_index import TextIndex
 
 
 class FileStorage:
     """This class manages storage of hbnb models in JSON format"""
     __file_path = 'file.json'
-    __objects = {}
+    __objects = Registry()
+    __journal_mode = getenv("HBNB_FILE_JOURNAL") == "1"
+    __journal_limit = 1 << 22
+    __lazy_mode = getenv("HBNB_FILE_LAZY") == "1"
+    __fsync = FsyncPolicy(getenv("HBNB_FILE_FSYNC", "always"),
+                          int(getenv("HBNB_FILE_FSYNC_MS", "1000")))
+    __write_behind = getenv("HBNB_FILE_WRITE_BEHIND") == "1"
+    __flush_interval = int(getenv("HBNB_FILE_FLUSH_MS", "1000"))
+    __flush_threshold = int(getenv("HBNB_FILE_FLUSH_DIRTY", "10000"))
+    __shard_mode = getenv("HBNB_FILE_SHARDED") == "1"
+    __mmap_mode = getenv("HBNB_FILE_MMAP") == "1"
+    __texts_mode = getenv("HBNB_FILE_SEARCH_INDEX") == "1"
+    __serializer = serializer("mapped" if __mmap_mode else
+                              getenv("HBNB_FILE_FORMAT", "json"))
+    __mapped = (None, None)
+    __shards = {}
+    __stale = set()
+    __symbols = SymbolTable()
+    __scalars = (str, int, float, bool, type(None))
+    __dirty = set()
+    __encoded = {}
+    __tracked = None
+    __loaded = (None, None)
+    __compactor = None
+    __lock = threading.RLock()
+    __wake = threading.Condition(__lock)
+    __pending = False
+    __flusher = None
 
     def all(self, cls=None):
         """Returns a dictionary of models currently in storage"""
+        objects = self.__registry()
+        name = cls if cls is None or type(cls) == str else cls.__name__
+        if FileStorage.__mmap_mode:
+            found = self.__from_map(name)
+            found.update(objects if name is None else objects.partition(name))
+            return found
         if cls is None:
-            return FileStorage.__objects
-        new_dict = {}
-        for key in self.__objects:
-            if (type(self.__objects[key]) == cls):
-                new_dict[key] = self.__objects[key]
-        return new_dict
+            self.__load()
+            return objects
+        self.__load((name,))
+        return self.__hydrated(objects.partition(name))
+
+    def iter(self, cls=None, batch_size=None):
+        """Yields the objects of cls, or every object, building them one
+        at a time
+
+        Lazy objects are built as they are reached and a mapped snapshot
+        is decoded row by row, so the whole set never has to be held at
+        once. batch_size is taken for the sake of DBStorage.iter().
+        """
+        objects = self.__registry()
+        name = cls if cls is None or type(cls) == str else cls.__name__
+        if FileStorage.__mmap_mode:
+            snapshot = FileStorage.__mapped[0]
+            local = objects if name is None else objects.partition(name)
+            if snapshot is not None:
+                classes = self.__classes()
+                for key, val in snapshot.items(name):
+                    if key not in local:
+                        yield classes[val['__class__']](**val)
+            yield from list(local.values())
+            return
+        self.__load(None if name is None else (name,))
+        local = objects if name is None else objects.partition(name)
+        for obj in list(local.values()):
+            yield obj.hydrate() if type(obj) is LazyObject else obj
+
+    def count(self, cls=None, **filters):
+        """Returns the number of models in storage, or of one class
+
+        Without filters it is read from the per class partitions of the
+        registry, with filters only the matching objects are counted,
+        filters being conditions of where().
+        """
+        if cls is not None and type(cls) != str:
+            cls = cls.__name__
+        if filters:
+            if cls is None:
+                raise ValueError("count() filters need a class")
+            return len(self.__select(cls, filters))
+        self.__load(None if cls is None else (cls,))
+        count = self.__registry().count(cls)
+        snapshot = FileStorage.__mapped[0]
+        if FileStorage.__mmap_mode and snapshot is not None:
+            objects = self.__registry()
+            local = objects if cls is None else objects.partition(cls)
+            count += snapshot.count(cls) - sum(key in snapshot
+                                               for key in local)
+        return count
+
+    def exists(self, cls, id):
+        """Checks if an object of cls with that id is stored"""
+        name = cls if type(cls) == str else cls.__name__
+        key = "{}.{}".format(name, id)
+        self.__load((name,))
+        if key in self.__registry():
+            return True
+        snapshot = FileStorage.__mapped[0]
+        return FileStorage.__mmap_mode and snapshot is not None and \
+            key in snapshot
+
+    def get(self, cls, id):
+        """Returns the object of cls with that id, or None"""
+        found = self.get_many(cls, (id,))
+        return found[0] if found else None
+
+    def get_many(self, cls, ids):
+        """Returns the objects of cls with those ids, in the order of ids,
+        leaving out the ids that are not stored
+        """
+        name = cls if type(cls) == str else cls.__name__
+        self.__load((name,))
+        objects = self.__registry()
+        snapshot = FileStorage.__mapped[0] if FileStorage.__mmap_mode \
+            else None
+        found = []
+        for id in dict.fromkeys(ids):
+            key = "{}.{}".format(name, id)
+            obj = objects.get(key)
+            if obj is None and snapshot is not None:
+                val = snapshot.get(key)
+                if val is not None:
+                    obj = self.__classes()[val['__class__']](**val)
+            if type(obj) is LazyObject:
+                obj = obj.hydrate()
+            if obj is not None:
+                found.append(obj)
+        return found
 
     def new(self, obj):
         """Adds new object to storage dictionary"""
-        self.__objects["{}.{}".format(type(obj).__name__, obj.id)] = obj
+        name = type(obj).__name__
+        key = "{}.{}".format(name, obj.id)
+        symbols = FileStorage.__symbols
+        for attr in self.__symbol_attrs(name):
+            value = getattr(obj, attr, None)
+            symbol = symbols.intern(value)
+            if symbol is not value:
+                # same string, no need to flag the object as changed
+                object.__setattr__(obj, attr, symbol)
+        with FileStorage.__lock:
+            self.__registry()[key] = obj
+            FileStorage.__dirty.add(key)
+
+    def touch(self, obj, attr=None):
+        """Flags a stored object as changed since the last save"""
+        key = "{}.{}".format(type(obj).__name__, getattr(obj, 'id', None))
+        with FileStorage.__lock:
+            if FileStorage.__objects.get(key) is obj:
+                FileStorage.__dirty.add(key)
+                self.__registry().relink(key, attr)
+
+    def symbol_stats(self):
+        """Returns how many foreign key and class name strings are shared
+
+        bytes_saved is the size of the duplicate copies dropped since the
+        start, bytes_held the size of the strings kept in their place.
+        """
+        return FileStorage.__symbols.stats()
+
+    def related(self, cls, attr, value):
+        """Returns the stored objects of cls whose attr equals value"""
+        name = cls if type(cls) == str else cls.__name__
+        objects = self.__registry()
+        self.__load((name,))
+        found = objects.related(name, attr, value)
+        if found is None:
+            found = {key: obj for key, obj in objects.partition(name).items()
+                     if objects.value(obj, attr) == value}
+        found = self.__hydrated(found)
+        if FileStorage.__mmap_mode:
+            mapped = self.__from_map(name, attr, value)
+            mapped.update(found)
+            found = mapped
+        return list(found.values())
+
+    def where(self, cls, **conditions):
+        """Returns the stored objects of cls matching every condition
+
+        A condition is either a value the attribute must equal or a (low,
+        high) tuple of inclusive bounds where None leaves a side open,
+        e.g. where(Place, price_by_night=(None, 100), max_guest=(4, None)).
+        Numeric fields kept in columns are filtered a column at a time.
+        """
+        name = cls if type(cls) == str else cls.__name__
+        return list(self.__hydrated(self.__select(name, conditions)).values())
+
+    def query(self, cls):
+        """Returns a Query on the stored objects of cls
+
+        It runs on the indexes where() uses, and only the objects of the
+        requested page are built in lazy mode.
+        """
+        name = cls if type(cls) == str else cls.__name__
+        return Query(name, self.__run_query,
+                     lambda query: self.count(query.name, **query.conditions))
+
+    def nearby(self, lat, lon, radius_km, limit=None):
+        """Returns the places at most radius_km from (lat, lon), nearest
+        first, at most limit of them
+        """
+        index, places = self.__located()
+        found = index.nearby(lat, lon, radius_km, limit)
+        return list(self.__hydrated({key: places[key]
+                                     for d, key in found}).values())
+
+    def within_bbox(self, south, west, north, east):
+        """Returns the places inside a bounding box, which crosses the
+        180th meridian when west is east of east
+        """
+        index, places = self.__located()
+        found = index.within_bbox(south, west, north, east)
+        return list(self.__hydrated({key: places[key]
+                                     for key in found}).values())
+
+    def with_amenities(self, amenities, match_any=False):
+        """Returns the places offering every one of amenities, or any one
+        of them if match_any is true
+
+        amenities are Amenity objects or ids, matched against the
+        amenity_ids of places with a bitwise and / or of their bitmaps.
+        """
+        ids = [getattr(amenity, 'id', amenity) for amenity in amenities]
+        bitmap, places = self.__marked()
+        found = bitmap.any_of(ids) if match_any else bitmap.all_of(ids)
+        return list(self.__hydrated({key: places[key]
+                                     for key in found}).values())
+
+    def search(self, cls, query, limit=10):
+        """Returns the stored objects of cls whose text best matches query,
+        at most limit of them, ranked with BM25
+
+        Only the text fields of Registry.text_fields are searched, other
+        classes never match.
+        """
+        name = cls if type(cls) == str else cls.__name__
+        index, objects = self.__text_index(name)
+        if index is None:
+            return []
+        found = index.search(query, limit)
+        return list(self.__hydrated({key: objects[key]
+                                     for score, key in found}).values())
 
     def save(self):
-        """Saves storage dictionary to file"""
-        with open(FileStorage.__file_path, 'w') as f:
-            temp = {}
-            temp.update(FileStorage.__objects)
-            for key, val in temp.items():
-                temp[key] = val.to_dict()
-            json.dump(temp, f)
+        """Saves storage dictionary to file
+
+        In write-behind mode the write is left to the flusher thread,
+        which runs at most every __flush_interval ms unless more than
+        __flush_threshold objects are waiting.
+        """
+        if not FileStorage.__write_behind:
+            self.__write()
+            return
+        with FileStorage.__lock:
+            FileStorage.__pending = True
+            self.__start_flusher()
+            if len(FileStorage.__dirty) >= FileStorage.__flush_threshold:
+                FileStorage.__wake.notify()
+
+    def flush(self):
+        """Writes the saves held back by write-behind mode right away"""
+        if FileStorage.__pending:
+            self.__write()
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside if not do None"""
         if obj is None:
             return
-        for key in self.__objects:
-            if (self.__objects[key] == obj):
-                del self.__objects[key]
+        key = self.__key(obj)
+        with FileStorage.__lock:
+            if self.__registry().pop(key, None) is not None:
+                FileStorage.__dirty.add(key)
+
+    def delete_many(self, objs):
+        """Deletes every object of objs then saves once"""
+        count = 0
+        objects = self.__registry()
+        with FileStorage.__lock:
+            for obj in objs:
+                key = self.__key(obj)
+                if objects.pop(key, None) is not None:
+                    FileStorage.__dirty.add(key)
+                    count += 1
+        if count:
+            self.save()
+        return count
+
+    def delete_where(self, cls, predicate):
+        """Deletes the objects of cls for which predicate(obj) is true"""
+        return self.delete_many([obj for obj in self.all(cls).values()
+                                 if predicate(obj)])
+
+    def reload(self, limit=None, progress=None):
+        """Loads storage dictionary from file
+
+        The file is streamed one object at a time. limit stops the load
+        after that many objects and progress, when given, is called with
+        the number of objects read every 10000 objects and at the end.
+        """
+        classes = self.__classes()
+        self.flush()
+        with FileStorage.__lock:
+            objects = self.__registry()
+            if FileStorage.__mmap_mode:
+                self.__map()
+                return
+            # index what gets stored once it is all there, class by class,
+            # and keep the collector from scanning every object built so
+            # far again and again while nothing built can be garbage
+            objects.defer()
+            collecting = gc.isenabled()
+            gc.disable()
+            try:
+                if self.__sharded():
+                    self.__reload_shards(classes, limit, progress)
+                else:
+                    self.__reload_file(classes, limit, progress)
+            finally:
+                objects.defer(FileStorage.__lazy_mode)
+                if collecting:
+                    gc.enable()
+
+    def __reload_file(self, classes, limit, progress):
+        """Merges the snapshot and the journal into storage"""
+        stamp = self.__stamp()
+        if stamp[0] is None and self.__split():
+            raise ValueError("storage is split in one file per class, set "
+                             "HBNB_FILE_SHARDED=1 to read it")
+        loaded = FileStorage.__loaded
+        if stamp[0] is not None and not FileStorage.__dirty and \
+                loaded[0] is FileStorage.__objects and loaded[1] == stamp \
+                and limit is None:
+            return
+        overrides = {}
+        for rec in self.__journal().replay():
+            overrides[rec[1]] = rec[2] if rec[0] == 'set' else None
+        count = 0
+        try:
+            for key, entry, val in self.__read(self.__snapshot()):
+                if count == limit:
+                    break
+                if key not in overrides:
+                    self.__merge(classes, key, val, entry)
+                count += 1
+                if progress is not None and count % 10000 == 0:
+                    progress(count)
+        except FileNotFoundError:
+            pass
+        for key, val in overrides.items():
+            if count == limit:
                 break
+            if val is None:
+                self.all().pop(key, None)
+                self.__cache().pop(key, None)
+            else:
+                self.__merge(classes, key, val)
+                count += 1
+        if progress is not None:
+            progress(count)
+        if count == limit:
+            FileStorage.__loaded = (None, None)
+        else:
+            FileStorage.__loaded = (FileStorage.__objects, stamp)
+        if FileStorage.__shard_mode and not FileStorage.__journal_mode:
+            # first start on a single file, split it on the next save
+            FileStorage.__dirty.update(FileStorage.__objects)
+
+    def close(self):
+        """ calls reload() """
+        self.reload()
+
+    def compact(self, wait=False):
+        """Folds the journal back into the snapshot in the background"""
+        with FileStorage.__lock:
+            if FileStorage.__journal_mode:
+                self.__write()
+            if not self.__compacting():
+                journal = self.__journal()
+                if journal.rotate():
+                    FileStorage.__compactor = threading.Thread(
+                        target=journal.compact, daemon=True,
+                        args=(self.__snapshot(), FileStorage.__lock))
+                    FileStorage.__compactor.start()
+        if wait:
+            self.__wait_compactor()
+
+    def __write(self):
+        """Writes every change since the last write to disk"""
+        if FileStorage.__mmap_mode:
+            raise PermissionError("storage is mapped read-only "
+                                  "(HBNB_FILE_MMAP is set)")
+        if not FileStorage.__journal_mode:
+            self.__wait_compactor()
+        with FileStorage.__lock:
+            dirty = self.__take_dirty()
+            try:
+                if FileStorage.__journal_mode:
+                    self.__append(dirty)
+                elif FileStorage.__shard_mode:
+                    self.__write_shards(dirty)
+                else:
+                    self.__dump(self.__snapshot(), FileStorage.__objects,
+                                dirty)
+                    self.__save_texts()
+                    self.__forget_deleted(dirty)
+                    self.__journal().discard()
+                    FileStorage.__loaded = (FileStorage.__objects,
+                                            self.__stamp())
+            except BaseException:
+                # nothing was written, the next write retries every change
+                FileStorage.__dirty |= dirty
+                raise
+            FileStorage.__pending = False
+
+    @staticmethod
+    def __take_dirty():
+        """Returns the keys changed since the last write and starts a new
+        set for the changes made while they are written
+
+        Called with __lock held, which new(), touch() and delete() take
+        too, so no change lands in the set being written.
+        """
+        dirty = FileStorage.__dirty
+        FileStorage.__dirty = set()
+        return dirty
+
+    def __write_shards(self, dirty):
+        """Rewrites the per class files holding the changed objects"""
+        objects = self.__registry()
+        names = {key.partition('.')[0] for key in dirty}
+        self.__load(names)
+        for name in names:
+            self.__dump(self.__shard(name), objects.partition(name), dirty)
+        self.__forget_deleted(dirty)
+        for name in names:
+            stamp = self.__file_stamp(self.__shard(name))
+            FileStorage.__shards[name] = (objects, stamp)
+        if FileStorage.__loaded[0] is objects and \
+                os.path.exists(self.__snapshot()):
+            # every object of the single file it was read from is in the
+            # class files now, reload() would read the stale file instead
+            os.remove(self.__snapshot())
+            FileStorage.__loaded = (None, None)
+
+    def __sharded(self):
+        """Checks if reload() should read the per class files
+
+        A single storage file left from before sharding was enabled is
+        still read as a whole until the first save splits it, which
+        removes it once every class file is written.
+        """
+        if not FileStorage.__shard_mode or FileStorage.__journal_mode:
+            return False
+        return not os.path.exists(self.__snapshot())
+
+    def __split(self):
+        """Checks if per class files are there"""
+        return any(os.path.exists(self.__shard(name))
+                   for name in self.__classes())
+
+    def __reload_shards(self, classes, limit, progress):
+        """Reloads the per class files
+
+        The files of classes already in memory are reloaded right away,
+        the others are only read once their class is asked for.
+        """
+        objects = FileStorage.__objects
+        if limit is not None or progress is not None:
+            count = 0
+            for name in classes:
+                count = self.__load_shard(classes, name, count, limit,
+                                          progress)
+                if count == limit:
+                    break
+            if progress is not None:
+                progress(count)
+            return
+        for name in classes:
+            if FileStorage.__shards.get(name, (None,))[0] is objects:
+                self.__load_shard(classes, name)
+            else:
+                FileStorage.__stale.add(name)
+
+    def __load(self, names=None):
+        """Reads the per class files of names still waiting to be read"""
+        if not FileStorage.__stale:
+            return
+        with FileStorage.__lock:
+            stale = FileStorage.__stale
+            names = set(stale) if names is None else stale.intersection(names)
+            if names:
+                classes = self.__classes()
+                for name in names:
+                    self.__load_shard(classes, name)
+
+    def __load_shard(self, classes, name, count=0, limit=None,
+                     progress=None):
+        """Merges the objects of one per class file into storage
+
+        Returns count plus the number of objects read.
+        """
+        objects = self.__registry()
+        path = self.__shard(name)
+        stamp = self.__file_stamp(path)
+        FileStorage.__stale.discard(name)
+        prefix = name + '.'
+        if limit is None and stamp is not None and \
+                FileStorage.__shards.get(name) == (objects, stamp) and \
+                not any(key.startswith(prefix) for key in FileStorage.__dirty):
+            return count
+        try:
+            for key, entry, val in self.__read(path):
+                if count == limit:
+                    break
+                self.__merge(classes, key, val, entry)
+                count += 1
+                if progress is not None and count % 10000 == 0:
+                    progress(count)
+        except FileNotFoundError:
+            pass
+        if count == limit:
+            FileStorage.__shards.pop(name, None)
+        else:
+            FileStorage.__shards[name] = (objects, stamp)
+        return count
+
+    def __map(self):
+        """Maps the snapshot again if the file changed since last time
+
+        The previous mapping is left to the garbage collector, so objects
+        being decoded from it by another thread are not cut short.
+        """
+        path = self.__snapshot()
+        stamp = self.__file_stamp(path)
+        if stamp == FileStorage.__mapped[1]:
+            return
+        snapshot = None
+        if stamp is not None:
+            with open(path, 'rb') as f:
+                snapshot = MappedSnapshot(f)
+        FileStorage.__mapped = (snapshot, stamp)
 
-    def reload(self):
-        """Loads storage dictionary from file"""
+    def __from_map(self, name=None, attr=None, value=None):
+        """Returns the objects of a class name, or all, decoded from the
+        mapped snapshot, only those whose attr equals value if given
+        """
+        snapshot = FileStorage.__mapped[0]
+        if snapshot is None:
+            return {}
+        if attr is None:
+            items = snapshot.items(name)
+        else:
+            items = snapshot.related(name, attr, value)
+            if items is None:
+                items = [(key, val) for key, val in snapshot.items(name)
+                         if val.get(attr) == value]
+        classes = self.__classes()
+        return {key: classes[val['__class__']](**val) for key, val in items}
+
+    def __located(self):
+        """Returns the spatial index of places and the places it holds
+
+        A mapped snapshot has no index, so one is built from a scan.
+        """
+        objects = self.__registry()
+        self.__load(('Place',))
+        if not FileStorage.__mmap_mode:
+            objects.index('Place')
+            return objects.geo['Place'], objects
+        places = self.__mapped_places()
+        index = GeoIndex()
+        lat, lon = Registry.geo_fields['Place']
+        for key, obj in places.items():
+            index.put(key, Registry.own_value(obj, lat),
+                      Registry.own_value(obj, lon))
+        return index, places
+
+    def __marked(self):
+        """Returns the amenity bitmaps of places and the places they hold
+
+        A mapped snapshot has no bitmaps, so they are built from a scan.
+        """
+        objects = self.__registry()
+        self.__load(('Place',))
+        if not FileStorage.__mmap_mode:
+            objects.index('Place')
+            return objects.bitmaps['Place'], objects
+        places = self.__mapped_places()
+        bitmap = BitmapIndex()
+        attr = Registry.bitmap_fields['Place']
+        for key, obj in places.items():
+            bitmap.put(key, getattr(obj, attr, None))
+        return bitmap, places
+
+    def __select(self, name, conditions):
+        """Returns {key: obj} of the objects of a class name matching the
+        conditions of where(), lazy objects left as they are
+
+        Numeric fields kept in columns are filtered a column at a time,
+        and an equality on an indexed foreign key starts from its index.
+        """
+        objects = self.__registry()
+        self.__load((name,))
+        objects.index(name)
+        store = objects.columns.get(name)
+        columnar = {}
+        if store is not None and not FileStorage.__mmap_mode:
+            columnar = {attr: cond for attr, cond in conditions.items()
+                        if attr in store.fields}
+        linked = [attr for attr, cond in conditions.items()
+                  if type(cond) is not tuple and
+                  attr in Registry.foreign_keys.get(name, ())]
+        if columnar:
+            found = {key: objects[key] for key in store.where(**columnar)}
+        elif FileStorage.__mmap_mode:
+            found = self.__from_map(name)
+            found.update(objects.partition(name))
+        elif linked:
+            found = objects.related(name, linked[0], conditions[linked[0]])
+            columnar = {linked[0]: conditions[linked[0]]}
+        else:
+            found = objects.partition(name)
+        others = [(attr, cond) for attr, cond in conditions.items()
+                  if attr not in columnar]
+        if not others:
+            return dict(found)
+        return {key: obj for key, obj in found.items()
+                if all(self.__matches(objects.value(obj, attr), cond)
+                       for attr, cond in others)}
+
+    def __run_query(self, query):
+        """Returns the results of a Query made by query()"""
+        objects = self.__registry()
+        found = self.__select(query.name, query.conditions)
+        start, stop = query.start, query.stop
+        end = None if stop is None else start + stop
+        if query.ordering:
+            key = query.sort_key(objects.value)
+            if end is None:
+                objs = sorted(found.values(), key=key)[start:]
+            else:
+                objs = nsmallest(end, found.values(), key=key)[start:]
+        else:
+            objs = list(islice(found.values(), start, end))
+        if query.fields is not None:
+            return [{field: objects.value(obj, field)
+                     for field in query.fields} for obj in objs]
+        if FileStorage.__lazy_mode:
+            return [obj.hydrate() if type(obj) is LazyObject else obj
+                    for obj in objs]
+        return objs
+
+    def __text_index(self, name):
+        """Returns the text index of a class name and the objects it
+        holds, (None, None) if the class has no text fields
+
+        A mapped snapshot has no index, so one is built from a scan.
+        """
+        objects = self.__registry()
+        if name not in Registry.text_fields:
+            return None, None
+        self.__load((name,))
+        if not FileStorage.__mmap_mode:
+            if name not in objects.texts:
+                objects.text_index(name, self.__load_text(name))
+            objects.index(name)
+            return objects.texts[name], objects
+        found = self.__from_map(name)
+        found.update(objects.partition(name))
+        index = TextIndex()
+        for key, obj in found.items():
+            index.put(key, ' '.join(
+                value for value in (getattr(obj, attr, None)
+                                    for attr in Registry.text_fields[name])
+                if type(value) is str))
+        return index, found
+
+    def __texts_path(self):
+        """Returns the path of the file the text indexes are saved to"""
+        return os.path.splitext(FileStorage.__file_path)[0] + '.search.json'
+
+    def __save_texts(self):
+        """Saves the text indexes built so far next to the snapshot if
+        they changed, keeping the saved ones of the other classes
+        """
+        objects = self.__registry()
+        texts = objects.texts
+        if not FileStorage.__texts_mode or not texts:
+            return
+        objects.index(*texts)
+        if not any(index.changed for index in texts.values()):
+            return
+        data = self.__saved_texts()
+        data.update((name, index.dump()) for name, index in texts.items())
+        FileStorage.__fsync.write(self.__texts_path(), [json.dumps(data)])
+        for index in texts.values():
+            index.changed = False
+
+    def __saved_texts(self):
+        """Returns the text indexes saved next to the snapshot"""
+        try:
+            with open(self.__texts_path(), 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if type(data) is dict else {}
+
+    def __load_text(self, name):
+        """Returns the saved text index of a class name, None if there is
+        none or HBNB_FILE_SEARCH_INDEX is off
+
+        Registry.text_index() indexes again the objects whose text
+        changed since and drops those deleted since.
+        """
+        if not FileStorage.__texts_mode:
+            return None
+        index = TextIndex()
+        if not index.load(self.__saved_texts().get(name)):
+            return None
+        return index
+
+    def __mapped_places(self):
+        """Returns the places of the mapped snapshot and the new ones"""
+        places = self.__from_map('Place')
+        places.update(self.__registry().partition('Place'))
+        return places
+
+    def __shard(self, name):
+        """Returns the path of the file holding the objects of a class"""
+        root = os.path.splitext(FileStorage.__file_path)[0]
+        return '{}.{}{}'.format(root, name, FileStorage.__serializer.extension)
+
+    def __snapshot(self):
+        """Returns the path of the snapshot in the configured format
+
+        It is __file_path itself for JSON, and __file_path with the
+        extension of the format otherwise, e.g. file.bin.
+        """
+        extension = FileStorage.__serializer.extension
+        if extension == '.json':
+            return FileStorage.__file_path
+        return os.path.splitext(FileStorage.__file_path)[0] + extension
+
+    def __read(self, path):
+        """Yields (key, raw entry, value) for the objects of a snapshot
+
+        The raw entry is the JSON text of the object, or None in the other
+        formats, whose objects are always rebuilt by reload(). The value
+        is None when the entry was not decoded yet.
+        """
+        serializer = FileStorage.__serializer
+        if serializer.binary:
+            with open(path, 'rb') as f:
+                for key, val in serializer.load(f):
+                    yield key, None, val
+        else:
+            with open(path, 'r') as f:
+                for item in ObjectStream(f, decode=False):
+                    yield item
+
+    def __dump(self, path, objects, dirty):
+        """Writes objects to path in the configured format, dirty being
+        the keys changed since the last write
+        """
+        serializer = FileStorage.__serializer
+        if serializer.binary:
+            chunks = serializer.dump((key, self.__dict_of(obj))
+                                     for key, obj in objects.items())
+        else:
+            chunks = chain('{', self.__encode(objects, dirty), '\n}')
+        FileStorage.__fsync.write(path, chunks, serializer.binary)
+
+    @staticmethod
+    def __dict_of(obj):
+        """Returns to_dict() of obj, without building lazy objects"""
+        if type(obj) is LazyObject and obj._obj is None:
+            return obj.fields()
+        return obj.to_dict()
+
+    @staticmethod
+    def __classes():
+        """Returns the model classes by name"""
         from models.base_model import BaseModel
         from models.user import User
         from models.place import Place
@@ -50,20 +818,284 @@ class FileStorage:
         from models.amenity import Amenity
         from models.review import Review
 
-        classes = {
-                    'BaseModel': BaseModel, 'User': User, 'Place': Place,
-                    'State': State, 'City': City, 'Amenity': Amenity,
-                    'Review': Review
-                  }
+        return {
+                'BaseModel': BaseModel, 'User': User, 'Place': Place,
+                'State': State, 'City': City, 'Amenity': Amenity,
+                'Review': Review
+               }
+
+    def __start_flusher(self):
+        """Starts the write-behind thread unless it is running already"""
+        if FileStorage.__flusher is None:
+            FileStorage.__flusher = threading.Thread(target=self.__flush_loop,
+                                                     daemon=True)
+            FileStorage.__flusher.start()
+            atexit.register(self.flush)
+
+    def __flush_loop(self):
+        """Body of the write-behind thread"""
+        while True:
+            with FileStorage.__lock:
+                FileStorage.__wake.wait(FileStorage.__flush_interval / 1000)
+                if not FileStorage.__pending:
+                    continue
+            try:
+                self.flush()
+            except Exception as e:
+                # the changes stay pending, the next round or flush() retries
+                print("** write-behind flush failed: {!r} **".format(e),
+                      file=stderr)
+
+    def __append(self, dirty):
+        """Writes a journal record for every changed object of dirty"""
+        records = []
+        for key in dirty:
+            obj = FileStorage.__objects.get(key)
+            if obj is None:
+                records.append(['del', key])
+            else:
+                records.append(['set', key, obj.to_dict()])
+        cache = self.__cache()
+        for key in dirty:
+            cache.pop(key, None)
+        if not records:
+            return
+        size = self.__journal().append(records)
+        self.__saved()
+        if size > FileStorage.__journal_limit:
+            self.compact()
+
+    def __merge(self, classes, key, val, entry=None):
+        """Puts a serialized object into storage unless it is unchanged
+
+        entry is the raw text of the object in the snapshot file, an
+        object whose cached entry matches it is kept as it is, without
+        decoding the entry when val is None.
+        """
+        cache = self.__cache()
+        cached = cache.get(key)
+        obj = FileStorage.__objects.get(key)
+        stamp = None if entry is None else hash(entry)
+        if stamp is not None and cached is not None and \
+                cached[1] == stamp and cached[0] is obj and \
+                key not in FileStorage.__dirty and \
+                not self.__mutated(obj, cached[3]):
+            return
+        if val is None and FileStorage.__lazy_mode:
+            # the text is all a lazy object holds until it is used, the
+            # cache shares it
+            obj = LazyObject(key, classes[key.partition('.')[0]], entry,
+                             FileStorage.__hydrate, FileStorage.__decode)
+            FileStorage.__objects[key] = obj
+            FileStorage.__dirty.discard(key)
+            cache[key] = (obj, stamp, entry, None)
+            return
+        if val is None:
+            val = ObjectStream.value(entry)
+        name = self.__intern(val)
+        if FileStorage.__lazy_mode:
+            obj = LazyObject(key, classes[name], val, FileStorage.__hydrate)
+        else:
+            obj = classes[name](**val)
+        FileStorage.__objects[key] = obj
+        FileStorage.__dirty.discard(key)
+        if entry is None:
+            cache.pop(key, None)
+        else:
+            # the text itself is not kept, it would double the memory
+            cache[key] = (obj, stamp, None, self.__copies(val))
+
+    @staticmethod
+    def __intern(val):
+        """Interns the strings of a serialized object worth it and returns
+        its class name
+        """
+        symbols = FileStorage.__symbols
+        name = val['__class__']
+        if FileStorage.__lazy_mode:
+            # only a lazy object keeps val, and with it the name
+            name = val['__class__'] = symbols.intern(name)
+        for attr in FileStorage.__symbol_attrs(name):
+            if attr in val:
+                val[attr] = symbols.intern(val[attr])
+        return name
+
+    @staticmethod
+    def __matches(value, cond):
+        """Checks value against a condition of where()"""
+        if type(cond) is not tuple:
+            return value == cond
+        low, high = cond
+        try:
+            return (low is None or value >= low) and \
+                (high is None or value <= high)
+        except TypeError:
+            return False
+
+    @staticmethod
+    def __symbol_attrs(name):
+        """Returns the attributes of a class name worth interning
+
+        These are its foreign keys, plus its id when other classes point
+        to it, so that children and parent share one copy of the id.
+        """
+        attrs = Registry.foreign_keys.get(name, ())
+        if name in Registry.referenced:
+            attrs = attrs + ('id',)
+        return attrs
+
+    @staticmethod
+    def __hydrate(stub):
+        """Builds the model instance a LazyObject stands for"""
+        with FileStorage.__lock:
+            val = stub.fields()
+            obj = stub._cls(**val)
+            if FileStorage.__objects.get(stub._key) is stub:
+                FileStorage.__objects[stub._key] = obj
+                cache = FileStorage.__cache()
+                cached = cache.get(stub._key)
+                if cached is not None and cached[0] is stub:
+                    # the lists of val are the object's own from now on
+                    cache[stub._key] = (obj, cached[1], cached[2],
+                                        FileStorage.__copies(val))
+            return obj
+
+    @staticmethod
+    def __decode(stub):
+        """Decodes the fields of a LazyObject holding its entry text"""
+        with FileStorage.__lock:
+            val = ObjectStream.value(stub._raw)
+            FileStorage.__intern(val)
+            cache = FileStorage.__cache()
+            cached = cache.get(stub._key)
+            if cached is not None and cached[0] is stub:
+                # the text itself is not kept, it would double the memory
+                cache[stub._key] = (stub, cached[1], None,
+                                    FileStorage.__copies(val))
+            return val
+
+    def __hydrated(self, objs):
+        """Returns a copy of objs where lazy objects are built"""
+        if not FileStorage.__lazy_mode:
+            return dict(objs)
+        return {key: obj.hydrate() if type(obj) is LazyObject else obj
+                for key, obj in list(objs.items())}
+
+    @staticmethod
+    def __key(obj):
+        """Returns the storage key of a model instance or lazy object"""
+        if type(obj) is LazyObject:
+            return obj._key
+        return "{}.{}".format(type(obj).__name__, obj.id)
+
+    def __stamp(self):
+        """Returns inode, size and times of every file backing storage"""
+        journal = self.__journal()
+        return tuple(self.__file_stamp(path) for path in (
+            self.__snapshot(), journal.rotated, journal.path))
+
+    @staticmethod
+    def __file_stamp(path):
+        """Returns inode, size and times of a file, or None if missing"""
         try:
-            temp = {}
-            with open(FileStorage.__file_path, 'r') as f:
-                temp = json.load(f)
-                for key, val in temp.items():
-                    self.all()[key] = classes[val['__class__']](**val)
+            st = os.stat(path)
         except FileNotFoundError:
-            pass
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
 
-    def close(self):
-        """ calls reload() """
-        self.reload()
+    def __encode(self, objects, dirty):
+        """Yields the JSON entry of every object of objects
+
+        Entries of objects left untouched since the last save come from
+        the cache, only new and changed objects go through to_dict(). A
+        list or dict attribute can change without __setattr__, so the
+        entry of an object holding one is only reused while its values
+        still equal the copies taken when it was cached.
+        """
+        cache = self.__cache()
+        sep = '\n'
+        for key, obj in objects.items():
+            entry = cache.get(key)
+            if entry is None or entry[0] is not obj or key in dirty or \
+                    entry[2] is None or self.__mutated(obj, entry[3]):
+                val = self.__dict_of(obj)
+                text = '{}: {}'.format(json.dumps(key), json.dumps(val))
+                entry = (obj, hash(text), text,
+                         self.__copies(val))
+                cache[key] = entry
+            yield sep + entry[2]
+            sep = ',\n'
+
+    @staticmethod
+    def __copies(val):
+        """Returns {attr: copy} of the list and dict values of a
+        serialized object, None if it has none
+        """
+        copies = None
+        for attr, value in val.items():
+            kind = type(value)
+            if kind is list or kind is dict:
+                if copies is None:
+                    copies = {}
+                if kind is list and all(type(item) in FileStorage.__scalars
+                                        for item in value):
+                    # the ids lists of the models, no need to go deeper
+                    copies[attr] = list(value)
+                else:
+                    copies[attr] = deepcopy(value)
+        return copies
+
+    @staticmethod
+    def __mutated(obj, copies):
+        """Checks if a list or dict attribute of obj no longer equals its
+        copy, changed in place since it was cached
+        """
+        if copies is None:
+            return False
+        return any(Registry.value(obj, attr) != value
+                   for attr, value in copies.items())
+
+    def __forget_deleted(self, dirty):
+        """Drops the cached entries of the deleted objects of dirty"""
+        cache = self.__cache()
+        for key in dirty:
+            if key not in FileStorage.__objects:
+                cache.pop(key, None)
+
+    def __registry(self):
+        """Returns __objects, turned into a Registry if it was replaced"""
+        if type(FileStorage.__objects) is not Registry:
+            FileStorage.__objects = Registry(FileStorage.__objects)
+        return FileStorage.__objects
+
+    @staticmethod
+    def __cache():
+        """Returns {key: (obj, hash of its entry, entry or None, copies of
+        its list and dict values)} of the saved objects, reset when
+        __objects is replaced
+        """
+        if FileStorage.__tracked is not FileStorage.__objects:
+            FileStorage.__tracked = FileStorage.__objects
+            FileStorage.__encoded = {}
+        return FileStorage.__encoded
+
+    def __saved(self):
+        """Records that the journal now holds every change of __objects"""
+        if FileStorage.__loaded[0] is FileStorage.__objects:
+            FileStorage.__loaded = (FileStorage.__objects, self.__stamp())
+
+    def __journal(self):
+        """Returns the journal kept next to the storage file"""
+        return Journal(FileStorage.__file_path + '.log', FileStorage.__fsync,
+                       FileStorage.__serializer)
+
+    def __compacting(self):
+        """Checks if a background compaction is still running"""
+        compactor = FileStorage.__compactor
+        return compactor is not None and compactor.is_alive()
+
+    def __wait_compactor(self):
+        """Blocks until the running compaction, if any, is finished"""
+        compactor = FileStorage.__compactor
+        if compactor is not None:
+            compactor.join()
@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+"""This module defines how FileStorage forces its writes to disk"""
+import atexit
+import os
+import threading
+
+
+class FsyncPolicy:
+    """Decides when the files written by FileStorage are fsynced
+
+    always: every write reaches the disk before save() returns
+    batch: writes are fsynced together at most interval ms later
+    never: flushing is left to the operating system
+    Whatever the mode, files are replaced atomically so a reader never
+    sees a half written one.
+    """
+
+    modes = ('always', 'batch', 'never')
+
+    def __init__(self, mode='always', interval=1000):
+        """Instantiates a policy, interval is in milliseconds"""
+        if mode not in self.modes:
+            raise ValueError("fsync mode must be one of {}".format(
+                             ', '.join(self.modes)))
+        self.mode = mode
+        self.interval = interval
+        self.__pending = set()
+        self.__timer = None
+        self.__lock = threading.Lock()
+        if mode == 'batch':
+            atexit.register(self.flush)
+
+    def write(self, path, chunks, binary=False):
+        """Atomically replaces path with the concatenation of chunks"""
+        tmp = '{}.{}.tmp'.format(path, os.getpid())
+        try:
+            with open(tmp, 'wb' if binary else 'w') as f:
+                f.writelines(chunks)
+                f.flush()
+                if self.mode == 'always':
+                    os.fsync(f.fileno())
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        if self.mode == 'always':
+            self.__fsync(os.path.dirname(path) or '.')
+        elif self.mode == 'batch':
+            self.__defer(path)
+
+    def sync(self, f):
+        """Flushes a file opened for appending according to the policy"""
+        f.flush()
+        if self.mode == 'always':
+            os.fsync(f.fileno())
+        elif self.mode == 'batch':
+            self.__defer(f.name)
+
+    def flush(self):
+        """Fsyncs every file written since the last batch"""
+        with self.__lock:
+            paths = self.__pending
+            self.__pending = set()
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+        for path in paths:
+            self.__fsync(path)
+            self.__fsync(os.path.dirname(path) or '.')
+
+    def __defer(self, path):
+        """Queues path for the next batch, starting its timer if needed"""
+        with self.__lock:
+            self.__pending.add(path)
+            if self.__timer is None:
+                self.__timer = threading.Timer(self.interval / 1000,
+                                               self.flush)
+                self.__timer.daemon = True
+                self.__timer.start()
+
+    @staticmethod
+    def __fsync(path):
+        """Fsyncs a file or directory by name, if it still exists"""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
@@ -0,0 +1,207 @@
+#!/usr/bin/python3
+"""This module defines the spatial index storage keeps of place locations"""
+from heapq import heappop, heappush
+from itertools import count
+from math import asin, cos, degrees, pi, radians, sin, sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def distance(lat1, lon1, lat2, lon2):
+    """Returns the great circle distance in km between two points"""
+    lat1, lon1, lat2, lon2 = map(radians, (lat1, lon1, lat2, lon2))
+    h = sin((lat2 - lat1) / 2) ** 2 + \
+        cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(h)))
+
+
+def boxes(south, west, north, east):
+    """Returns [(south, west, north, east)] covering a bounding box
+
+    A box whose west side is east of its east side crosses the 180th
+    meridian and is split in two boxes that do not.
+    """
+    if west <= east:
+        return [(south, west, north, east)]
+    return [(south, west, north, 180.0), (south, -180.0, north, east)]
+
+
+def bounding_boxes(lat, lon, radius_km):
+    """Returns [(south, west, north, east)] holding every point at most
+    radius_km from (lat, lon)
+    """
+    d = radius_km / EARTH_RADIUS_KM
+    south, north = lat - degrees(d), lat + degrees(d)
+    if south <= -90 or north >= 90 or d >= pi / 2:
+        # the circle holds a pole, every longitude is in range
+        return [(max(south, -90.0), -180.0, min(north, 90.0), 180.0)]
+    dlon = degrees(asin(sin(d) / cos(radians(lat))))
+    west, east = lon - dlon, lon + dlon
+    if west < -180:
+        west += 360
+    if east > 180:
+        east -= 360
+    return boxes(south, west, north, east)
+
+
+class GeoIndex:
+    """Quadtree of the (latitude, longitude) of stored objects
+
+    Every node covers a box of the globe and a leaf holding more than
+    capacity points is split in four at its center, so dense cities get
+    small leaves while empty oceans stay one node. nearby() walks the
+    nodes best first, ordered by a lower bound of their distance, and
+    stops as soon as enough points are closer than any node left, which
+    keeps a nearest places query to a few leaves whatever the row count.
+    Points whose coordinates are not numbers in range are left out.
+    """
+
+    capacity = 16
+
+    def __init__(self):
+        """Instantiates an empty index"""
+        self.__root = _Node(-90.0, -180.0, 90.0, 180.0)
+        self.__points = {}
+
+    def __len__(self):
+        """Returns the number of indexed points"""
+        return len(self.__points)
+
+    def __contains__(self, key):
+        """Checks if key has a point in the index"""
+        return key in self.__points
+
+    def put(self, key, lat, lon):
+        """Stores or moves the point of key, drops it if not valid"""
+        point = self.__points.get(key)
+        if point == (lat, lon):
+            return
+        if point is not None:
+            self.remove(key)
+        if not self.valid(lat, lon):
+            return
+        self.__points[key] = (lat, lon)
+        node = self.__leaf(lat, lon)
+        node.points[key] = (lat, lon)
+        if len(node.points) > self.capacity and \
+                node.north - node.south > 1e-9:
+            node.split()
+
+    def remove(self, key):
+        """Drops the point of key"""
+        point = self.__points.pop(key, None)
+        if point is not None:
+            del self.__leaf(*point).points[key]
+
+    def clear(self):
+        """Drops every point"""
+        self.__root = _Node(-90.0, -180.0, 90.0, 180.0)
+        self.__points.clear()
+
+    def nearby(self, lat, lon, radius_km=None, limit=None):
+        """Returns [(distance in km, key)] of the points at most radius_km
+        from (lat, lon), nearest first, at most limit of them
+        """
+        found = []
+        tie = count()
+        heap = [(0.0, 0, self.__root, None)]
+        while heap and (limit is None or len(found) < limit):
+            d, n, node, key = heappop(heap)
+            if radius_km is not None and d > radius_km:
+                break
+            if node is None:
+                found.append((d, key))
+            elif node.children is not None:
+                for child in node.children:
+                    bound = child.bound(lat, lon)
+                    if radius_km is None or bound <= radius_km:
+                        heappush(heap, (bound, next(tie), child, None))
+            else:
+                for key, point in node.points.items():
+                    d = distance(lat, lon, *point)
+                    if radius_km is None or d <= radius_km:
+                        heappush(heap, (d, next(tie), None, key))
+        return found
+
+    def within_bbox(self, south, west, north, east):
+        """Returns the keys of the points inside a bounding box, which
+        crosses the 180th meridian when west is east of east
+        """
+        found = []
+        for box in boxes(south, west, north, east):
+            stack = [self.__root]
+            while stack:
+                node = stack.pop()
+                if not node.overlaps(*box):
+                    continue
+                if node.children is not None:
+                    stack.extend(node.children)
+                    continue
+                s, w, n, e = box
+                found.extend(key for key, (lat, lon) in node.points.items()
+                             if s <= lat <= n and w <= lon <= e)
+        return found
+
+    @staticmethod
+    def valid(lat, lon):
+        """Checks if (lat, lon) are numbers within range"""
+        if type(lat) not in (int, float) or type(lon) not in (int, float):
+            return False
+        return -90 <= lat <= 90 and -180 <= lon <= 180
+
+    def __leaf(self, lat, lon):
+        """Returns the leaf covering (lat, lon)"""
+        node = self.__root
+        while node.children is not None:
+            node = node.children[node.quadrant(lat, lon)]
+        return node
+
+
+class _Node:
+    """Box of the quadtree of a GeoIndex, a leaf until it is split"""
+
+    __slots__ = ('south', 'west', 'north', 'east', 'points', 'children')
+
+    def __init__(self, south, west, north, east):
+        """Instantiates an empty leaf covering a box"""
+        self.south, self.west = south, west
+        self.north, self.east = north, east
+        self.points = {}
+        self.children = None
+
+    def quadrant(self, lat, lon):
+        """Returns the index of the child covering (lat, lon)"""
+        return (lat >= (self.south + self.north) / 2) * 2 + \
+            (lon >= (self.west + self.east) / 2)
+
+    def split(self):
+        """Turns the leaf into four children sharing its points"""
+        s, w, n, e = self.south, self.west, self.north, self.east
+        lat, lon = (s + n) / 2, (w + e) / 2
+        self.children = [_Node(s, w, lat, lon), _Node(s, lon, lat, e),
+                         _Node(lat, w, n, lon), _Node(lat, lon, n, e)]
+        for key, point in self.points.items():
+            self.children[self.quadrant(*point)].points[key] = point
+        self.points = None
+
+    def overlaps(self, south, west, north, east):
+        """Checks if the node and a box share any point"""
+        return self.south <= north and south <= self.north and \
+            self.west <= east and west <= self.east
+
+    def bound(self, lat, lon):
+        """Returns a lower bound of the distance in km from (lat, lon) to
+        any point of the box
+
+        It is the largest of the latitude gap and, when lon is outside the
+        box, the distance to the great circles of its side meridians,
+        which every path into the box has to cross.
+        """
+        gap = max(self.south - lat, lat - self.north, 0.0)
+        bound = radians(gap) * EARTH_RADIUS_KM
+        if self.west <= lon <= self.east:
+            return bound
+        side = min(abs(sin(radians(lon - edge)))
+                   for edge in (self.west, self.east))
+        across = asin(min(1.0, side * cos(radians(lat)))) * EARTH_RADIUS_KM
+        return max(bound, across)
@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+"""This module defines the append-only journal used by FileStorage"""
+import json
+import os
+import shutil
+from models.engine.fsync_policy import FsyncPolicy
+from models.engine.serializers import JsonSerializer
+
+
+class Journal:
+    """Append-only log of storage mutations kept next to a snapshot
+
+    Every record is one compact JSON array per line:
+        ["set", "<class>.<id>", {<to_dict() of the object>}]
+        ["del", "<class>.<id>"]
+    Replaying the records in order on top of the snapshot rebuilds the
+    current state of the storage.
+    """
+
+    def __init__(self, path, policy=None, serializer=None):
+        """Instantiates a journal living at path
+
+        policy is the FsyncPolicy applied to appends and compactions,
+        serializer the format of the snapshot compactions rewrite.
+        """
+        self.path = path
+        self.rotated = path + '.1'
+        self.policy = policy if policy is not None else FsyncPolicy('never')
+        if serializer is None:
+            serializer = JsonSerializer()
+        self.serializer = serializer
+
+    def append(self, records):
+        """Appends records to the live log and returns its new size"""
+        lines = [json.dumps(rec, separators=(',', ':')) for rec in records]
+        with open(self.path, 'a+') as f:
+            if f.tell():
+                f.seek(f.tell() - 1)
+                if f.read(1) != '\n':
+                    # drop the torn tail of an interrupted append, so only
+                    # the last line of a log can ever be incomplete
+                    f.seek(0)
+                    text = f.read()
+                    f.truncate(len(text[:text.rfind('\n') + 1].encode()))
+            f.write('\n'.join(lines) + '\n')
+            self.policy.sync(f)
+            return f.tell()
+
+    def replay(self):
+        """Yields the records of the rotated log, then of the live log"""
+        for path in (self.rotated, self.path):
+            for rec in self.__read(path):
+                yield rec
+
+    def exists(self):
+        """Checks if any log is waiting to be folded into the snapshot"""
+        return os.path.exists(self.path) or os.path.exists(self.rotated)
+
+    def discard(self):
+        """Removes both logs once the snapshot holds everything"""
+        for path in (self.rotated, self.path):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def rotate(self):
+        """Moves the live log aside so it can be folded into the snapshot"""
+        if not os.path.exists(self.path):
+            return os.path.exists(self.rotated)
+        if os.path.exists(self.rotated):
+            # an earlier compaction did not finish, keep its records first
+            with open(self.path, 'r') as src, open(self.rotated, 'a') as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(self.path)
+        else:
+            os.replace(self.path, self.rotated)
+        return True
+
+    def compact(self, snapshot, lock):
+        """Folds the rotated log into the snapshot file
+
+        Works on the raw dictionaries only, so it can run in a background
+        thread while the live log keeps receiving new records.
+        """
+        serializer = self.serializer
+        try:
+            with open(snapshot, 'rb' if serializer.binary else 'r') as f:
+                data = dict(serializer.load(f))
+        except FileNotFoundError:
+            data = {}
+        self.apply(data, self.__read(self.rotated))
+        self.policy.write(snapshot, serializer.dump(data.items()),
+                          serializer.binary)
+        with lock:
+            # replaying the rotated log on the new snapshot changes nothing,
+            # so it can outlive the replace for a moment
+            os.remove(self.rotated)
+
+    @staticmethod
+    def apply(data, records):
+        """Applies records to a dictionary of serialized objects
+
+        Returns the set of keys deleted along the way.
+        """
+        deleted = set()
+        for rec in records:
+            if rec[0] == 'set':
+                data[rec[1]] = rec[2]
+            elif rec[0] == 'del':
+                data.pop(rec[1], None)
+                deleted.add(rec[1])
+        return deleted
+
+    @staticmethod
+    def __read(path):
+        """Yields the records stored in a single log file
+
+        A last line that does not decode is the torn tail of an append
+        cut short and is skipped, any other one means the log is corrupt.
+        """
+        if not os.path.exists(path):
+            return
+        with open(path, 'r') as f:
+            torn = None
+            for number, line in enumerate(f, 1):
+                if torn is not None:
+                    raise ValueError("{}: line {} is not a journal record"
+                                     .format(path, torn))
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    torn = number
+                    continue
+                yield rec
@@ -0,0 +1,165 @@
+#!/usr/bin/python3
+"""This module defines a streaming reader for the storage JSON file"""
+import json
+import re
+
+
+class ObjectStream:
+    """Iterates over the members of the JSON object held in a file
+
+    The file is read chunk_size characters at a time and each member is
+    decoded as soon as it is complete, so only one member and one chunk
+    are in memory at once. Iterating yields (key, raw text, value) where
+    raw text is the '"key": value' slice of the file.
+
+    With decode=False, a file whose first line is a lone '{', as the
+    files FileStorage writes, is read a line at a time: members holding an
+    object on a line of their own are only cut out of their line and come
+    with None for value, value(raw text) decoding it when needed. Any
+    other line is handed to the chunked reader.
+    """
+
+    __decoder = json.JSONDecoder()
+    # raw_decode() without the Python frame around it, for every line
+    __scan = __decoder.scan_once
+    __blank = re.compile(r'[ \t\n\r]*').match
+    __cut = re.compile(r'[-+.eE0-9]*\Z').match
+    __colon = re.compile(r'[ \t\n\r]*:[ \t\n\r]*').match
+
+    def __init__(self, f, chunk_size=1 << 16, decode=True):
+        """Instantiates a stream reading from the text file f"""
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decode = decode
+        self.count = 0
+        self.__buf = ''
+        self.__pos = 0
+        self.__mark = 0
+        self.__eof = False
+
+    @classmethod
+    def value(cls, raw):
+        """Decodes the value of a member from its raw text"""
+        try:
+            key, pos = cls.__scan(raw, 0)
+            colon = cls.__colon(raw, pos)
+            if colon is None:
+                raise ValueError("expected ':' after {!r}".format(key))
+            val, end = cls.__scan(raw, colon.end())
+        except StopIteration as err:
+            raise ValueError("no JSON value at {}".format(err.value))
+        if end != len(raw):
+            raise ValueError("{!r} does not end with its line".format(key))
+        return val
+
+    def __iter__(self):
+        """Yields (key, raw text, value) for every member of the object"""
+        if self.decode:
+            return self.__members(opened=False, member=True)
+        first = self.f.readline()
+        if first.strip() != '{':
+            self.__buf = first
+            return self.__members(opened=False, member=True)
+        return self.__lines()
+
+    def __lines(self):
+        """Yields the members of a file written one per line, going on
+        with the chunked reader from the first line that is not one
+        """
+        member = True
+        for text in self.f:
+            line = text.rstrip()
+            if line == '}' and (not member or not self.count):
+                return
+            more = line.endswith(',')
+            raw = line[:-1].rstrip() if more else line
+            if member and raw.startswith('"') and raw.endswith('}'):
+                try:
+                    key, pos = self.__scan(raw, 0)
+                except StopIteration:
+                    key, pos = None, 0
+                if pos and self.__colon(raw, pos) is not None:
+                    yield key, raw, None
+                    self.count += 1
+                    member = more
+                    continue
+            self.__buf = text
+            break
+        yield from self.__members(opened=True, member=member)
+
+    def __members(self, opened, member):
+        """Yields the members read chunk by chunk, starting before the
+        opening brace unless opened, on a member if member is true and on
+        the separator that follows one otherwise
+        """
+        if not opened:
+            if self.__next() != '{':
+                raise ValueError("storage file must hold a JSON object")
+            self.__skip()
+            if self.__buf[self.__pos] == '}':
+                return
+        key = None
+        while True:
+            if member:
+                self.__mark = self.__pos
+                key = self.__decode()
+                if self.__next() != ':':
+                    raise ValueError("expected ':' after {!r}".format(key))
+                val = self.__decode()
+                yield key, self.__buf[self.__mark:self.__pos], val
+                self.count += 1
+            member = True
+            self.__mark = self.__pos
+            sep = self.__next()
+            if sep == '}':
+                return
+            if sep != ',':
+                raise ValueError("expected ',' or '}}' after {!r}".format(key))
+            self.__skip()
+
+    def __decode(self):
+        """Decodes the JSON value starting at the current position
+
+        A value followed by nothing but number characters up to the end
+        of the buffer may be a number or literal cut by the chunk boundary,
+        it is decoded again once more of the file is read.
+        """
+        while True:
+            self.__skip()
+            try:
+                val, end = self.__decoder.raw_decode(self.__buf, self.__pos)
+                if self.__eof or not self.__cut(self.__buf, end):
+                    self.__pos = end
+                    return val
+            except ValueError:
+                if self.__eof:
+                    raise
+            self.__fill()
+
+    def __next(self):
+        """Consumes and returns the next non blank character"""
+        self.__skip()
+        char = self.__buf[self.__pos]
+        self.__pos += 1
+        return char
+
+    def __skip(self):
+        """Moves past blanks, reading more of the file when needed"""
+        while True:
+            pos = self.__blank(self.__buf, self.__pos).end()
+            self.__pos = pos
+            if pos < len(self.__buf):
+                return
+            if self.__eof:
+                raise ValueError("storage file is truncated")
+            self.__fill()
+
+    def __fill(self):
+        """Reads the next chunk, dropping what precedes the current member"""
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.__eof = True
+            return
+        self.__buf = self.__buf[self.__mark:] + chunk
+        self.__pos -= self.__mark
+        self.__mark = 0
@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""This module defines the placeholder FileStorage keeps for lazy loads"""
+
+
+class LazyObject:
+    """Stand-in for a stored object, built from its raw fields on first use
+
+    Reading or setting any attribute, or printing the placeholder, builds
+    the real model instance through load(placeholder) and forwards to it.
+    peek() reads a raw field without building anything, which is what the
+    storage indexes use. The raw fields may also be given as text, which
+    fields() turns into them through decode(placeholder) on first use.
+    """
+
+    __slots__ = ('_key', '_cls', '_raw', '_obj', '_load', '_decode')
+
+    def __init__(self, key, cls, raw, load, decode=None):
+        """Instantiates a placeholder for the object stored under key"""
+        object.__setattr__(self, '_key', key)
+        object.__setattr__(self, '_cls', cls)
+        object.__setattr__(self, '_raw', raw)
+        object.__setattr__(self, '_obj', None)
+        object.__setattr__(self, '_load', load)
+        object.__setattr__(self, '_decode', decode)
+
+    def fields(self):
+        """Returns the raw fields, decoding them if only the text is held"""
+        if type(self._raw) is str:
+            object.__setattr__(self, '_raw', self._decode(self))
+        return self._raw
+
+    def hydrate(self):
+        """Returns the real object, building it on the first call"""
+        if self._obj is None:
+            object.__setattr__(self, '_obj', self._load(self))
+            object.__setattr__(self, '_raw', None)
+        return self._obj
+
+    def peek(self, attr, defaults=True):
+        """Returns attr of the object without building it, None if the
+        object did not set it and defaults is false
+        """
+        if self._obj is not None:
+            if not defaults:
+                return vars(self._obj).get(attr)
+            return getattr(self._obj, attr, None)
+        raw = self.fields()
+        if attr in raw or not defaults:
+            return raw.get(attr)
+        # compact models keep their class defaults aside from the slots
+        defaults = getattr(self._cls, '_defaults', None)
+        if defaults is not None:
+            return defaults.get(attr)
+        return getattr(self._cls, attr, None)
+
+    def __getattr__(self, name):
+        """Forwards attribute reads to the real object"""
+        return getattr(self.hydrate(), name)
+
+    def __setattr__(self, name, value):
+        """Forwards attribute writes to the real object"""
+        setattr(self.hydrate(), name, value)
+
+    def __str__(self):
+        """Returns the string representation of the real object"""
+        return str(self.hydrate())
+
+    def __repr__(self):
+        """Returns the representation of the real object"""
+        return repr(self.hydrate())
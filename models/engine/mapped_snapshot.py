@@ -0,0 +1,189 @@
+#!/usr/bin/python3
+"""This module defines the indexed snapshot web workers map read-only"""
+import io
+import json
+import mmap
+from struct import Struct
+from models.engine.registry import Registry
+
+
+class MappedSnapshot:
+    """Read-only snapshot decoded one object at a time from a mapped file
+
+    Layout, integers little endian:
+        magic, uint64 offset and uint64 size of the table of contents
+        the JSON of every object
+        per class, its ids then its rows (id offset, id size, JSON
+        offset, JSON size) sorted by id, then for each indexed foreign
+        key its values and entries (value offset, value size, row)
+        sorted by value
+        the table of contents, a JSON object giving the offset and length
+        of the rows of every class and of the entries of every foreign key
+    Mapping the file instead of reading it lets every process using it
+    share one copy through the page cache, only the objects looked up are
+    ever decoded.
+    """
+
+    magic = b'HBNBMAP\x01'
+
+    __header = Struct('<8sQQ')
+    __row = Struct('<QIQI')
+    __link = Struct('<QII')
+
+    def __init__(self, f):
+        """Instantiates a snapshot over the binary file f, kept open"""
+        try:
+            self.__buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, io.UnsupportedOperation):
+            self.__buf = f.read()
+        magic, start, size = self.__header.unpack_from(self.__buf, 0)
+        if magic != self.magic:
+            raise ValueError("not a mapped storage snapshot")
+        toc = json.loads(self.__buf[start:start + size])
+        self.classes = toc['classes']
+        self.links = toc['links']
+
+    def __contains__(self, key):
+        """Checks if key is stored in the snapshot"""
+        return self.__find(key) is not None
+
+    def close(self):
+        """Releases the mapping"""
+        if type(self.__buf) is mmap.mmap:
+            self.__buf.close()
+
+    def count(self, name=None):
+        """Returns the number of objects, or of objects of a class name"""
+        if name is None:
+            return sum(count for start, count in self.classes.values())
+        return self.classes.get(name, (0, 0))[1]
+
+    def get(self, key):
+        """Returns the dictionary stored under key, or None"""
+        found = self.__find(key)
+        if found is None:
+            return None
+        return self.__item(*found)[1]
+
+    def items(self, name=None):
+        """Yields (key, dictionary) for the objects of a class name, or
+        for every object
+        """
+        names = self.classes if name is None else [name]
+        for name in names:
+            start, count = self.classes.get(name, (0, 0))
+            for row in range(count):
+                yield self.__item(name, start, row)
+
+    def related(self, name, attr, value):
+        """Returns [(key, dictionary)] of the objects of a class name whose
+        attribute attr equals value, or None if attr is not indexed
+        """
+        index = self.links.get(name, {}).get(attr)
+        if index is None:
+            return None
+        if type(value) is not str:
+            return []
+        start, count = index
+        target = value.encode()
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.__link_value(start, mid)[0] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        found = []
+        rows = self.classes[name][0]
+        while lo < count:
+            text, row = self.__link_value(start, lo)
+            if text != target:
+                break
+            found.append(self.__item(name, rows, row))
+            lo += 1
+        return found
+
+    @classmethod
+    def dump(cls, items, foreign_keys=Registry.foreign_keys):
+        """Returns the chunks of a snapshot holding the (key, dict) items"""
+        chunks = []
+        end = cls.__header.size
+
+        def put(blob):
+            """Appends blob to the snapshot, returning its offset"""
+            nonlocal end
+            chunks.append(blob)
+            end += len(blob)
+            return end - len(blob)
+
+        classes = {}
+        for key, val in items:
+            name, oid = key.split('.', 1)
+            blob = json.dumps(val, separators=(',', ':'),
+                              default=cls.__default).encode()
+            rows = classes.get(name)
+            if rows is None:
+                rows = classes[name] = []
+            rows.append((oid, put(blob), len(blob), val))
+        toc = {'classes': {}, 'links': {}}
+        for name, rows in classes.items():
+            rows.sort(key=lambda row: row[0])
+            table = []
+            for oid, off, size, val in rows:
+                blob = oid.encode()
+                table.append(cls.__row.pack(put(blob), len(blob), off, size))
+            toc['classes'][name] = (put(b''.join(table)), len(rows))
+            for attr in foreign_keys.get(name, ()):
+                entries = sorted((val[attr].encode(), row)
+                                 for row, (oid, off, size, val)
+                                 in enumerate(rows)
+                                 if type(val.get(attr)) is str)
+                table = [cls.__link.pack(put(blob), len(blob), row)
+                         for blob, row in entries]
+                toc['links'].setdefault(name, {})[attr] = (
+                    put(b''.join(table)), len(entries))
+        blob = json.dumps(toc).encode()
+        start = put(blob)
+        return [cls.__header.pack(cls.magic, start, len(blob))] + chunks
+
+    def __find(self, key):
+        """Returns (class name, rows offset, row) of key, or None"""
+        name, sep, oid = key.partition('.')
+        if name not in self.classes:
+            return None
+        start, count = self.classes[name]
+        target = oid.encode()
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.__id(start, mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < count and self.__id(start, lo) == target:
+            return name, start, lo
+        return None
+
+    def __id(self, start, row):
+        """Returns the id of a row as bytes"""
+        off, length, data, size = self.__row.unpack_from(
+            self.__buf, start + row * self.__row.size)
+        return self.__buf[off:off + length]
+
+    def __item(self, name, start, row):
+        """Returns (key, dictionary) of a row"""
+        off, length, data, size = self.__row.unpack_from(
+            self.__buf, start + row * self.__row.size)
+        key = '{}.{}'.format(name, self.__buf[off:off + length].decode())
+        return key, json.loads(self.__buf[data:data + size])
+
+    def __link_value(self, start, i):
+        """Returns (value as bytes, row) of a foreign key entry"""
+        off, length, row = self.__link.unpack_from(
+            self.__buf, start + i * self.__link.size)
+        return self.__buf[off:off + length], row
+
+    @staticmethod
+    def __default(value):
+        """Encodes the datetimes a binary snapshot hands back"""
+        return value.isoformat(timespec='microseconds')
@@ -0,0 +1,144 @@
+#!/usr/bin/python3
+"""This module defines the query builder returned by storage.query()"""
+
+
+class Query:
+    """Filters, ordering, projection and pagination of a class of objects
+
+    storage.query(Place).filter(price_by_night=(None, 100))
+                        .order_by('-price_by_night', 'name')
+                        .offset(40).limit(20).all()
+    Every method returns a new query, nothing runs until all(), first(),
+    count() or iteration. The storage engine that made the query runs it,
+    FileStorage through its indexes with a top-k heap and DBStorage as a
+    single SELECT.
+    Conditions are those of where(): a value the field must equal, or a
+    (low, high) tuple of inclusive bounds where None leaves a side open.
+    order_by() takes field names, descending when prefixed with '-', and
+    sorts missing values last. only() turns the results into {field:
+    value} dictionaries. load() names relationships, 'cities' or
+    'cities.places', that DBStorage fetches along with the results instead
+    of one query per object; FileStorage resolves them from memory anyway.
+    """
+
+    def __init__(self, name, run, tally):
+        """Instantiates a query on the class called name
+
+        run(query) returns the results of a query, tally(query) the
+        number of objects matching its conditions.
+        """
+        self.name = name
+        self.conditions = {}
+        self.ordering = ()
+        self.fields = None
+        self.loads = ()
+        self.start = 0
+        self.stop = None
+        self.__run = run
+        self.__tally = tally
+
+    def __iter__(self):
+        """Iterates over the results"""
+        return iter(self.all())
+
+    def filter(self, **conditions):
+        """Returns the query restricted to objects matching conditions"""
+        query = self.__copy()
+        query.conditions = dict(self.conditions, **conditions)
+        return query
+
+    def order_by(self, *fields):
+        """Returns the query sorted on fields, '-field' for descending"""
+        query = self.__copy()
+        query.ordering = tuple((field.lstrip('-'), field.startswith('-'))
+                               for field in fields)
+        return query
+
+    def only(self, *fields):
+        """Returns the query giving {field: value} of the given fields"""
+        query = self.__copy()
+        query.fields = fields
+        return query
+
+    def load(self, *paths):
+        """Returns the query fetching the relationships of paths with its
+        results
+        """
+        query = self.__copy()
+        query.loads = self.loads + paths
+        return query
+
+    def offset(self, count):
+        """Returns the query skipping its first count results"""
+        query = self.__copy()
+        query.start = count
+        return query
+
+    def limit(self, count):
+        """Returns the query stopping after count results"""
+        query = self.__copy()
+        query.stop = count
+        return query
+
+    def all(self):
+        """Returns the list of results"""
+        return self.__run(self)
+
+    def first(self):
+        """Returns the first result, or None"""
+        found = self.limit(1).all()
+        return found[0] if found else None
+
+    def count(self):
+        """Returns the number of objects matching the conditions, whatever
+        the offset and limit
+        """
+        return self.__tally(self)
+
+    def sort_key(self, value):
+        """Returns the sort key of the ordering, value(obj, field) giving
+        the value of a field of an object
+        """
+        ordering = self.ordering
+
+        def key(obj):
+            """Returns the sort key of obj"""
+            parts = []
+            for field, descending in ordering:
+                found = value(obj, field)
+                if found is None:
+                    parts.append((1, 0))
+                else:
+                    parts.append((0, _Descending(found) if descending
+                                  else found))
+            return parts
+        return key
+
+    def __copy(self):
+        """Returns a copy of the query"""
+        query = Query(self.name, self.__run, self.__tally)
+        query.conditions = self.conditions
+        query.ordering = self.ordering
+        query.fields = self.fields
+        query.loads = self.loads
+        query.start = self.start
+        query.stop = self.stop
+        return query
+
+
+class _Descending:
+    """Wraps a value so that it sorts in reverse order"""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        """Wraps value"""
+        self.value = value
+
+    def __eq__(self, other):
+        """Checks if both wrapped values are equal"""
+        return self.value == other.value
+
+    def __lt__(self, other):
+        """Checks if the wrapped value is greater than the other"""
+        return other.value < self.value
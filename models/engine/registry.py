@@ -0,0 +1,341 @@
+#!/usr/bin/python3
+"""This module defines the object registry used by FileStorage"""
+from models.engine.bitmap_index import BitmapIndex
+from models.engine.columns import ColumnStore
+from models.engine.geo_index import GeoIndex
+from models.engine.lazy_object import LazyObject
+from models.engine.text_index import TextIndex
+
+
+class Registry(dict):
+    """Dictionary of stored objects partitioned by class name
+
+    It behaves as the flat {"<class>.<id>": obj} dictionary FileStorage
+    always returned, while keeping one sub dictionary per class name so
+    the objects of a class can be listed or counted without a full scan.
+    The foreign keys listed in foreign_keys are indexed the same way, so
+    the objects pointing to a given id are found without a scan either.
+    referenced lists the classes those foreign keys point to. The fields
+    listed in numeric_fields are also copied to a ColumnStore per class,
+    and the (latitude, longitude) pair of geo_fields to a GeoIndex. The
+    list of ids held in the attribute of bitmap_fields goes to a
+    BitmapIndex. The text_fields of a class only go to a TextIndex once
+    text_index() built it, as tokenizing every text would slow down
+    every reload for the sake of search() alone.
+
+    After defer(), stored objects only go to their partition and are
+    indexed by class, in one pass, once index() is called for the class.
+    related() and text_index() call it, the owner of the registry does
+    before reading columns, geo or bitmaps.
+    """
+
+    foreign_keys = {
+                    'City': ('state_id',), 'Place': ('city_id', 'user_id'),
+                    'Review': ('place_id', 'user_id')
+                   }
+    referenced = ('State', 'City', 'Place', 'User')
+    numeric_fields = {
+                      'Place': ('number_rooms', 'number_bathrooms',
+                                'max_guest', 'price_by_night', 'latitude',
+                                'longitude')
+                     }
+    geo_fields = {'Place': ('latitude', 'longitude')}
+    bitmap_fields = {'Place': 'amenity_ids'}
+    text_fields = {'Place': ('name', 'description'), 'Review': ('text',)}
+
+    def __init__(self, *args, **kwargs):
+        """Instantiates a registry holding the given objects"""
+        super().__init__()
+        self.classes = {}
+        self.links = {}
+        self.columns = {name: ColumnStore(fields)
+                        for name, fields in self.numeric_fields.items()}
+        self.geo = {name: GeoIndex() for name in self.geo_fields}
+        self.bitmaps = {name: BitmapIndex() for name in self.bitmap_fields}
+        self.texts = {}
+        self.__linked = {}
+        self.__deferred = False
+        self.__pending = {}
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, key, obj):
+        """Stores obj under key and in the partition of its class"""
+        super().__setitem__(key, obj)
+        name = key.partition('.')[0]
+        part = self.classes.get(name)
+        if part is None:
+            part = self.classes[name] = {}
+        part[key] = obj
+        if self.__deferred:
+            pending = self.__pending.get(name)
+            if pending is None:
+                pending = self.__pending[name] = {}
+            pending[key] = obj
+            return
+        self.__index(key, name, obj)
+
+    def __index(self, key, name, obj):
+        """Copies obj to every index of its class"""
+        if name in self.foreign_keys:
+            self.__link(key, name, obj)
+        if name in self.columns:
+            self.__store(key, name, obj)
+        if name in self.geo:
+            self.__locate(key, name, obj)
+        if name in self.bitmaps:
+            self.__mark(key, name, obj)
+        if name in self.texts:
+            self.__index_text(key, name, obj)
+
+    def __index_all(self, name, objs):
+        """Copies the {key: obj} of objs, all of class name, to the indexes
+        of the class, one index at a time
+        """
+        value = self.value
+        if name in self.foreign_keys:
+            attrs = self.foreign_keys[name]
+            indexes = [self.links.setdefault((name, attr), {})
+                       for attr in attrs]
+            linked = self.__linked
+            for key, obj in objs.items():
+                if key in linked:
+                    self.__drop_links(key, name)
+                values = tuple([value(obj, attr) for attr in attrs])
+                for index, val in zip(indexes, values):
+                    bucket = index.get(val)
+                    if bucket is None:
+                        bucket = index[val] = {}
+                    bucket[key] = obj
+                linked[key] = values
+        if name in self.columns:
+            fields = self.numeric_fields[name]
+            self.columns[name].extend(
+                (key, [value(obj, attr) for attr in fields])
+                for key, obj in objs.items())
+        for indexes, index in ((self.geo, self.__locate),
+                               (self.bitmaps, self.__mark),
+                               (self.texts, self.__index_text)):
+            if name in indexes:
+                for key, obj in objs.items():
+                    index(key, name, obj)
+
+    def __delitem__(self, key):
+        """Removes key from the registry and from its partition"""
+        super().__delitem__(key)
+        self.__unlink(key)
+
+    def __ior__(self, other):
+        """Implements registry |= other"""
+        self.update(other)
+        return self
+
+    def pop(self, key, *default):
+        """Removes key and returns its object"""
+        if key not in self:
+            if default:
+                return default[0]
+            raise KeyError(key)
+        obj = super().pop(key)
+        self.__unlink(key)
+        return obj
+
+    def popitem(self):
+        """Removes and returns the last stored (key, object) pair"""
+        key, obj = super().popitem()
+        self.__unlink(key)
+        return key, obj
+
+    def setdefault(self, key, default=None):
+        """Returns the object under key, storing default if missing"""
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs):
+        """Stores every (key, object) pair of the arguments"""
+        for key, obj in dict(*args, **kwargs).items():
+            self[key] = obj
+
+    def clear(self):
+        """Removes every object"""
+        super().clear()
+        self.classes.clear()
+        self.__pending.clear()
+        self.links.clear()
+        for store in self.columns.values():
+            store.clear()
+        for index in self.geo.values():
+            index.clear()
+        for bitmap in self.bitmaps.values():
+            bitmap.clear()
+        self.texts.clear()
+        self.__linked.clear()
+
+    def partition(self, name):
+        """Returns the live {key: obj} dictionary of a class name"""
+        return self.classes.get(name, {})
+
+    def count(self, name=None):
+        """Returns the number of objects, or of objects of a class name"""
+        if name is None:
+            return len(self)
+        return len(self.classes.get(name, ()))
+
+    def related(self, name, attr, value):
+        """Returns the live {key: obj} dictionary of the objects of a class
+        name whose attribute attr equals value, or None if attr of that
+        class is not indexed
+        """
+        if attr not in self.foreign_keys.get(name, ()):
+            return None
+        self.index(name)
+        return self.links.get((name, attr), {}).get(value, {})
+
+    def defer(self, deferred=True):
+        """Leaves the objects stored from now on out of the indexes until
+        index() is called for their class, or indexes every object left
+        out so far and stops deferring if deferred is false
+        """
+        self.__deferred = deferred
+        if not deferred:
+            self.index()
+
+    def index(self, *names):
+        """Indexes the objects of the classes names, or of every class,
+        stored since defer() and not indexed yet
+        """
+        for name in names or list(self.__pending):
+            pending = self.__pending.pop(name, None)
+            if pending:
+                self.__index_all(name, pending)
+
+    def text_index(self, name, start=None):
+        """Returns the text index of a class name, built from its objects
+        the first time, when it starts from the index start if given
+        """
+        self.index(name)
+        index = self.texts.get(name)
+        if index is None:
+            index = self.texts[name] = \
+                start if start is not None else TextIndex()
+            part = self.partition(name)
+            for key in index.keys():
+                if key not in part:
+                    index.remove(key)
+            for key, obj in part.items():
+                self.__index_text(key, name, obj)
+        return index
+
+    def relink(self, key, attr=None):
+        """Refreshes the foreign key, column, location, bitmap and text
+        entries of the object under key
+        """
+        name = key.partition('.')[0]
+        if key not in self or key in self.__pending.get(name, ()):
+            return
+        if attr is None or attr in self.foreign_keys.get(name, ()):
+            if name in self.foreign_keys:
+                self.__link(key, name, self[key])
+        if attr is None or attr in self.numeric_fields.get(name, ()):
+            if name in self.columns:
+                self.__store(key, name, self[key])
+        if attr is None or attr in self.geo_fields.get(name, ()):
+            if name in self.geo:
+                self.__locate(key, name, self[key])
+        if attr is None or attr == self.bitmap_fields.get(name):
+            if name in self.bitmaps:
+                self.__mark(key, name, self[key])
+        if attr is None or attr in self.text_fields.get(name, ()):
+            if name in self.texts:
+                self.__index_text(key, name, self[key])
+
+    @staticmethod
+    def value(obj, attr):
+        """Returns attr of a stored object without building lazy ones"""
+        if type(obj) is LazyObject:
+            return obj.peek(attr)
+        return getattr(obj, attr, None)
+
+    @staticmethod
+    def own_value(obj, attr):
+        """Returns attr of a stored object, None if it was not set on the
+        object itself and only comes from its class
+        """
+        if type(obj) is LazyObject:
+            return obj.peek(attr, defaults=False)
+        return getattr(obj, '__dict__', {}).get(attr)
+
+    def __link(self, key, name, obj):
+        """Indexes the foreign keys of obj"""
+        if key in self.__linked:
+            self.__drop_links(key, name)
+        values = []
+        for attr in self.foreign_keys[name]:
+            value = self.value(obj, attr)
+            values.append(value)
+            index = self.links.get((name, attr))
+            if index is None:
+                index = self.links[(name, attr)] = {}
+            bucket = index.get(value)
+            if bucket is None:
+                bucket = index[value] = {}
+            bucket[key] = obj
+        self.__linked[key] = tuple(values)
+
+    def __store(self, key, name, obj):
+        """Copies the numeric fields of obj to the columns of its class"""
+        self.columns[name].put(key, {attr: self.value(obj, attr)
+                                     for attr in self.numeric_fields[name]})
+
+    def __locate(self, key, name, obj):
+        """Copies the coordinates set on obj to the spatial index of its
+        class, the class defaults are no location
+        """
+        lat, lon = self.geo_fields[name]
+        self.geo[name].put(key, self.own_value(obj, lat),
+                           self.own_value(obj, lon))
+
+    def __mark(self, key, name, obj):
+        """Copies the ids listed by obj to the bitmaps of its class"""
+        self.bitmaps[name].put(key, self.value(obj, self.bitmap_fields[name]))
+
+    def __index_text(self, key, name, obj):
+        """Copies the text fields of obj to the text index of its class"""
+        values = (self.value(obj, attr) for attr in self.text_fields[name])
+        self.texts[name].put(key, ' '.join(value for value in values
+                                           if type(value) is str))
+
+    def __drop_links(self, key, name):
+        """Removes the foreign key entries of the object under key"""
+        values = self.__linked.pop(key, None)
+        if values is None:
+            return
+        for attr, value in zip(self.foreign_keys[name], values):
+            index = self.links[(name, attr)]
+            bucket = index.get(value)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del index[value]
+
+    def __unlink(self, key):
+        """Removes key from the partition of its class"""
+        name = key.partition('.')[0]
+        part = self.classes.get(name)
+        if part is not None:
+            part.pop(key, None)
+            if not part:
+                del self.classes[name]
+        pending = self.__pending.get(name)
+        if pending is not None:
+            pending.pop(key, None)
+        if name in self.foreign_keys:
+            self.__drop_links(key, name)
+        if name in self.columns:
+            self.columns[name].remove(key)
+        if name in self.geo:
+            self.geo[name].remove(key)
+        if name in self.bitmaps:
+            self.bitmaps[name].remove(key)
+        if name in self.texts:
+            self.texts[name].remove(key)
@@ -0,0 +1,287 @@
+#!/usr/bin/python3
+"""This module defines the snapshot formats FileStorage can write
+
+convert_snapshot.py, at the root of the repository, converts a snapshot
+between formats with convert().
+"""
+import json
+import os
+import sys
+from array import array
+from datetime import datetime, timedelta
+from itertools import accumulate
+from struct import Struct
+from models.engine.json_stream import ObjectStream
+from models.engine.mapped_snapshot import MappedSnapshot
+
+
+class JsonSerializer:
+    """The {"<class>.<id>": {<to_dict() of the object>}} JSON document"""
+
+    name = 'json'
+    extension = '.json'
+    binary = False
+
+    def dump(self, items):
+        """Yields the text of a snapshot holding the (key, dict) items, one
+        item per line so ObjectStream can skip decoding the unchanged ones
+        """
+        yield '{'
+        sep = '\n'
+        for key, val in items:
+            yield '{}{}: {}'.format(sep, json.dumps(key),
+                                    json.dumps(val, default=self.default))
+            sep = ',\n'
+        yield '\n}'
+
+    def load(self, f):
+        """Yields the (key, dict) items of the snapshot open in f"""
+        for key, entry, val in ObjectStream(f):
+            yield key, val
+
+    @staticmethod
+    def default(value):
+        """Encodes the datetimes a binary snapshot hands back"""
+        if type(value) is datetime:
+            return value.isoformat(timespec='microseconds')
+        raise TypeError("{!r} is not JSON serializable".format(value))
+
+
+class BinarySerializer:
+    """Column oriented binary snapshot, a few times smaller than JSON
+
+    After the magic bytes comes one section per class:
+        <name> <row count> <field count>
+    followed for each field by
+        <name> <type> <sparse> <payload size> <payload>
+    Counts are little endian uint32, the payload size an uint64 and names
+    length prefixed utf-8. A sparse payload starts with one byte per row
+    telling if the row has the field, then come the values of the rows
+    having it:
+        u  16 byte binary UUIDs
+        t  int64 microseconds since the epoch, handed back as datetime
+        i  int64
+        f  float64
+        s  uint32 byte lengths, then the utf-8 strings
+        j  a JSON array of the values
+    """
+
+    name = 'binary'
+    extension = '.bin'
+    binary = True
+    magic = b'HBNB\x00\x01'
+    times = ('created_at', 'updated_at')
+
+    __epoch = datetime(1970, 1, 1)
+    __micro = timedelta(microseconds=1)
+    __hex = set('0123456789abcdef')
+    __size = Struct('<I')
+    __header = Struct('<II')
+    __field = Struct('<BBQ')
+
+    def dump(self, items):
+        """Yields the bytes of a snapshot holding the (key, dict) items"""
+        classes = {}
+        for key, val in items:
+            name = key.partition('.')[0]
+            rows = classes.get(name)
+            if rows is None:
+                rows = classes[name] = []
+            rows.append(val)
+        yield self.magic
+        for name, rows in classes.items():
+            fields = {}
+            for row in rows:
+                fields.update(dict.fromkeys(row))
+            fields.pop('__class__', None)
+            yield self.__pack(name) + self.__header.pack(len(rows),
+                                                         len(fields))
+            for field in fields:
+                values = [row[field] for row in rows if field in row]
+                kind, payload = self.__encode(field, values)
+                sparse = len(values) != len(rows)
+                if sparse:
+                    payload = bytes(field in row for row in rows) + payload
+                yield self.__pack(field) + self.__field.pack(
+                    ord(kind), sparse, len(payload)) + payload
+
+    def load(self, f):
+        """Yields the (key, dict) items of the snapshot open in f"""
+        data = f.read()
+        if data[:len(self.magic)] != self.magic:
+            raise ValueError("not a binary storage snapshot")
+        pos = len(self.magic)
+        while pos < len(data):
+            name, pos = self.__unpack(data, pos)
+            count, fields = self.__header.unpack_from(data, pos)
+            pos += self.__header.size
+            rows = [{} for i in range(count)]
+            for i in range(fields):
+                field, pos = self.__unpack(data, pos)
+                kind, sparse, size = self.__field.unpack_from(data, pos)
+                pos += self.__field.size
+                payload = data[pos:pos + size]
+                pos += size
+                targets = rows
+                if sparse:
+                    targets = [row for row, has in zip(rows, payload[:count])
+                               if has]
+                    payload = payload[count:]
+                values = self.__decode(chr(kind), payload, len(targets))
+                for row, value in zip(targets, values):
+                    row[field] = value
+            for row in rows:
+                row['__class__'] = name
+                yield '{}.{}'.format(name, row['id']), row
+
+    def __encode(self, field, values):
+        """Returns the type and payload of a column of values"""
+        types = set(map(type, values))
+        if types == {str} and all(map(self.__is_uuid, values)):
+            return 'u', bytes.fromhex(''.join(values).replace('-', ''))
+        if types == {datetime} or \
+                field in self.times and types <= {str, datetime}:
+            stamps = [self.__time(value) for value in values]
+            if None not in stamps:
+                return 't', self.__array('q', stamps)
+        if types == {int} and \
+                all(-1 << 63 <= value < 1 << 63 for value in values):
+            return 'i', self.__array('q', values)
+        if types == {float}:
+            return 'f', self.__array('d', values)
+        if types == {str}:
+            blobs = [value.encode() for value in values]
+            return 's', self.__array('I', map(len, blobs)) + b''.join(blobs)
+        return 'j', json.dumps(values, default=JsonSerializer.default,
+                               separators=(',', ':')).encode()
+
+    def __decode(self, kind, payload, count):
+        """Returns the values held in the payload of a column"""
+        if kind == 'u':
+            h = payload.hex()
+            return ['{}-{}-{}-{}-{}'.format(h[i:i + 8], h[i + 8:i + 12],
+                                            h[i + 12:i + 16],
+                                            h[i + 16:i + 20], h[i + 20:i + 32])
+                    for i in range(0, 32 * count, 32)]
+        if kind == 't':
+            epoch, micro = self.__epoch, self.__micro
+            return [epoch + micro * value
+                    for value in self.__unarray('q', payload)]
+        if kind == 'i':
+            return self.__unarray('q', payload)
+        if kind == 'f':
+            return self.__unarray('d', payload)
+        if kind == 's':
+            ends = list(accumulate(self.__unarray('I', payload[:4 * count])))
+            blob = payload[4 * count:]
+            text = blob.decode()
+            if len(text) == len(blob):
+                # ascii only, byte offsets are character offsets
+                return [text[a:b] for a, b in zip([0] + ends, ends)]
+            return [blob[a:b].decode() for a, b in zip([0] + ends, ends)]
+        return json.loads(payload.decode())
+
+    @classmethod
+    def __time(cls, value):
+        """Returns value as microseconds since the epoch, None if it does
+        not survive the round trip
+        """
+        if type(value) is str:
+            try:
+                stamp = datetime.fromisoformat(value)
+            except ValueError:
+                return None
+            if stamp.isoformat(timespec='microseconds') != value:
+                return None
+            value = stamp
+        if value.tzinfo is not None:
+            return None
+        return (value - cls.__epoch) // cls.__micro
+
+    @classmethod
+    def __is_uuid(cls, value):
+        """Checks if value is a lower case UUID in canonical form"""
+        if len(value) != 36 or value[8:24:5] != '----':
+            return False
+        digits = value.replace('-', '')
+        return len(digits) == 32 and set(digits) <= cls.__hex
+
+    @staticmethod
+    def __array(code, values):
+        """Returns values packed as a little endian array"""
+        packed = array(code, values)
+        if sys.byteorder == 'big':
+            packed.byteswap()
+        return packed.tobytes()
+
+    @staticmethod
+    def __unarray(code, payload):
+        """Returns the values of a little endian array"""
+        packed = array(code)
+        packed.frombytes(payload)
+        if sys.byteorder == 'big':
+            packed.byteswap()
+        return packed.tolist()
+
+    @classmethod
+    def __pack(cls, text):
+        """Returns text as length prefixed utf-8"""
+        blob = text.encode()
+        return cls.__size.pack(len(blob)) + blob
+
+    @classmethod
+    def __unpack(cls, data, pos):
+        """Returns the length prefixed string at pos and the next position"""
+        size, = cls.__size.unpack_from(data, pos)
+        pos += cls.__size.size
+        return data[pos:pos + size].decode(), pos + size
+
+
+class MappedSerializer:
+    """Indexed snapshot workers can map read-only, see MappedSnapshot"""
+
+    name = 'mapped'
+    extension = '.snap'
+    binary = True
+
+    def dump(self, items):
+        """Returns the chunks of a snapshot holding the (key, dict) items"""
+        return MappedSnapshot.dump(items)
+
+    def load(self, f):
+        """Yields the (key, dict) items of the snapshot open in f"""
+        snapshot = MappedSnapshot(f)
+        try:
+            for item in snapshot.items():
+                yield item
+        finally:
+            snapshot.close()
+
+
+formats = {'json': JsonSerializer, 'binary': BinarySerializer,
+           'mapped': MappedSerializer}
+
+
+def serializer(name):
+    """Returns a serializer for the format called name"""
+    if name not in formats:
+        raise ValueError("storage format must be one of {}".format(
+                         ', '.join(formats)))
+    return formats[name]()
+
+
+def for_path(path):
+    """Returns the serializer matching the extension of path"""
+    for cls in formats.values():
+        if os.path.splitext(path)[1] == cls.extension:
+            return cls()
+    return JsonSerializer()
+
+
+def convert(source, destination):
+    """Rewrites the snapshot source in the format of destination"""
+    reader, writer = for_path(source), for_path(destination)
+    with open(source, 'rb' if reader.binary else 'r') as f:
+        chunks = writer.dump(reader.load(f))
+        with open(destination, 'wb' if writer.binary else 'w') as out:
+            out.writelines(chunks)
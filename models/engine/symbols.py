@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+"""This module defines the symbol table FileStorage interns strings in"""
+import sys
+
+
+class SymbolTable:
+    """Canonical copies of the strings repeated across stored objects
+
+    intern() hands back the first copy seen of every string, so the ids
+    shared by thousands of objects are kept once. lookups counts calls,
+    duplicates the calls that dropped a copy and saved the bytes those
+    copies held. held is the size of the strings kept.
+
+    A string cannot be weakly referenced, so the table instead forgets
+    the strings it is the only holder of with sweep(), which intern()
+    runs whenever the table doubled since the last sweep.
+    """
+
+    def __init__(self):
+        """Instantiates an empty table"""
+        self.__symbols = {}
+        self.__swept = 0
+        self.lookups = 0
+        self.duplicates = 0
+        self.saved = 0
+        self.held = 0
+
+    def __len__(self):
+        """Returns the number of distinct strings held"""
+        return len(self.__symbols)
+
+    def intern(self, value):
+        """Returns the canonical copy of value, value itself if it is not
+        a string
+        """
+        if type(value) is not str:
+            return value
+        self.lookups += 1
+        symbols = self.__symbols
+        if len(symbols) >= 2 * self.__swept and len(symbols) >= 1024:
+            self.sweep()
+        symbol = symbols.setdefault(value, value)
+        if symbol is not value:
+            self.duplicates += 1
+            self.saved += sys.getsizeof(value)
+        else:
+            self.held += sys.getsizeof(value)
+        return symbol
+
+    def sweep(self):
+        """Forgets the strings nothing but the table refers to anymore,
+        those of deleted objects, and returns how many were dropped
+        """
+        symbols = self.__symbols
+        # a probe held by the table and by one name gives the count of a
+        # string held by the table and the loop variable alone
+        probe = ''.join(('\0', 'probe'))
+        symbols[probe] = probe
+        keys = list(symbols)
+        unused = sys.getrefcount(probe)
+        del symbols[probe]
+        keys.pop()
+        dropped = 0
+        for symbol in keys:
+            if sys.getrefcount(symbol) <= unused:
+                del symbols[symbol]
+                self.held -= sys.getsizeof(symbol)
+                dropped += 1
+        self.__swept = len(symbols)
+        return dropped
+
+    def stats(self):
+        """Returns the counters of the table as a dictionary"""
+        return {'symbols': len(self.__symbols), 'lookups': self.lookups,
+                'duplicates': self.duplicates, 'bytes_saved': self.saved,
+                'bytes_held': self.held}
+
+    def clear(self):
+        """Forgets every string and resets the counters"""
+        self.__symbols.clear()
+        self.__swept = 0
+        self.lookups = self.duplicates = self.saved = self.held = 0
@@ -0,0 +1,173 @@
+#!/usr/bin/python3
+"""This module defines the full-text index storage keeps of place and
+review texts
+"""
+import re
+from hashlib import blake2b
+from heapq import nlargest
+from math import log
+from os import getenv
+
+STOPWORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'but', 'by', 'for', 'from',
+    'has', 'have', 'in', 'is', 'it', 'its', 'of', 'on', 'or', 'so', 'that',
+    'the', 'this', 'to', 'was', 'we', 'were', 'will', 'with'))
+
+
+def stem(word):
+    """Returns word without its common English suffixes
+
+    A light stemmer, good enough for "houses", "housing" and "house" to
+    meet, not meant to return real words.
+    """
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    if word.endswith('ies') and len(word) > 4:
+        word = word[:-3] + 'y'
+    elif word.endswith('s') and not word.endswith(('ss', 'us', 'is')):
+        word = word[:-1]
+    for suffix in ('ing', 'ed', 'ly'):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            if word[-1] == word[-2] and word[-1] not in 'aeioulsz':
+                word = word[:-1]
+            break
+    if word.endswith('e') and len(word) > 3:
+        word = word[:-1]
+    return word
+
+
+class TextIndex:
+    """Inverted index of the texts of stored objects, ranked with BM25
+
+    Texts are lower cased, split on anything that is not a letter or a
+    digit, stripped of stop words and, unless HBNB_SEARCH_STEM is 0,
+    stemmed. postings maps every term to {key: term frequency} of the
+    objects using it, so a query only visits the objects holding one of
+    its terms. Every object also keeps a digest of its text, which lets
+    put() skip texts that did not change, and lets an index saved by
+    dump() and read back by load() be trusted object by object.
+    """
+
+    k1 = 1.2
+    b = 0.75
+    stemming = getenv("HBNB_SEARCH_STEM", "1") == "1"
+
+    __words = re.compile(r'[^\W_]+')
+
+    def __init__(self):
+        """Instantiates an empty index"""
+        self.postings = {}
+        self.changed = False
+        self.__docs = {}
+        self.__length = 0
+
+    def __len__(self):
+        """Returns the number of indexed objects"""
+        return len(self.__docs)
+
+    def __contains__(self, key):
+        """Checks if key is indexed"""
+        return key in self.__docs
+
+    def keys(self):
+        """Returns the keys of the indexed objects"""
+        return list(self.__docs)
+
+    def tokens(self, text):
+        """Returns the terms of text, in order"""
+        words = self.__words.findall(text.lower())
+        if self.stemming:
+            return [stem(word) for word in words if word not in STOPWORDS]
+        return [word for word in words if word not in STOPWORDS]
+
+    def put(self, key, text):
+        """Indexes text as the text of the object under key"""
+        if type(text) is not str:
+            text = ''
+        digest = blake2b(text.encode(), digest_size=8).hexdigest()
+        doc = self.__docs.get(key)
+        if doc is not None and doc[0] == digest:
+            return
+        freqs = {}
+        for term in self.tokens(text):
+            freqs[term] = freqs.get(term, 0) + 1
+        self.__add(key, digest, sum(freqs.values()), freqs)
+
+    def remove(self, key):
+        """Drops the object under key"""
+        doc = self.__docs.pop(key, None)
+        if doc is None:
+            return
+        digest, length, freqs = doc
+        self.__length -= length
+        for term in freqs:
+            posting = self.postings[term]
+            del posting[key]
+            if not posting:
+                del self.postings[term]
+        self.changed = True
+
+    def clear(self):
+        """Drops every object"""
+        self.postings.clear()
+        self.__docs.clear()
+        self.__length = 0
+        self.changed = True
+
+    def search(self, query, limit=None):
+        """Returns [(score, key)] of the objects matching any term of
+        query, best first, at most limit of them
+        """
+        terms = set(self.tokens(query))
+        count = len(self.__docs)
+        if not terms or not count:
+            return []
+        average = self.__length / count or 1
+        k1, b = self.k1, self.b
+        scores = {}
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            idf = log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for key, tf in posting.items():
+                norm = k1 * (1 - b + b * self.__docs[key][1] / average)
+                scores[key] = scores.get(key, 0) + \
+                    idf * tf * (k1 + 1) / (tf + norm)
+        ranked = ((score, key) for key, score in scores.items())
+        if limit is None:
+            return sorted(ranked, reverse=True)
+        return nlargest(limit, ranked)
+
+    def dump(self):
+        """Returns the index as a JSON serializable dictionary"""
+        return {'stemming': self.stemming,
+                'docs': {key: list(doc) for key, doc in self.__docs.items()}}
+
+    def load(self, data):
+        """Replaces the index by one returned by dump()
+
+        Returns False, leaving the index alone, when data was built with
+        other tokenizing rules.
+        """
+        if type(data) is not dict or data.get('stemming') != self.stemming:
+            return False
+        self.clear()
+        for key, (digest, length, freqs) in data['docs'].items():
+            self.__add(key, digest, length, freqs)
+        self.changed = False
+        return True
+
+    def __add(self, key, digest, length, freqs):
+        """Stores the term frequencies of the object under key"""
+        self.remove(key)
+        self.__docs[key] = (digest, length, freqs)
+        self.__length += length
+        postings = self.postings
+        for term, tf in freqs.items():
+            posting = postings.get(term)
+            if posting is None:
+                posting = postings[term] = {}
+            posting[key] = tf
+        self.changed = True
@@ -2,6 +2,7 @@
 """ Place Module for HBNB project """
 from models.base_model import BaseModel, Base
 from sqlalchemy import Column, String, ForeignKey, Integer, Float, Table
+from sqlalchemy import Index
 from sqlalchemy.orm import relationship
 from models.review import Review
 from os import getenv
@@ -24,6 +25,7 @@ class Place(BaseModel, Base):
 
     if getenv("HBNB_TYPE_STORAGE") == 'db':
         __tablename__ = "places"
+        __table_args__ = (Index("places_location", "latitude", "longitude"),)
         city_id = Column(String(60), ForeignKey("cities.id"), nullable=False)
         user_id = Column(String(60), ForeignKey("users.id"), nullable=False)
         name = Column(String(128), nullable=False)
@@ -55,25 +57,15 @@ class Place(BaseModel, Base):
         @property
         def reviews(self):
             """getter for list of reviews"""
-            new_list = []
-            all_reviews = models.storage.all(Review)
-            for key in all_reviews:
-                if all_reviews[key] == self.id:
-                    new_list.append(all_reviews[key])
-            return new_list
+            return models.storage.related(Review, 'place_id', self.id)
 
         @property
         def amenities(self):
             """getter for list of amenities"""
-            new_list = []
-            all_amenities = models.storage.all(Amenity)
-            for key in all_amenities:
-                if all_amenities[key] in self.amenity_ids:
-                    new_list.append(all_amenities[key])
-            return new_list
+            return models.storage.get_many(Amenity, self.amenity_ids)
 
         @amenities.setter
         def amenities(self, value):
             """adds a new aminity"""
-            if type(value) == Amenity:
-                self.amenity_ids.append(value.id)
+            if type(value) == Amenity and value.id not in self.amenity_ids:
+                self.amenity_ids = self.amenity_ids + [value.id]
@@ -20,9 +20,4 @@ class State(BaseModel, Base):
         @property
         def cities(self):
             """getter for list of citis"""
-            new_list = []
-            all_cities = models.storage.all(City)
-            for key in all_cities:
-                if all_cities[key].state_id == self.id:
-                    new_list.append(all_cities[key])
-            return new_list
+            return models.storage.related(City, 'state_id', self.id)
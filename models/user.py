@@ -3,7 +3,10 @@
 from models.base_model import BaseModel, Base
 from sqlalchemy import Column, Integer, String
 from sqlalchemy.orm import relationship
+from models.place import Place
+from models.review import Review
 from os import getenv
+import models
 
 
 class User(BaseModel, Base):
@@ -22,3 +25,13 @@ class User(BaseModel, Base):
         password = ""
         first_name = ""
         last_name = ""
+
+        @property
+        def places(self):
+            """getter for list of places"""
+            return models.storage.related(Place, 'user_id', self.id)
+
+        @property
+        def reviews(self):
+            """getter for list of reviews"""
+            return models.storage.related(Review, 'user_id', self.id)
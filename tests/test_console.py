@@ -87,7 +87,7 @@ class TestHBNBCommand_help(unittest.TestCase):
             self.assertEqual(h, output.getvalue().strip())
 
     def test_help_count(self):
-        h = "Usage: count <class_name>"
+        h = "Usage: count <class_name> [<key>=<value> ...]"
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(HBNBCommand().onecmd("help count"))
             self.assertEqual(h, output.getvalue().strip())
@@ -101,10 +101,19 @@ class TestHBNBCommand_help(unittest.TestCase):
             self.assertFalse(HBNBCommand().onecmd("help update"))
             self.assertEqual(h, output.getvalue().strip())
 
+    def test_help_search(self):
+        h = ("Shows the 10 objects of a class best matching a query,\n"
+             "searching the name and description of places, and the text\n"
+             "of reviews\n[Usage]: search <className> <query>")
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("help search"))
+            self.assertEqual(h, output.getvalue().strip())
+
     def test_help(self):
         h = ("Documented commands (type help <topic>):\n"
              "========================================\n"
-             "EOF  all  count  create  destroy  help  quit  show  update")
+             "EOF  all  count  create  destroy  help  quit  search  show"
+             "  update")
         with patch("sys.stdout", new=StringIO()) as output:
             self.assertFalse(HBNBCommand().onecmd("help"))
             self.assertEqual(h, output.getvalue().strip())
@@ -1009,6 +1018,34 @@ class TestHBNBCommand_update(unittest.TestCase):
                                                   John age 25 extra_param"))
             self.assertEqual(output.getvalue().strip(), cr_out)
 
+    def test_update_read_only_attribute(self):
+        correct = "** attribute can't be set **"
+        for c_name, attr in (("State", "cities"), ("User", "places"),
+                             ("User", "reviews"), ("Place", "reviews")):
+            with patch("sys.stdout", new=StringIO()) as output:
+                HBNBCommand().onecmd("create {}".format(c_name))
+                c_id = output.getvalue().strip()
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(
+                    "update {} {} {} foo".format(c_name, c_id, attr)))
+                self.assertEqual(correct, output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                'update Place {} {{"name": "Loft", "reviews": "foo"}}'
+                .format(c_id)))
+            self.assertEqual(correct, output.getvalue().strip())
+        self.assertNotEqual(storage.get("Place", c_id).name, "Loft")
+
+    def test_update_attribute(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd("create State")
+            c_id = output.getvalue().strip()
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                "update State {} name Utah".format(c_id)))
+            self.assertEqual("", output.getvalue().strip())
+        self.assertEqual(storage.get("State", c_id).name, "Utah")
+
 
 class TestHBNBCommand_count(unittest.TestCase):
     """Unittests for testing count method of HBNB comand interpreter."""
@@ -1082,6 +1119,118 @@ class TestHBNBCommand_count(unittest.TestCase):
             self.assertFalse(HBNBCommand().onecmd("Review.count()"))
             self.assertEqual(cr_r, output.getvalue().strip())
 
+    def test_count_missing_class(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("count"))
+            self.assertEqual("** class name missing **",
+                             output.getvalue().strip())
+
+    def test_count_unknown_class(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("count MyModel"))
+            self.assertEqual("** class doesn't exist **",
+                             output.getvalue().strip())
+
+    def test_count_filters(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd('create State name="California"')
+            HBNBCommand().onecmd('create State name="Nevada"')
+            HBNBCommand().onecmd('create City name="Reno"')
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("count State"))
+            self.assertEqual("2", output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd('count State name="Nevada"'))
+            self.assertEqual("1", output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd('count State name="Utah"'))
+            self.assertEqual("0", output.getvalue().strip())
+
+    def test_count_without_value(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            HBNBCommand().onecmd('create State name="Nevada"')
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("count State foo"))
+            self.assertEqual("1", output.getvalue().strip())
+
+    def test_count_unknown_attribute(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("count State foo=1"))
+            self.assertEqual("** attribute doesn't exist **",
+                             output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd('count State id="1"'))
+            self.assertEqual("0", output.getvalue().strip())
+
+    def test_count_not_a_field(self):
+        for line in ('count State cities="x"', 'count User places="x"',
+                     'count Place reviews="x"', 'count Place amenities="x"',
+                     'count State save="x"', 'count State to_dict="x"'):
+            with patch("sys.stdout", new=StringIO()) as output:
+                self.assertFalse(HBNBCommand().onecmd(line))
+                self.assertEqual("** attribute doesn't exist **",
+                                 output.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd('count Place max_guest=2'))
+            self.assertEqual("0", output.getvalue().strip())
+
+
+class TestHBNBCommand_search(unittest.TestCase):
+    """Unittests for testing search method of HBNB comand interpreter."""
+
+    @classmethod
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    @classmethod
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+
+    def test_search_missing_class(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search"))
+            self.assertEqual("** class name missing **",
+                             output.getvalue().strip())
+
+    def test_search_invalid_class(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search MyModel pool"))
+            self.assertEqual("** class doesn't exist **",
+                             output.getvalue().strip())
+
+    def test_search_missing_query(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search Place"))
+            self.assertEqual("** query missing **",
+                             output.getvalue().strip())
+
+    def test_search_object(self):
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                'create Place name="Sunny_loft_with_pool"'))
+            loft = output.getvalue().strip()
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd(
+                'create Place name="Dark_cellar"'))
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search Place pools"))
+            self.assertIn(loft, output.getvalue())
+            self.assertEqual(output.getvalue().count("[Place]"), 1)
+        with patch("sys.stdout", new=StringIO()) as output:
+            self.assertFalse(HBNBCommand().onecmd("search State pool"))
+            self.assertEqual("[]", output.getvalue().strip())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,13 +1,15 @@
 #!/usr/bin/python3
 """Unittest for BaseModel"""
 import unittest
-from models.base_model import BaseModel, Base
+from models.base_model import BaseModel, Base, format_time, parse_time
 import models
 import pep8
 from datetime import datetime
 import inspect
 from unittest.mock import patch
 import os
+import subprocess
+import sys
 from sqlalchemy import create_engine, inspect
 from sqlalchemy.orm import sessionmaker
 FileStorage = models.FileStorage
@@ -234,6 +236,22 @@ class TestBaseModel(unittest.TestCase):
         self.assertNotEqual(obj.created_at, obj_c_at)
         self.assertNotEqual(obj.updated_at, obj_u_at)
 
+    def test_whole_second_timestamps(self):
+        """Test timestamps without microseconds survive a round trip"""
+        obj = BaseModel()
+        obj.created_at = datetime(2023, 12, 7, 16, 16, 21)
+        obj_dict = obj.to_dict()
+        self.assertEqual(obj_dict['created_at'], "2023-12-07T16:16:21.000000")
+        self.assertEqual(BaseModel(**obj_dict).created_at, obj.created_at)
+
+    def test_parse_time(self):
+        """Test parse_time reads what format_time writes"""
+        now = datetime.now()
+        self.assertEqual(parse_time(format_time(now)), now)
+        self.assertIs(parse_time(now), now)
+        with self.assertRaises(ValueError):
+            parse_time("07/12/2023")
+
     # Storage Integrations Test
     @patch('models.storage.save')
     def test_save_method_updates_storage(self, mock_save):
@@ -274,3 +292,62 @@ class TestBaseModel(unittest.TestCase):
         self.assertLess(original_updated_at, self.base_i.updated_at)
         with open("file.json", "r") as f:
             self.assertIn(f"BaseModel.{self.base_i.id}", f.read())
+
+
+@unittest.skipIf(
+        os.getenv("HBNB_TYPE_STORAGE") == 'db',
+        "testing file_storage")
+class TestCompactModels(unittest.TestCase):
+    """Tests HBNB_COMPACT_MODELS, in a new interpreter as the mode is
+    picked at import time"""
+
+    script = '''
+import tempfile
+from models.engine.file_storage import FileStorage
+FileStorage._FileStorage__file_path = tempfile.mktemp()
+from models.place import Place
+place = Place(name="Loft", number_rooms=2)
+assert not hasattr(place, '__weakref__') and type(place).__dictoffset__ == 0
+assert place.max_guest == 0 and place.amenity_ids == []
+place.color = "red"
+assert place.to_dict()['color'] == "red" and place.color == "red"
+again = Place(**place.to_dict())
+assert again.to_dict() == place.to_dict() and str(again) == str(place)
+try:
+    place.nothing
+except AttributeError:
+    print("OK")
+'''
+
+    listing = '''
+import tempfile
+from models.engine.file_storage import FileStorage
+FileStorage._FileStorage__file_path = tempfile.mktemp()
+from models.place import Place
+place = Place(updated_at="2024-01-02T03:04:05.000006", id="1",
+              created_at="2024-01-02T03:04:05.000006", name="Loft",
+              color="red", max_guest=3)
+place.number_rooms = 2
+place.floor = 4
+print(place)
+print(place.to_dict())
+'''
+
+    def test_compact_listing_matches_plain_models(self):
+        """Checks __str__ and to_dict() keep the order attributes were set
+        in, as plain models do"""
+        outputs = []
+        for compact in ("0", "1"):
+            env = dict(os.environ, HBNB_COMPACT_MODELS=compact)
+            outputs.append(subprocess.run(
+                [sys.executable, '-c', self.listing], env=env,
+                stdout=subprocess.PIPE, check=True).stdout)
+        self.assertIn(b"{'updated_at'", outputs[0])
+        self.assertEqual(outputs[1], outputs[0])
+
+    def test_compact_models(self):
+        """Checks slotted models behave as plain ones"""
+        env = dict(os.environ, HBNB_COMPACT_MODELS="1")
+        out = subprocess.run([sys.executable, '-c', self.script], env=env,
+                             stdout=subprocess.PIPE, check=True)
+        self.assertEqual(out.stdout, b"OK\n")
@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+"""Test Module for the bitmap index"""
+import unittest
+import pep8
+from models.engine.bitmap_index import BitmapIndex
+
+
+class TestBitmapIndex_pep8(unittest.TestCase):
+    """Unittest for BitmapIndex class docs and style"""
+
+    def test_docstring(self):
+        """checks for docstrings"""
+        self.assertIsNotNone(BitmapIndex.__doc__)
+        self.assertIsNotNone(BitmapIndex.all_of.__doc__)
+        self.assertIsNotNone(BitmapIndex.any_of.__doc__)
+
+    def test_pep8(self):
+        """Checks PEP8 compliance"""
+        msg = "PEP8 incompliant, errors found"
+        style = pep8.StyleGuide()
+        res = style.check_files(["models/engine/bitmap_index.py"])
+        self.assertEqual(res.total_errors, 0, msg)
+
+
+class TestBitmapIndex(unittest.TestCase):
+    """Unittest for BitmapIndex class"""
+
+    def setUp(self):
+        self.index = BitmapIndex()
+        self.index.put('a', ['wifi', 'pool', 'tv'])
+        self.index.put('b', ['wifi', 'tv'])
+        self.index.put('c', ['pool'])
+        self.index.put('d', [])
+
+    def test_all_of(self):
+        self.assertEqual(self.index.all_of(['wifi', 'tv']), ['a', 'b'])
+        self.assertEqual(self.index.all_of(['wifi', 'pool', 'tv']), ['a'])
+        self.assertEqual(self.index.all_of(['wifi', 'sauna']), [])
+        self.assertEqual(self.index.all_of([]), ['a', 'b', 'c', 'd'])
+
+    def test_any_of(self):
+        self.assertEqual(self.index.any_of(['pool', 'sauna']), ['a', 'c'])
+        self.assertEqual(self.index.any_of([]), [])
+
+    def test_put_replaces_values(self):
+        self.index.put('c', ['wifi', 'tv'])
+        self.assertEqual(self.index.all_of(['wifi', 'tv']), ['a', 'b', 'c'])
+        self.assertEqual(self.index.any_of(['pool']), ['a'])
+        self.index.put('a', 'wifi')
+        self.assertEqual(self.index.any_of(['wifi', 'pool', 'tv']),
+                         ['b', 'c'])
+
+    def test_remove_frees_the_ordinal(self):
+        self.index.remove('b')
+        self.index.remove('b')
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.any_of(['tv']), ['a'])
+        self.index.put('e', ['tv'])
+        self.assertEqual(self.index.any_of(['tv']), ['a', 'e'])
+        self.assertEqual(self.index.keys({0: 0b10}), ['e'])
+        self.index.clear()
+        self.assertEqual(self.index.all_of([]), [])
+        self.assertEqual(self.index.bits, {})
+
+    def test_many_ordinals(self):
+        index = BitmapIndex()
+        for i in range(5000):
+            index.put(i, ['even'] if i % 2 == 0 else ['odd'])
+        self.assertEqual(index.any_of(['odd']), list(range(1, 5000, 2)))
+
+
+if __name__ == '__main__':
+    unittest.main()
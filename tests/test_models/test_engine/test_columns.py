@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""Test Module for the columnar store"""
+import unittest
+from unittest.mock import patch
+import pep8
+from models.engine import columns
+from models.engine.columns import ColumnStore
+
+
+class TestColumnStore_pep8(unittest.TestCase):
+    """Unittest for ColumnStore class docs and style"""
+
+    def test_docstring(self):
+        """checks for docstrings"""
+        self.assertIsNotNone(ColumnStore.__doc__)
+        self.assertIsNotNone(ColumnStore.put.__doc__)
+        self.assertIsNotNone(ColumnStore.where.__doc__)
+
+    def test_pep8(self):
+        """Checks PEP8 compliance"""
+        msg = "PEP8 incompliant, errors found"
+        style = pep8.StyleGuide()
+        res = style.check_files(["models/engine/columns.py"])
+        self.assertEqual(res.total_errors, 0, msg)
+
+
+class TestColumnStore(unittest.TestCase):
+    """Unittest for ColumnStore class"""
+
+    def setUp(self):
+        self.store = ColumnStore(('price', 'guests'))
+        self.store.put('a', {'price': 50, 'guests': 2})
+        self.store.put('b', {'price': 120.5, 'guests': 4})
+        self.store.put('c', {'price': 300, 'guests': 4})
+        self.store.put('d', {'price': 'free', 'guests': None})
+
+    def where(self, **conditions):
+        return sorted(self.store.where(**conditions))
+
+    def test_equality_and_ranges(self):
+        self.assertEqual(self.where(guests=4), ['b', 'c'])
+        self.assertEqual(self.where(price=(100, 300)), ['b', 'c'])
+        self.assertEqual(self.where(price=(None, 120.5), guests=(3, None)),
+                         ['b'])
+        self.assertEqual(self.where(), ['a', 'b', 'c', 'd'])
+
+    def test_not_numbers_never_match(self):
+        self.assertEqual(self.where(price=(None, None)), ['a', 'b', 'c'])
+
+    def test_put_updates_row(self):
+        self.store.put('a', {'guests': 8})
+        self.assertEqual(self.where(guests=(5, None)), ['a'])
+        self.assertEqual(self.where(price=50), ['a'])
+
+    def test_remove_moves_last_row(self):
+        self.store.remove('a')
+        self.store.remove('x')
+        self.assertEqual(self.store.keys, ['d', 'b', 'c'])
+        self.assertEqual(self.where(guests=4), ['b', 'c'])
+        self.assertEqual(self.where(price=(None, 100)), [])
+        self.store.clear()
+        self.assertEqual(len(self.store), 0)
+
+    def test_without_numpy(self):
+        with patch.object(columns, 'numpy', None):
+            self.assertEqual(self.where(price=(100, None), guests=4),
+                             ['b', 'c'])
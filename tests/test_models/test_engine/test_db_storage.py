@@ -179,6 +179,123 @@ class TestDBStorage(unittest.TestCase):
         except Exception:
             self.fail
 
+    @unittest.skipIf(getenv('HBNB_TYPE_STORAGE') != 'db',
+                     "Testing DBStorage")
+    def test_with_amenities(self):
+        """Test with_amenities method."""
+        self.assertEqual(self.storage.with_amenities([self.amenity]), [])
+        self.place.amenities.append(self.amenity)
+        self.storage.save()
+        self.assertEqual(self.storage.with_amenities([self.amenity.id]),
+                         [self.place])
+        self.assertEqual(self.storage.with_amenities(["nope"]), [])
+        self.assertEqual(self.storage.with_amenities(
+            [self.amenity, "nope"], match_any=True), [self.place])
+
+    @unittest.skipIf(getenv('HBNB_TYPE_STORAGE') != 'db',
+                     "Testing DBStorage")
+    def test_with_amenities_sees_other_sessions(self):
+        """Test with_amenities after another session linked a place."""
+        pool = Amenity(name="Pool")
+        self.storage.new(pool)
+        self.storage.save()
+        self.assertEqual(self.storage.with_amenities([pool]), [])
+        other = sessionmaker(bind=self.storage._DBStorage__engine)()
+        other.get(Place, self.place.id).amenities.append(
+            other.get(Amenity, pool.id))
+        other.commit()
+        other.close()
+        self.storage.close()
+        self.assertEqual([place.id for place in
+                          self.storage.with_amenities([pool])],
+                         [self.place.id])
+
+    @unittest.skipIf(getenv('HBNB_TYPE_STORAGE') != 'db',
+                     "Testing DBStorage")
+    def test_search(self):
+        """Test search method."""
+        self.assertEqual(self.storage.search(Place, "schools"), [self.place])
+        self.assertEqual(self.storage.search("Review", "stellar"),
+                         [self.review])
+        self.assertEqual(self.storage.search(Place, "castle"), [])
+        self.assertEqual(self.storage.search(State, "california"), [])
+
+    @unittest.skipIf(getenv('HBNB_TYPE_STORAGE') != 'db',
+                     "Testing DBStorage")
+    def test_search_sees_other_sessions(self):
+        """Test search after another session changed the table."""
+        self.assertEqual(self.storage.search("Review", "stellar"),
+                         [self.review])
+        other = sessionmaker(bind=self.storage._DBStorage__engine)()
+        review = Review(place_id=self.place.id, user_id=self.user.id,
+                        text="stellar views")
+        other.add(review)
+        other.commit()
+        self.storage.close()
+        self.assertEqual(len(self.storage.search("Review", "views")), 1)
+        other.delete(other.get(Review, review.id))
+        other.commit()
+        other.close()
+        self.assertEqual(self.storage.search("Review", "views"), [])
+
+    @unittest.skipIf(getenv('HBNB_TYPE_STORAGE') != 'db',
+                     "Testing DBStorage")
+    def test_query(self):
+        """Test query method."""
+        query = self.storage.query(City)
+        self.assertEqual(query.filter(state_id=self.state.id).all(),
+                         [self.city])
+        self.assertEqual(query.filter(name="Nowhere").count(), 0)
+        self.assertEqual(self.storage.query("State").order_by("-name")
+                         .only("name").limit(1).all(),
+                         [{"name": "California"}])
+        self.assertIsNone(query.offset(1).first())
+
+    @unittest.skipIf(getenv('HBNB_TYPE_STORAGE') != 'db',
+                     "Testing DBStorage")
+    def test_count_and_exists(self):
+        """Test count and exists methods."""
+        self.assertEqual(self.storage.count(City, state_id=self.state.id), 1)
+        self.assertEqual(self.storage.count("City", name="Nowhere"), 0)
+        self.assertGreaterEqual(self.storage.count(), 2)
+        self.assertTrue(self.storage.exists(City, self.city.id))
+        self.assertFalse(self.storage.exists("State", "nope"))
+
+    @unittest.skipIf(getenv('HBNB_TYPE_STORAGE') != 'db',
+                     "Testing DBStorage")
+    def test_get_and_get_many(self):
+        """Test get and get_many methods."""
+        self.assertEqual(self.storage.get(City, self.city.id), self.city)
+        self.assertIsNone(self.storage.get("State", "nope"))
+        self.assertEqual(self.storage.get_many(City, ["nope", self.city.id]),
+                         [self.city])
+
+    @unittest.skipIf(getenv('HBNB_TYPE_STORAGE') != 'db',
+                     "Testing DBStorage")
+    def test_iter(self):
+        """Test iter method."""
+        self.assertIn(self.city, list(self.storage.iter(City, 1)))
+        self.assertIn(self.state, list(self.storage.iter(batch_size=1)))
+        self.assertEqual(list(self.storage.iter("Review")), [self.review])
+
+    @unittest.skipIf(getenv('HBNB_TYPE_STORAGE') != 'db',
+                     "Testing DBStorage")
+    def test_query_load(self):
+        """Test eager loading of query relationships."""
+        self.storage._DBStorage__session.expire_all()
+        self.storage.queries = 0
+        states = self.storage.query(State).load('cities.places').all()
+        for state in states:
+            for city in state.cities:
+                city.places
+        self.assertEqual(self.storage.queries, 3)
+        self.storage.queries = 0
+        places = self.storage.query(Place).load('user', 'reviews').all()
+        self.assertEqual([review.text for review in places[0].reviews],
+                         ["stellar"])
+        self.assertEqual(places[0].user.email, "poppy@holberton.com")
+        self.assertEqual(self.storage.queries, 2)
+
     @unittest.skipIf(type(models.storage) == FileStorage,
                      "Testing FileStorage")
     def test_reload(self):
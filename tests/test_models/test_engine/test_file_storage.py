@@ -2,7 +2,11 @@
 """Test Module for file storage"""
 import unittest
 import os
+import json
+import tempfile
+import time
 import pep8
+from unittest.mock import patch
 from models.base_model import BaseModel
 from models.user import User
 from models.place import Place
@@ -11,6 +15,11 @@ from models.city import City
 from models.amenity import Amenity
 from models.review import Review
 from models.engine.file_storage import FileStorage
+from models.engine.json_stream import ObjectStream
+from models.engine.lazy_object import LazyObject
+from models.engine.serializers import BinarySerializer, serializer
+from models.engine.symbols import SymbolTable
+from models.engine.text_index import TextIndex
 
 
 class TestAmenity_pep8(unittest.TestCase):
@@ -78,6 +87,40 @@ class TestFileStorage(unittest.TestCase):
         self.assertIn("User.{}".format(self.user.id), result)
         self.assertNotIn("BaseModel.{}".format(self.base_model.id), result)
 
+    def test_all_method_accepts_class_name(self):
+        self.file_storage.new(self.user)
+        self.assertEqual(self.file_storage.all("User"),
+                         self.file_storage.all(User))
+
+    def test_all_method_returns_copy_for_class(self):
+        self.file_storage.new(self.user)
+        self.file_storage.all(User).clear()
+        self.assertIn("User.{}".format(self.user.id),
+                      self.file_storage.all(User))
+
+    def test_count_method(self):
+        FileStorage._FileStorage__objects = {}
+        self.file_storage.new(self.user)
+        self.file_storage.new(self.place)
+        self.file_storage.new(self.state)
+        self.assertEqual(self.file_storage.count(), 3)
+        self.assertEqual(self.file_storage.count(User), 1)
+        self.assertEqual(self.file_storage.count("Review"), 0)
+
+    def test_related_method(self):
+        FileStorage._FileStorage__objects = {}
+        self.city.state_id = self.state.id
+        self.file_storage.new(self.state)
+        self.file_storage.new(self.city)
+        self.assertEqual(self.file_storage.related(City, 'state_id',
+                                                   self.state.id),
+                         [self.city])
+        self.city.state_id = "other"
+        self.assertEqual(self.file_storage.related(City, 'state_id',
+                                                   self.state.id), [])
+        self.assertEqual(self.file_storage.related("City", 'name', ""),
+                         [self.city])
+
     def test_delete_method_removes_object(self):
         # Check if the delete method removes the specified object
         self.file_storage.new(self.base_model)
@@ -86,6 +129,39 @@ class TestFileStorage(unittest.TestCase):
         self.assertNotIn("BaseModel.{}".format(self.base_model.id),
                          self.file_storage.all())
 
+    def test_delete_method_uses_key(self):
+        self.file_storage.new(self.user)
+        self.file_storage.delete(User(**self.user.to_dict()))
+        self.assertNotIn("User.{}".format(self.user.id),
+                         self.file_storage.all())
+        self.file_storage.delete(self.user)  # already gone, no error
+
+    def test_delete_many_saves_once(self):
+        objs = [State(), State(), City()]
+        for obj in objs:
+            self.file_storage.new(obj)
+        with patch.object(FileStorage, 'save') as mock_save:
+            self.assertEqual(self.file_storage.delete_many(objs), 3)
+        mock_save.assert_called_once_with()
+        for obj in objs:
+            self.assertNotIn("{}.{}".format(type(obj).__name__, obj.id),
+                             self.file_storage.all())
+
+    def test_delete_where(self):
+        FileStorage._FileStorage__objects = {}
+        keep = State(name="keep")
+        drop = State(name="drop")
+        for obj in (keep, drop, City(name="drop")):
+            self.file_storage.new(obj)
+        count = self.file_storage.delete_where(
+            State, lambda obj: obj.name == "drop")
+        self.assertEqual(count, 1)
+        self.assertEqual(list(self.file_storage.all(State).values()),
+                         [keep])
+        self.assertEqual(self.file_storage.count(City), 1)
+        with open(FileStorage._FileStorage__file_path) as f:
+            self.assertNotIn(drop.id, f.read())
+
     def test_reload_method_loads_data(self):
         # Check if the reload method loads data from the file
         self.file_storage.new(self.base_model)
@@ -97,9 +173,880 @@ class TestFileStorage(unittest.TestCase):
         result = new_file_storage.all()
         self.assertIn("BaseModel.{}".format(self.base_model.id), result)
 
+    def test_reload_limit_and_progress(self):
+        FileStorage._FileStorage__objects = {}
+        for obj in (self.user, self.place, self.state):
+            self.file_storage.new(obj)
+        self.file_storage.save()
+        FileStorage._FileStorage__objects = {}
+        seen = []
+        self.file_storage.reload(limit=2, progress=seen.append)
+        self.assertEqual(len(self.file_storage.all()), 2)
+        self.assertEqual(seen, [2])
+        self.file_storage.reload()
+        self.assertEqual(len(self.file_storage.all()), 3)
+
     def test_reload_method_handles_nonexistent_file(self):
         self.file_storage.reload()  # No exception should be raised
 
 
+class FileStorageTestCase(unittest.TestCase):
+    """Base class running each test on an empty FileStorage in a temp dir"""
+
+    state = ('file_path', 'objects', 'serializer', 'dirty', 'encoded',
+             'tracked', 'loaded', 'symbols', 'mapped', 'shards', 'stale',
+             'journal_mode', 'lazy_mode', 'write_behind', 'flush_interval',
+             'flush_threshold', 'shard_mode', 'mmap_mode')
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = {name: getattr(FileStorage, '_FileStorage__' + name)
+                      for name in self.state}
+        FileStorage._FileStorage__file_path = os.path.join(self.tmp.name,
+                                                           'file.json')
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__dirty = set()
+        FileStorage._FileStorage__encoded = {}
+        FileStorage._FileStorage__tracked = None
+        FileStorage._FileStorage__loaded = (None, None)
+        FileStorage._FileStorage__symbols = SymbolTable()
+        FileStorage._FileStorage__mapped = (None, None)
+        FileStorage._FileStorage__shards = {}
+        FileStorage._FileStorage__stale = set()
+        self.storage = FileStorage()
+
+    def tearDown(self):
+        for name, value in self.saved.items():
+            setattr(FileStorage, '_FileStorage__' + name, value)
+        self.tmp.cleanup()
+
+
+class TestFileStorageDeltaSave(FileStorageTestCase):
+    """Unittest for the dirty tracking of FileStorage.save()"""
+
+    def setUp(self):
+        super().setUp()
+        self.states = [State(name=str(i)) for i in range(5)]
+        for state in self.states:
+            self.storage.new(state)
+        self.storage.save()
+
+    def load(self):
+        with open(FileStorage._FileStorage__file_path) as f:
+            return json.load(f)
+
+    def test_only_dirty_objects_are_encoded(self):
+        self.states[2].name = "changed"
+        with patch.object(BaseModel, 'to_dict', autospec=True,
+                          side_effect=BaseModel.to_dict) as to_dict:
+            self.storage.save()
+        to_dict.assert_called_once_with(self.states[2])
+        self.assertEqual(self.load()['State.' + self.states[2].id]['name'],
+                         "changed")
+
+    def test_delta_save_matches_full_dump(self):
+        self.states[0].name = "changed"
+        self.storage.delete(self.states[1])
+        self.storage.new(City(name="Fremont"))
+        self.storage.save()
+        expected = {k: v.to_dict() for k, v in self.storage.all().items()}
+        self.assertEqual(self.load(), expected)
+        self.assertEqual(FileStorage._FileStorage__dirty, set())
+
+    def test_in_place_changes_are_saved(self):
+        place = Place(name="Loft", amenity_ids=[])
+        self.storage.new(place)
+        self.storage.save()
+        place.amenity_ids.append('a1')
+        self.storage.save()
+        key = 'Place.' + place.id
+        self.assertEqual(self.load()[key]['amenity_ids'], ['a1'])
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.storage.all()[key].amenity_ids.append('a2')
+        self.storage.save()
+        self.assertEqual(self.load()[key]['amenity_ids'], ['a1', 'a2'])
+
+    def test_save_is_atomic(self):
+        self.states[0].name = "changed"
+        with patch.object(BaseModel, 'to_dict', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.storage.save()
+        self.assertEqual(len(self.load()), 5)
+        self.assertEqual(os.listdir(self.tmp.name), ['file.json'])
+
+    def test_dirty_keys(self):
+        city = City()
+        self.storage.new(city)
+        self.storage.delete(self.states[0])
+        self.states[1].name = "changed"
+        self.assertEqual(FileStorage._FileStorage__dirty,
+                         {'City.' + city.id, 'State.' + self.states[0].id,
+                          'State.' + self.states[1].id})
+
+
+class TestFileStorageReload(FileStorageTestCase):
+    """Unittest for the change detection of FileStorage.reload()"""
+
+    def setUp(self):
+        super().setUp()
+        for i in range(3):
+            self.storage.new(State(name=str(i)))
+        self.storage.save()
+        self.storage.reload()
+        self.before = dict(self.storage.all())
+
+    def test_unchanged_file_is_not_parsed(self):
+        with patch('builtins.open') as mock_open:
+            self.storage.close()
+        mock_open.assert_not_called()
+        for key, obj in self.storage.all().items():
+            self.assertIs(obj, self.before[key])
+
+    def test_only_changed_entries_are_rebuilt(self):
+        path = FileStorage._FileStorage__file_path
+        with open(path) as f:
+            data = json.load(f)
+        key = sorted(data)[1]
+        data[key]['name'] = "changed"
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        self.storage.reload()
+        for k, obj in self.storage.all().items():
+            if k == key:
+                self.assertIsNot(obj, self.before[k])
+                self.assertEqual(obj.name, "changed")
+            else:
+                self.assertIs(obj, self.before[k])
+
+    def test_only_changed_entries_are_decoded(self):
+        FileStorage._FileStorage__lazy_mode = False
+        path = FileStorage._FileStorage__file_path
+        with open(path) as f:
+            text = f.read()
+        with open(path, 'w') as f:
+            f.write(text.replace('"name": "1"', '"name": "changed"'))
+        with patch.object(ObjectStream, 'value',
+                          side_effect=ObjectStream.value) as value:
+            self.storage.reload()
+        self.assertEqual(value.call_count, 1)
+        self.assertEqual(self.storage.count(State, name="changed"), 1)
+
+    def test_reload_keeps_no_entry_text(self):
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__lazy_mode = False
+        self.storage.reload()
+        cache = FileStorage._FileStorage__encoded
+        self.assertEqual(len(cache), 3)
+        self.assertTrue(all(entry[2] is None for entry in cache.values()))
+
+    def test_unsaved_changes_are_reverted(self):
+        key = sorted(self.before)[0]
+        self.before[key].name = "unsaved"
+        self.storage.reload()
+        self.assertNotEqual(self.storage.all()[key].name, "unsaved")
+
+    def test_replaced_objects_are_reloaded(self):
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(set(self.storage.all()), set(self.before))
+
+
+class TestFileStorageLookups(FileStorageTestCase):
+    """Unittest for count(), exists(), get() and iter() of FileStorage"""
+
+    def setUp(self):
+        super().setUp()
+        for i in range(3):
+            self.storage.new(State(name=str(i)))
+        self.storage.save()
+        self.storage.reload()
+        self.before = dict(self.storage.all())
+
+    def test_count_and_exists(self):
+        cheap = Place(name="Cabin", price_by_night=60, max_guest=4)
+        large = Place(name="Villa", price_by_night=400, max_guest=10)
+        for place in (cheap, large):
+            self.storage.new(place)
+        self.assertEqual(self.storage.count(), 5)
+        self.assertEqual(self.storage.count(Place), 2)
+        self.assertEqual(self.storage.count(Place, price_by_night=(None, 100)),
+                         1)
+        self.assertEqual(self.storage.count('State', name="1"), 1)
+        with self.assertRaises(ValueError):
+            self.storage.count(name="1")
+        self.assertTrue(self.storage.exists(Place, cheap.id))
+        self.assertFalse(self.storage.exists('Place', "nope"))
+        self.storage.delete(cheap)
+        self.assertFalse(self.storage.exists(Place, cheap.id))
+
+    def test_get_and_get_many(self):
+        keys = sorted(self.before)
+        first = self.before[keys[0]]
+        second = self.before[keys[1]]
+        self.assertIs(self.storage.get(State, first.id), first)
+        self.assertIs(self.storage.get('State', second.id), second)
+        self.assertIsNone(self.storage.get(State, "nope"))
+        self.assertIsNone(self.storage.get(Place, first.id))
+        self.assertEqual(self.storage.get_many(State, [second.id, "nope",
+                                                       first.id, second.id]),
+                         [second, first])
+        self.assertEqual(self.storage.get_many(State, []), [])
+
+    def test_iter(self):
+        place = Place(name="Cabin")
+        self.storage.new(place)
+        self.assertEqual(list(self.storage.iter(Place)), [place])
+        self.assertEqual(set(obj.id for obj in self.storage.iter('State')),
+                         set(obj.id for obj in self.before.values()))
+        self.assertEqual(len(list(self.storage.iter(batch_size=2))), 4)
+
+
+class TestFileStorageQuery(FileStorageTestCase):
+    """Unittest for where() and query() of FileStorage"""
+
+    def test_where(self):
+        cheap = Place(name="Cabin", price_by_night=60, max_guest=4)
+        large = Place(name="Villa", price_by_night=400, max_guest=10)
+        for place in (cheap, large):
+            self.storage.new(place)
+        self.assertEqual(self.storage.where(Place, price_by_night=(None, 100),
+                                            max_guest=(4, None)), [cheap])
+        self.assertEqual(self.storage.where(Place, name="Villa"), [large])
+        self.assertEqual(self.storage.where('Place', max_guest=(4, None),
+                                            name="Cabin"), [cheap])
+        cheap.price_by_night = 500
+        self.assertEqual(self.storage.where(Place, price_by_night=(None, 100)),
+                         [])
+        self.storage.delete(large)
+        self.assertEqual(self.storage.where(Place, max_guest=10), [])
+
+    def test_query(self):
+        places = [Place(name=name, price_by_night=price, city_id=city)
+                  for name, price, city in (("Loft", 80, "sf"),
+                                            ("Villa", 400, "sf"),
+                                            ("Cabin", 60, "la"),
+                                            ("Attic", 80, "sf"),
+                                            ("Tent", None, "sf"))]
+        for place in places:
+            self.storage.new(place)
+        loft, villa, cabin, attic, tent = places
+        query = self.storage.query(Place)
+        self.assertEqual(query.order_by('-price_by_night', 'name').all(),
+                         [villa, attic, loft, cabin, tent])
+        cheap = query.filter(price_by_night=(None, 100))
+        self.assertEqual(cheap.order_by('name').all(), [attic, cabin, loft])
+        self.assertEqual(cheap.count(), 3)
+        self.assertEqual(query.filter(city_id="sf")
+                         .order_by('price_by_night', 'name')
+                         .offset(1).limit(2).all(), [loft, villa])
+        self.assertEqual(query.filter(city_id="sf", name="Tent").all(), [tent])
+        self.assertEqual(query.filter(city_id="la").count(), 1)
+        self.assertEqual(query.order_by('name').only('name', 'city_id')
+                         .limit(1).all(), [{'name': "Attic", 'city_id': "sf"}])
+        self.assertEqual(len(query.offset(3).all()), 2)
+        self.assertIsNone(query.filter(name="Castle").first())
+
+
+class TestFileStorageGeo(FileStorageTestCase):
+    """Unittest for nearby() and within_bbox() of FileStorage"""
+
+    def test_nearby_and_within_bbox(self):
+        louvre = Place(name="Louvre", latitude=48.861, longitude=2.336)
+        eiffel = Place(name="Eiffel", latitude=48.858, longitude=2.294)
+        harbor = Place(name="Harbor", latitude=40.700, longitude=-74.010)
+        for place in (harbor, eiffel, louvre):
+            self.storage.new(place)
+        self.assertEqual(self.storage.nearby(48.860, 2.337, 5),
+                         [louvre, eiffel])
+        self.assertEqual(self.storage.nearby(48.860, 2.337, 5, 1), [louvre])
+        self.assertEqual(self.storage.within_bbox(40, -75, 41, -73), [harbor])
+        eiffel.latitude = 40.701
+        eiffel.longitude = -74.011
+        self.assertEqual(self.storage.nearby(48.860, 2.337, 5), [louvre])
+        self.storage.delete(louvre)
+        self.assertEqual(self.storage.nearby(48.860, 2.337, 5), [])
+
+    def test_places_without_coordinates_are_not_located(self):
+        nowhere = Place(name="no coords")
+        null_island = Place(name="Buoy", latitude=0.0, longitude=0.0)
+        self.storage.new(nowhere)
+        self.storage.new(null_island)
+        self.assertEqual(self.storage.nearby(0, 0, 5), [null_island])
+        self.assertEqual(self.storage.within_bbox(-1, -1, 1, 1),
+                         [null_island])
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        with patch.object(FileStorage, '_FileStorage__lazy_mode', True):
+            self.storage.reload()
+            self.assertEqual([place.id for place in
+                              self.storage.nearby(0, 0, 5)], [null_island.id])
+
+
+class TestFileStorageAmenities(FileStorageTestCase):
+    """Unittest for with_amenities() of FileStorage"""
+
+    def test_with_amenities(self):
+        wifi, pool = Amenity(name="Wifi"), Amenity(name="Pool")
+        loft = Place(name="Loft")
+        villa = Place(name="Villa")
+        for obj in (wifi, pool, loft, villa):
+            self.storage.new(obj)
+        loft.amenities = wifi
+        villa.amenities = wifi
+        villa.amenities = pool
+        self.assertEqual(self.storage.with_amenities([wifi, pool]), [villa])
+        self.assertEqual(self.storage.with_amenities([wifi.id]),
+                         [loft, villa])
+        self.assertEqual(self.storage.with_amenities([pool], match_any=True),
+                         [villa])
+        self.storage.delete(villa)
+        self.assertEqual(self.storage.with_amenities([pool, wifi],
+                                                     match_any=True), [loft])
+
+
+class TestFileStorageSearch(FileStorageTestCase):
+    """Unittest for the full-text search of FileStorage"""
+
+    def test_search(self):
+        loft = Place(name="Loft", description="Bright loft with a pool")
+        cabin = Place(name="Cabin", description="Pool and lake")
+        review = Review(text="The pool was cold")
+        for obj in (loft, cabin, review):
+            self.storage.new(obj)
+        self.assertEqual(self.storage.search(Place, "loft pools"),
+                         [loft, cabin])
+        self.assertEqual(self.storage.search('Place', "pool", 1), [cabin])
+        self.assertEqual(self.storage.search(Review, "cold"), [review])
+        self.assertEqual(self.storage.search(State, "0"), [])
+        cabin.description = "By the lake"
+        self.assertEqual(self.storage.search(Place, "pool"), [loft])
+        self.storage.delete(loft)
+        self.assertEqual(self.storage.search(Place, "pool"), [])
+
+    @patch.object(FileStorage, '_FileStorage__texts_mode', True)
+    def test_search_index_is_saved(self):
+        loft = Place(name="Loft")
+        cabin = Place(name="Cabin")
+        self.storage.new(loft)
+        self.storage.new(cabin)
+        self.storage.search(Place, "loft")
+        self.storage.save()
+        path = os.path.join(self.tmp.name, 'file.search.json')
+        with open(path, 'r') as f:
+            saved = f.read()
+        self.assertIn('Place.' + loft.id, json.loads(saved)['Place']['docs'])
+        self.storage.delete(cabin)
+        loft.name = "Attic"
+        self.storage.save()
+        with open(path, 'w') as f:
+            # an index older than the snapshot, from before the changes
+            f.write(saved)
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual([obj.id for obj in
+                          self.storage.search(Place, "attic")], [loft.id])
+        index = FileStorage._FileStorage__objects.texts['Place']
+        self.assertEqual(index.keys(), ['Place.' + loft.id])
+        self.assertEqual(self.storage.search(Place, "loft cabin"), [])
+
+    def test_reload_does_not_index_texts(self):
+        self.storage.new(Place(name="Loft", description="Pool"))
+        self.storage.new(Review(text="Lovely pool"))
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        with patch.object(TextIndex, 'put') as put:
+            self.storage.reload()
+            self.storage.new(Place(name="Cabin"))
+        put.assert_not_called()
+        self.assertEqual(FileStorage._FileStorage__objects.texts, {})
+        self.assertEqual(len(self.storage.search(Place, "pool cabin")), 2)
+        self.assertEqual(list(FileStorage._FileStorage__objects.texts),
+                         ['Place'])
+
+
+class TestFileStorageSymbols(FileStorageTestCase):
+    """Unittest for the strings FileStorage interns"""
+
+    def test_reload_interns_foreign_keys(self):
+        state = State(name="California")
+        cities = [City(name=str(i), state_id=state.id) for i in range(3)]
+        for obj in [state] + cities:
+            self.storage.new(obj)
+        self.storage.save()
+        saved = self.storage.symbol_stats()['bytes_saved']
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        objs = self.storage.all()
+        state = objs['State.' + state.id]
+        for city in cities:
+            self.assertIs(objs['City.' + city.id].state_id, state.id)
+        self.assertGreater(self.storage.symbol_stats()['bytes_saved'], saved)
+
+    def test_new_interns_foreign_keys(self):
+        state = State(name="California")
+        self.storage.new(state)
+        city = City(name="Fremont", state_id=''.join(list(state.id)))
+        self.assertIsNot(city.state_id, state.id)
+        self.storage.new(city)
+        self.assertIs(city.state_id, state.id)
+
+
+class TestFileStorageLazy(FileStorageTestCase):
+    """Unittest for the lazy loading mode of FileStorage"""
+
+    def setUp(self):
+        super().setUp()
+        self.state = State(name="California")
+        self.city = City(name="Fremont", state_id=self.state.id)
+        self.storage.new(self.state)
+        self.storage.new(self.city)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__lazy_mode = True
+        self.storage.reload()
+        self.state_key = 'State.' + self.state.id
+        self.city_key = 'City.' + self.city.id
+
+    def test_reload_keeps_placeholders(self):
+        for obj in self.storage.all().values():
+            self.assertIs(type(obj), LazyObject)
+
+    def test_attribute_access_builds_object(self):
+        stub = self.storage.all()[self.state_key]
+        self.assertEqual(stub.name, "California")
+        self.assertIs(type(self.storage.all()[self.state_key]), State)
+        self.assertEqual(str(stub), str(self.storage.all()[self.state_key]))
+
+    def test_all_cls_builds_only_that_class(self):
+        states = self.storage.all(State)
+        self.assertIs(type(states[self.state_key]), State)
+        self.assertIs(type(self.storage.all()[self.city_key]), LazyObject)
+
+    def test_relationships_without_building(self):
+        state = self.storage.all(State)[self.state_key]
+        self.assertIs(type(self.storage.all()[self.city_key]), LazyObject)
+        cities = state.cities
+        self.assertEqual(len(cities), 1)
+        self.assertIs(type(cities[0]), City)
+
+    def test_query_builds_only_the_page(self):
+        for i in range(5):
+            self.storage.new(State(name="State {}".format(i)))
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        query = self.storage.query(State).order_by('-name')
+        self.assertEqual([state.name for state in query.limit(2)],
+                         ["State 4", "State 3"])
+        lazy = [obj for obj in self.storage.all().values()
+                if type(obj) is LazyObject]
+        self.assertEqual(len(lazy), 5)
+        self.assertEqual(query.only('name').offset(5).all(),
+                         [{'name': "California"}])
+
+    def test_get_builds_only_that_object(self):
+        state = self.storage.get(State, self.state.id)
+        self.assertIs(type(state), State)
+        self.assertIs(self.storage.all()[self.state_key], state)
+        self.assertIs(type(self.storage.all()[self.city_key]), LazyObject)
+
+    def test_iter_builds_as_it_goes(self):
+        found = self.storage.iter(City)
+        self.assertIs(type(self.storage.all()[self.city_key]), LazyObject)
+        self.assertEqual([city.id for city in found], [self.city.id])
+        self.assertIs(type(self.storage.all()[self.city_key]), City)
+        self.assertIs(type(self.storage.all()[self.state_key]), LazyObject)
+
+    def test_save_does_not_build(self):
+        self.storage.all()[self.state_key].name = "Nevada"
+        self.storage.save()
+        self.assertIs(type(self.storage.all()[self.city_key]), LazyObject)
+        with open(FileStorage._FileStorage__file_path) as f:
+            data = json.load(f)
+        self.assertEqual(data[self.state_key]['name'], "Nevada")
+        self.assertEqual(data[self.city_key], self.city.to_dict())
+
+    def test_delete_placeholder(self):
+        self.storage.delete(self.storage.all()[self.city_key])
+        self.assertNotIn(self.city_key, self.storage.all())
+
+    def test_placeholders_keep_their_text(self):
+        stub = self.storage.all()[self.city_key]
+        self.assertIs(type(stub._raw), str)
+        self.assertEqual(stub.peek('state_id'), self.state.id)
+        self.assertEqual(stub._raw, self.city.to_dict())
+
+    def test_save_does_not_decode(self):
+        self.storage.new(State(name="Nevada"))
+        with patch.object(ObjectStream, 'value') as value:
+            self.storage.save()
+        value.assert_not_called()
+        with open(FileStorage._FileStorage__file_path) as f:
+            data = json.load(f)
+        self.assertEqual(data[self.city_key], self.city.to_dict())
+
+    def test_indexes_wait_for_their_class(self):
+        with patch.object(ObjectStream, 'value',
+                          side_effect=ObjectStream.value) as value:
+            self.assertEqual(self.storage.count(City,
+                                                state_id=self.state.id), 1)
+        self.assertEqual(value.call_count, 1)
+        self.assertIs(type(self.storage.all()[self.state_key]._raw), str)
+
+
+class TestFileStorageJournal(FileStorageTestCase):
+    """Unittest for the append-only journal mode of FileStorage"""
+
+    def setUp(self):
+        super().setUp()
+        FileStorage._FileStorage__journal_mode = True
+
+    def log(self):
+        with open(FileStorage._FileStorage__file_path + '.log') as f:
+            return [json.loads(line) for line in f]
+
+    def test_save_appends_changes_only(self):
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        state.name = "Nevada"
+        self.storage.save()
+        self.storage.save()
+        log = self.log()
+        self.assertEqual(len(log), 2)
+        self.assertEqual(log[1][:2], ['set', 'State.' + state.id])
+        self.assertEqual(log[1][2]['name'], "Nevada")
+        self.assertFalse(os.path.exists(FileStorage._FileStorage__file_path))
+
+    def test_reload_replays_journal(self):
+        state = State(name="California")
+        city = City(name="Fremont")
+        self.storage.new(state)
+        self.storage.new(city)
+        self.storage.save()
+        self.storage.delete(city)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertIn('State.' + state.id, self.storage.all())
+        self.assertNotIn('City.' + city.id, self.storage.all())
+
+    def test_compact_folds_journal_into_snapshot(self):
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        self.storage.compact(wait=True)
+        self.assertFalse(os.path.exists(FileStorage._FileStorage__file_path +
+                                        '.log'))
+        with open(FileStorage._FileStorage__file_path) as f:
+            self.assertIn('State.' + state.id, json.load(f))
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(self.storage.all()['State.' + state.id].name,
+                         "California")
+
+
+class TestFileStorageWriteBehind(FileStorageTestCase):
+    """Unittest for the write-behind mode of FileStorage"""
+
+    def setUp(self):
+        super().setUp()
+        FileStorage._FileStorage__write_behind = True
+        FileStorage._FileStorage__flush_interval = 60000
+
+    def tearDown(self):
+        self.storage.flush()
+        super().tearDown()
+
+    def test_save_is_deferred_until_flush(self):
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        self.assertFalse(os.path.exists(FileStorage._FileStorage__file_path))
+        self.storage.flush()
+        with open(FileStorage._FileStorage__file_path) as f:
+            self.assertIn('State.' + state.id, json.load(f))
+
+    def test_threshold_wakes_flusher(self):
+        FileStorage._FileStorage__flush_threshold = 3
+        for i in range(3):
+            self.storage.new(State(name=str(i)))
+        self.storage.save()
+        for i in range(100):
+            if not FileStorage._FileStorage__pending:
+                break
+            time.sleep(0.01)
+        with open(FileStorage._FileStorage__file_path) as f:
+            self.assertEqual(len(json.load(f)), 3)
+
+    def test_reload_keeps_pending_saves(self):
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        state.name = "Nevada"
+        self.storage.save()
+        self.storage.reload()
+        self.assertEqual(self.storage.all()['State.' + state.id].name,
+                         "Nevada")
+
+    def test_changes_made_during_a_write_are_kept(self):
+        state = State(name="v1")
+        self.storage.new(state)
+        self.storage.save()
+        state.name = "v2"
+        self.storage.save()
+        fsync = FileStorage._FileStorage__fsync
+        write = fsync.write
+
+        def edit_while_writing(path, chunks, binary=False):
+            chunks = list(chunks)
+            state.name = "v3"
+            return write(path, chunks, binary)
+
+        with patch.object(fsync, 'write', side_effect=edit_while_writing):
+            self.storage.flush()
+        self.storage.save()
+        self.storage.flush()
+        with open(FileStorage._FileStorage__file_path) as f:
+            self.assertEqual(json.load(f)['State.' + state.id]['name'], "v3")
+
+    def test_failed_write_keeps_changes(self):
+        state = State(name="California")
+        self.storage.new(state)
+        self.storage.save()
+        fsync = FileStorage._FileStorage__fsync
+        with patch.object(fsync, 'write', side_effect=OSError):
+            with self.assertRaises(OSError):
+                self.storage.flush()
+        self.storage.flush()
+        with open(FileStorage._FileStorage__file_path) as f:
+            self.assertIn('State.' + state.id, json.load(f))
+
+
+class TestFileStorageSharded(FileStorageTestCase):
+    """Unittest for the one file per class layout of FileStorage"""
+
+    def setUp(self):
+        super().setUp()
+        FileStorage._FileStorage__shard_mode = True
+        self.state = State(name="California")
+        self.city = City(name="Fremont", state_id=self.state.id)
+        self.storage.new(self.state)
+        self.storage.new(self.city)
+        self.storage.save()
+
+    def shard(self, name):
+        return os.path.join(self.tmp.name, 'file.{}.json'.format(name))
+
+    def test_one_file_per_class(self):
+        self.assertEqual(sorted(os.listdir(self.tmp.name)),
+                         ['file.City.json', 'file.State.json'])
+        with open(self.shard('State')) as f:
+            self.assertEqual(list(json.load(f)), ['State.' + self.state.id])
+
+    def test_save_rewrites_dirty_shards_only(self):
+        with open(self.shard('City'), 'w') as f:
+            f.write('untouched')
+        self.state.name = "Nevada"
+        self.storage.save()
+        with open(self.shard('City')) as f:
+            self.assertEqual(f.read(), 'untouched')
+        with open(self.shard('State')) as f:
+            self.assertEqual(json.load(f)['State.' + self.state.id]['name'],
+                             "Nevada")
+
+    def test_reload_reads_shards_on_demand(self):
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(len(FileStorage._FileStorage__objects), 0)
+        states = self.storage.all(State)
+        self.assertEqual(list(states), ['State.' + self.state.id])
+        self.assertNotIn('City.' + self.city.id,
+                         FileStorage._FileStorage__objects)
+        self.assertEqual(len(self.storage.all()), 2)
+
+    def test_save_keeps_unread_shard_objects(self):
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.storage.new(State(name="Nevada"))
+        self.storage.save()
+        with open(self.shard('State')) as f:
+            self.assertEqual(len(json.load(f)), 2)
+
+    def test_single_file_is_split(self):
+        for name in ('State', 'City'):
+            os.remove(self.shard(name))
+        with open(FileStorage._FileStorage__file_path, 'w') as f:
+            json.dump({'State.' + self.state.id: self.state.to_dict()}, f)
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.storage.save()
+        self.assertTrue(os.path.exists(self.shard('State')))
+        self.assertFalse(os.path.exists(FileStorage._FileStorage__file_path))
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(list(self.storage.all()), ['State.' + self.state.id])
+
+    def test_unfinished_split_is_read_again(self):
+        with open(FileStorage._FileStorage__file_path, 'w') as f:
+            json.dump({'State.' + self.state.id: self.state.to_dict(),
+                       'City.' + self.city.id: self.city.to_dict()}, f)
+        os.remove(self.shard('City'))
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(len(self.storage.all()), 2)
+
+    def test_shards_are_not_ignored(self):
+        FileStorage._FileStorage__shard_mode = False
+        FileStorage._FileStorage__objects = {}
+        with self.assertRaises(ValueError):
+            self.storage.reload()
+
+
+class TestFileStorageBinary(FileStorageTestCase):
+    """Unittest for the binary snapshot format of FileStorage"""
+
+    def setUp(self):
+        super().setUp()
+        FileStorage._FileStorage__serializer = BinarySerializer()
+        self.state = State(name="California")
+        self.storage.new(self.state)
+        self.storage.save()
+
+    def test_save_writes_binary_file(self):
+        self.assertEqual(os.listdir(self.tmp.name), ['file.bin'])
+
+    def test_reload(self):
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        state = self.storage.all()['State.' + self.state.id]
+        self.assertEqual(state.to_dict(), self.state.to_dict())
+
+    def test_journal_compaction(self):
+        FileStorage._FileStorage__journal_mode = True
+        city = City(name="Fremont", state_id=self.state.id)
+        self.storage.new(city)
+        self.storage.save()
+        self.storage.compact(wait=True)
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(self.storage.all(City)['City.' + city.id].name,
+                         "Fremont")
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ['file.bin'])
+
+
+class TestFileStorageMapped(FileStorageTestCase):
+    """Unittest for the read-only mapped mode of FileStorage"""
+
+    def setUp(self):
+        super().setUp()
+        FileStorage._FileStorage__serializer = serializer('mapped')
+        self.state = State(name="California")
+        self.city = City(name="Fremont", state_id=self.state.id)
+        self.storage.new(self.state)
+        self.storage.new(self.city)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__mmap_mode = True
+        self.storage.reload()
+
+    def test_objects_are_decoded_on_access(self):
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+        states = self.storage.all(State)
+        self.assertEqual(states['State.' + self.state.id].to_dict(),
+                         self.state.to_dict())
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+        self.assertEqual(len(self.storage.all()), 2)
+
+    def test_related_and_count(self):
+        state = self.storage.all(State)['State.' + self.state.id]
+        self.assertEqual([city.id for city in state.cities], [self.city.id])
+        self.assertEqual(self.storage.count(), 2)
+        self.assertEqual(self.storage.count(City), 1)
+
+    def test_exists(self):
+        self.assertTrue(self.storage.exists(State, self.state.id))
+        self.assertTrue(self.storage.exists('City', self.city.id))
+        self.assertFalse(self.storage.exists(City, self.state.id))
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+        self.assertEqual(self.storage.count(City, name="Fremont"), 1)
+
+    def test_get(self):
+        state = self.storage.get(State, self.state.id)
+        self.assertEqual(state.to_dict(), self.state.to_dict())
+        self.assertEqual(FileStorage._FileStorage__objects, {})
+        self.assertEqual([city.id for city in self.storage.get_many(
+            'City', ["nope", self.city.id])], [self.city.id])
+        self.assertIsNone(self.storage.get(City, self.state.id))
+
+    def test_iter(self):
+        state = State(name="Nevada")
+        self.storage.new(state)
+        self.assertEqual(sorted(obj.name for obj in self.storage.iter(State)),
+                         ["California", "Nevada"])
+        self.assertEqual(len(list(self.storage.iter())), 3)
+        self.assertEqual(list(self.storage.iter(Place)), [])
+
+    def test_new_objects_are_layered_on_top(self):
+        state = State(name="Nevada")
+        self.storage.new(state)
+        self.assertIn('State.' + state.id, self.storage.all(State))
+        self.assertEqual(self.storage.count(State), 2)
+
+    def test_nearby_scans_the_snapshot(self):
+        FileStorage._FileStorage__mmap_mode = False
+        FileStorage._FileStorage__objects = {}
+        place = Place(name="Loft", latitude=37.77, longitude=-122.42)
+        self.storage.new(place)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__mmap_mode = True
+        self.storage.reload()
+        found = self.storage.nearby(37.78, -122.41, 5)
+        self.assertEqual([obj.id for obj in found], [place.id])
+        self.assertEqual(self.storage.within_bbox(0, 0, 10, 10), [])
+
+    def test_with_amenities_scans_the_snapshot(self):
+        FileStorage._FileStorage__mmap_mode = False
+        FileStorage._FileStorage__objects = {}
+        place = Place(name="Loft", amenity_ids=['wifi', 'tv'])
+        self.storage.new(place)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__mmap_mode = True
+        self.storage.reload()
+        found = self.storage.with_amenities(['tv', 'wifi'])
+        self.assertEqual([obj.id for obj in found], [place.id])
+        self.assertEqual(self.storage.with_amenities(['pool']), [])
+
+    def test_search_scans_the_snapshot(self):
+        FileStorage._FileStorage__mmap_mode = False
+        FileStorage._FileStorage__objects = {}
+        place = Place(name="Loft", description="Pool and garden")
+        self.storage.new(place)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__mmap_mode = True
+        self.storage.reload()
+        found = self.storage.search(Place, "gardens")
+        self.assertEqual([obj.id for obj in found], [place.id])
+        self.assertEqual(self.storage.search(Place, "castle"), [])
+
+    def test_save_is_refused(self):
+        with self.assertRaises(PermissionError):
+            self.storage.save()
+
+    def test_reload_maps_new_snapshot(self):
+        FileStorage._FileStorage__mmap_mode = False
+        FileStorage._FileStorage__objects = {}
+        self.storage.new(State(name="Nevada"))
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__mmap_mode = True
+        self.storage.reload()
+        self.assertEqual(self.storage.count(State), 1)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""Test Module for the FileStorage fsync policy"""
+import unittest
+import os
+import tempfile
+from unittest.mock import patch
+import pep8
+from models.engine.fsync_policy import FsyncPolicy
+
+
+class TestFsyncPolicy_pep8(unittest.TestCase):
+    """Unittest for FsyncPolicy class docs and style"""
+
+    def test_docstring(self):
+        """checks for docstrings"""
+        self.assertIsNotNone(FsyncPolicy.__doc__)
+        self.assertIsNotNone(FsyncPolicy.write.__doc__)
+        self.assertIsNotNone(FsyncPolicy.sync.__doc__)
+        self.assertIsNotNone(FsyncPolicy.flush.__doc__)
+
+    def test_pep8(self):
+        """Checks PEP8 compliance"""
+        msg = "PEP8 incompliant, errors found"
+        style = pep8.StyleGuide()
+        res = style.check_files(["models/engine/fsync_policy.py"])
+        self.assertEqual(res.total_errors, 0, msg)
+
+
+class TestFsyncPolicy(unittest.TestCase):
+    """Unittest for FsyncPolicy class"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'file.json')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self):
+        with open(self.path, 'r') as f:
+            return f.read()
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            FsyncPolicy('sometimes')
+
+    def test_write_replaces_file(self):
+        with open(self.path, 'w') as f:
+            f.write('old')
+        FsyncPolicy().write(self.path, ['{', '}'])
+        self.assertEqual(self.read(), '{}')
+        self.assertEqual(os.listdir(self.tmp.name), ['file.json'])
+
+    def test_failed_write_keeps_old_file(self):
+        with open(self.path, 'w') as f:
+            f.write('old')
+
+        def chunks():
+            yield '{'
+            raise RuntimeError("encoding failed")
+        with self.assertRaises(RuntimeError):
+            FsyncPolicy().write(self.path, chunks())
+        self.assertEqual(self.read(), 'old')
+        self.assertEqual(os.listdir(self.tmp.name), ['file.json'])
+
+    def test_always_fsyncs(self):
+        with patch('os.fsync') as fsync:
+            FsyncPolicy('always').write(self.path, ['{}'])
+        self.assertEqual(fsync.call_count, 2)
+
+    def test_never_fsyncs(self):
+        with patch('os.fsync') as fsync:
+            FsyncPolicy('never').write(self.path, ['{}'])
+            with open(self.path, 'a') as f:
+                FsyncPolicy('never').sync(f)
+        fsync.assert_not_called()
+
+    def test_batch_defers_until_flush(self):
+        policy = FsyncPolicy('batch', interval=60000)
+        with patch('os.fsync') as fsync:
+            policy.write(self.path, ['{}'])
+            with open(self.path, 'a') as f:
+                policy.sync(f)
+            fsync.assert_not_called()
+            policy.flush()
+            self.assertEqual(fsync.call_count, 2)
+            policy.flush()
+            self.assertEqual(fsync.call_count, 2)
@@ -0,0 +1,118 @@
+#!/usr/bin/python3
+"""Test Module for the spatial index"""
+import math
+import random
+import unittest
+import pep8
+from models.engine.geo_index import GeoIndex, bounding_boxes, distance
+
+
+class TestGeoIndex_pep8(unittest.TestCase):
+    """Unittest for GeoIndex class docs and style"""
+
+    def test_docstring(self):
+        """checks for docstrings"""
+        self.assertIsNotNone(GeoIndex.__doc__)
+        self.assertIsNotNone(GeoIndex.nearby.__doc__)
+        self.assertIsNotNone(GeoIndex.within_bbox.__doc__)
+
+    def test_pep8(self):
+        """Checks PEP8 compliance"""
+        msg = "PEP8 incompliant, errors found"
+        style = pep8.StyleGuide()
+        res = style.check_files(["models/engine/geo_index.py"])
+        self.assertEqual(res.total_errors, 0, msg)
+
+
+class TestGeoIndex(unittest.TestCase):
+    """Unittest for GeoIndex class"""
+
+    def setUp(self):
+        rand = random.Random(0)
+        self.index = GeoIndex()
+        self.points = {}
+        for i in range(2000):
+            if i % 2:
+                lat, lon = rand.uniform(-90, 90), rand.uniform(-180, 180)
+            else:
+                # a dense cluster straddling the 180th meridian
+                lat = rand.gauss(-17.0, 0.1)
+                lon = (rand.gauss(179.9, 0.2) + 180) % 360 - 180
+            self.points[i] = (lat, lon)
+            self.index.put(i, lat, lon)
+
+    def scan(self, lat, lon, radius_km=None, limit=None):
+        found = sorted((distance(lat, lon, *point), key)
+                       for key, point in self.points.items())
+        found = [(d, key) for d, key in found
+                 if radius_km is None or d <= radius_km]
+        return [key for d, key in found[:limit]]
+
+    def nearby(self, *args):
+        return [key for d, key in self.index.nearby(*args)]
+
+    def test_distance(self):
+        self.assertAlmostEqual(distance(48.8566, 2.3522, 51.5074, -0.1278),
+                               343.5, delta=0.5)
+        self.assertAlmostEqual(distance(0, 179.5, 0, -179.5), 111.2,
+                               delta=0.1)
+
+    def test_nearby_matches_a_scan(self):
+        for lat, lon in ((-17.0, 179.95), (-17.0, -179.99), (0, 0),
+                         (89.9, 45)):
+            for radius, limit in ((50, 50), (2000, None), (None, 10)):
+                self.assertEqual(self.nearby(lat, lon, radius, limit),
+                                 self.scan(lat, lon, radius, limit))
+
+    def test_nearby_is_ordered(self):
+        found = self.index.nearby(-17.0, 179.95, 100, 50)
+        self.assertEqual(len(found), 50)
+        self.assertEqual(found, sorted(found))
+
+    def test_within_bbox(self):
+        found = self.index.within_bbox(-17.1, 179.9, -16.9, -179.9)
+        expected = [key for key, (lat, lon) in self.points.items()
+                    if -17.1 <= lat <= -16.9 and abs(lon) >= 179.9]
+        self.assertEqual(sorted(found), sorted(expected))
+
+    def test_put_moves_and_remove_drops(self):
+        self.index.put(0, 10.0, 10.0)
+        self.points[0] = (10.0, 10.0)
+        self.index.remove(1)
+        del self.points[1]
+        self.assertEqual(len(self.index), len(self.points))
+        self.assertEqual(self.nearby(10.0, 10.0, 1), [0])
+        self.assertEqual(self.nearby(0, 0, None, 20),
+                         self.scan(0, 0, None, 20))
+
+    def test_invalid_points_are_left_out(self):
+        self.index.put(0, None, 10.0)
+        self.index.put(1, 95.0, 10.0)
+        self.index.put(2, float('nan'), 10.0)
+        self.assertNotIn(0, self.index)
+        self.assertNotIn(1, self.index)
+        self.assertNotIn(2, self.index)
+        self.index.clear()
+        self.assertEqual(self.index.nearby(0, 0), [])
+
+    def test_bounding_boxes(self):
+        self.assertEqual(len(bounding_boxes(0, 179.9, 100)), 2)
+        self.assertEqual(bounding_boxes(89.5, 0, 100)[0][1:4:2],
+                         (-180.0, 180.0))
+        south, west, north, east = bounding_boxes(45, 10, 100)[0]
+        d = 100 / 6371.0088
+        for bearing in map(math.radians, range(0, 360, 15)):
+            # the point 100 km away from (45, 10) in that direction
+            lat = math.asin(math.sin(math.radians(45)) * math.cos(d) +
+                            math.cos(math.radians(45)) * math.sin(d) *
+                            math.cos(bearing))
+            lon = 10 + math.degrees(math.atan2(
+                math.sin(bearing) * math.sin(d) * math.cos(math.radians(45)),
+                math.cos(d) - math.sin(math.radians(45)) * math.sin(lat)))
+            lat = math.degrees(lat)
+            self.assertTrue(south - 1e-9 <= lat <= north + 1e-9)
+            self.assertTrue(west - 1e-9 <= lon <= east + 1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
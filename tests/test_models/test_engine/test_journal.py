@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""Test Module for the storage journal"""
+import unittest
+import json
+import os
+import tempfile
+import threading
+import pep8
+from models.engine.journal import Journal
+
+
+class TestJournal_pep8(unittest.TestCase):
+    """Unittest for Journal class docs and style"""
+
+    def test_docstring(self):
+        """checks for docstrings"""
+        self.assertIsNotNone(Journal.__doc__)
+        self.assertIsNotNone(Journal.append.__doc__)
+        self.assertIsNotNone(Journal.replay.__doc__)
+        self.assertIsNotNone(Journal.compact.__doc__)
+
+    def test_pep8(self):
+        """Checks PEP8 compliance"""
+        msg = "PEP8 incompliant, errors found"
+        style = pep8.StyleGuide()
+        res = style.check_files(["models/engine/journal.py"])
+        self.assertEqual(res.total_errors, 0, msg)
+
+
+class TestJournal(unittest.TestCase):
+    """Unittest for Journal class"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.snapshot = os.path.join(self.tmp.name, 'file.json')
+        self.journal = Journal(self.snapshot + '.log')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_append_and_replay(self):
+        self.journal.append([['set', 'State.1', {'id': '1'}]])
+        self.journal.append([['del', 'State.1'], ['set', 'City.2', {}]])
+        self.assertEqual(list(self.journal.replay()),
+                         [['set', 'State.1', {'id': '1'}],
+                          ['del', 'State.1'], ['set', 'City.2', {}]])
+
+    def test_append_returns_size(self):
+        size = self.journal.append([['del', 'State.1']])
+        self.assertEqual(size, os.path.getsize(self.journal.path))
+
+    def test_torn_tail_is_skipped(self):
+        self.journal.append([['set', 'State.1', {}]])
+        with open(self.journal.path, 'a') as f:
+            f.write('["set", "State.2"')
+        self.journal.append([['del', 'State.1']])
+        self.assertEqual(list(self.journal.replay()),
+                         [['set', 'State.1', {}], ['del', 'State.1']])
+        with open(self.journal.path, 'a') as f:
+            f.write('["del", "State.2"')
+        self.assertEqual(list(self.journal.replay()),
+                         [['set', 'State.1', {}], ['del', 'State.1']])
+
+    def test_corrupt_record_is_an_error(self):
+        self.journal.append([['set', 'State.1', {}]])
+        with open(self.journal.path, 'a') as f:
+            f.write('["set", "State.2"\n')
+        with open(self.journal.path, 'a') as f:
+            f.write('["del", "State.1"]\n')
+        with self.assertRaises(ValueError):
+            list(self.journal.replay())
+
+    def test_apply(self):
+        data = {'State.1': {'id': '1'}}
+        deleted = Journal.apply(data, [['set', 'City.2', {'id': '2'}],
+                                       ['del', 'State.1']])
+        self.assertEqual(data, {'City.2': {'id': '2'}})
+        self.assertEqual(deleted, {'State.1'})
+
+    def test_compact(self):
+        with open(self.snapshot, 'w') as f:
+            json.dump({'State.1': {'id': '1'}}, f)
+        self.journal.append([['set', 'City.2', {'id': '2'}],
+                             ['del', 'State.1']])
+        self.assertTrue(self.journal.rotate())
+        self.journal.append([['set', 'City.3', {'id': '3'}]])
+        self.journal.compact(self.snapshot, threading.Lock())
+        with open(self.snapshot, 'r') as f:
+            self.assertEqual(json.load(f), {'City.2': {'id': '2'}})
+        self.assertFalse(os.path.exists(self.journal.rotated))
+        self.assertEqual(list(self.journal.replay()),
+                         [['set', 'City.3', {'id': '3'}]])
+
+    def test_rotate_without_log(self):
+        self.assertFalse(self.journal.rotate())
+        self.assertFalse(self.journal.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+#!/usr/bin/python3
+"""Test Module for the streaming JSON reader"""
+import unittest
+import io
+import json
+import pep8
+from models.engine.json_stream import ObjectStream
+
+
+class TestObjectStream_pep8(unittest.TestCase):
+    """Unittest for ObjectStream class docs and style"""
+
+    def test_docstring(self):
+        """checks for docstrings"""
+        self.assertIsNotNone(ObjectStream.__doc__)
+        self.assertIsNotNone(ObjectStream.__iter__.__doc__)
+
+    def test_pep8(self):
+        """Checks PEP8 compliance"""
+        msg = "PEP8 incompliant, errors found"
+        style = pep8.StyleGuide()
+        res = style.check_files(["models/engine/json_stream.py"])
+        self.assertEqual(res.total_errors, 0, msg)
+
+
+class TestObjectStream(unittest.TestCase):
+    """Unittest for ObjectStream class"""
+
+    data = {
+            'State.1': {'id': '1', 'name': 'Cali, "fornia"', 'n': [1, {}]},
+            'City.2': {'id': '2', 'name': '}{:,'},
+            'Place.3': {'id': '3', 'latitude': 1.5e-3}
+           }
+
+    def stream(self, text, chunk_size):
+        return list(ObjectStream(io.StringIO(text), chunk_size))
+
+    def test_every_chunk_size(self):
+        text = json.dumps(self.data)
+        for size in (1, 2, 3, 7, 64, 1 << 16):
+            entries = self.stream(text, size)
+            self.assertEqual({k: v for k, _, v in entries}, self.data)
+
+    def test_scalar_values(self):
+        data = {'a': 12345, 'b': 1, 'c': True, 'd': None, 'e': -2.5e10}
+        text = json.dumps(data)
+        for size in (1, 2, 3, 7, 64):
+            entries = self.stream(text, size)
+            self.assertEqual({k: v for k, _, v in entries}, data)
+
+    def test_raw_text(self):
+        text = json.dumps(self.data)
+        for key, raw, val in self.stream(text, 5):
+            self.assertEqual(raw, json.dumps(key) + ': ' + json.dumps(val))
+
+    def test_whitespace(self):
+        text = json.dumps(self.data, indent=4)
+        entries = self.stream(text, 3)
+        self.assertEqual({k: v for k, _, v in entries}, self.data)
+
+    def test_lines_are_not_decoded(self):
+        lines = [json.dumps(key) + ': ' + json.dumps(val)
+                 for key, val in self.data.items()]
+        text = '{\n' + ',\n'.join(lines) + '\n}'
+        for size in (1, 2, 7, 64, 1 << 16):
+            stream = ObjectStream(io.StringIO(text), size, decode=False)
+            entries = list(stream)
+            self.assertEqual([v for _, _, v in entries], [None] * 3)
+            self.assertEqual({k: ObjectStream.value(raw)
+                              for k, raw, _ in entries}, self.data)
+
+    def test_single_line_is_decoded(self):
+        text = json.dumps(self.data)
+        entries = list(ObjectStream(io.StringIO(text), 5, decode=False))
+        self.assertEqual({k: v for k, _, v in entries}, self.data)
+
+    def test_other_lines_are_decoded(self):
+        for text in (json.dumps(self.data, indent=4),
+                     '{\n"a": {"b": 1},\n"c":\n {"d": 2}, "e": {}\n}'):
+            data = json.loads(text)
+            entries = list(ObjectStream(io.StringIO(text), 3, decode=False))
+            self.assertEqual({k: ObjectStream.value(raw) if v is None else v
+                              for k, raw, v in entries}, data)
+
+    def test_value_of_partial_line(self):
+        with self.assertRaises(ValueError):
+            ObjectStream.value('"a": {"b": 1}, "c": {}')
+
+    def test_empty_object(self):
+        self.assertEqual(self.stream(' { } ', 1), [])
+
+    def test_count(self):
+        stream = ObjectStream(io.StringIO(json.dumps(self.data)))
+        for _ in stream:
+            pass
+        self.assertEqual(stream.count, 3)
+
+    def test_truncated(self):
+        text = json.dumps(self.data)[:-10]
+        with self.assertRaises(ValueError):
+            self.stream(text, 4)
+
+    def test_not_an_object(self):
+        with self.assertRaises(ValueError):
+            self.stream('[1, 2]', 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
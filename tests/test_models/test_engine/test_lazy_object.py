@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""Test Module for the lazy loading placeholder"""
+import unittest
+import pep8
+from models.engine.lazy_object import LazyObject
+from models.state import State
+
+
+class TestLazyObject_pep8(unittest.TestCase):
+    """Unittest for LazyObject class docs and style"""
+
+    def test_docstring(self):
+        """checks for docstrings"""
+        self.assertIsNotNone(LazyObject.__doc__)
+        self.assertIsNotNone(LazyObject.hydrate.__doc__)
+        self.assertIsNotNone(LazyObject.peek.__doc__)
+
+    def test_pep8(self):
+        """Checks PEP8 compliance"""
+        msg = "PEP8 incompliant, errors found"
+        style = pep8.StyleGuide()
+        res = style.check_files(["models/engine/lazy_object.py"])
+        self.assertEqual(res.total_errors, 0, msg)
+
+
+class TestLazyObject(unittest.TestCase):
+    """Unittest for LazyObject class"""
+
+    def setUp(self):
+        self.loads = []
+        self.raw = State(name="California").to_dict()
+        self.stub = LazyObject('State.' + self.raw['id'], State, self.raw,
+                               self.load)
+
+    def load(self, stub):
+        self.loads.append(stub)
+        return stub._cls(**stub._raw)
+
+    def test_peek_does_not_load(self):
+        self.assertEqual(self.stub.peek('name'), "California")
+        self.assertEqual(self.stub.peek('id'), self.raw['id'])
+        self.assertEqual(self.stub.peek('nothing'), None)
+        self.assertEqual(self.loads, [])
+
+    def test_peek_falls_back_to_class(self):
+        del self.raw['name']
+        self.assertEqual(self.stub.peek('name'), "")
+
+    def test_attribute_read_loads_once(self):
+        self.assertEqual(self.stub.name, "California")
+        self.assertEqual(self.stub.id, self.raw['id'])
+        self.assertEqual(self.loads, [self.stub])
+        self.assertIsInstance(self.stub.hydrate(), State)
+
+    def test_attribute_write_is_forwarded(self):
+        self.stub.name = "Nevada"
+        self.assertEqual(self.stub.hydrate().name, "Nevada")
+        self.assertEqual(self.stub.peek('name'), "Nevada")
+
+    def test_text_is_decoded_once(self):
+        decoded = []
+        stub = LazyObject('State.1', State, '"name": "Nevada"', self.load,
+                          lambda stub: decoded.append(stub) or
+                          {'name': stub._raw.split('"')[3]})
+        self.assertEqual(stub.peek('name'), "Nevada")
+        self.assertEqual(stub.peek('id'), None)
+        self.assertEqual(stub.hydrate().name, "Nevada")
+        self.assertEqual(decoded, [stub])
+        self.assertEqual(self.loads, [stub])
+
+    def test_str(self):
+        self.assertEqual(str(self.stub), str(self.stub.hydrate()))
+        self.assertTrue(str(self.stub).startswith('[State] ('))
+
+
+if __name__ == '__main__':
+    unittest.main()
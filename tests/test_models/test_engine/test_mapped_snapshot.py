@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+"""Test Module for the mapped storage snapshot"""
+import unittest
+import io
+import os
+import tempfile
+import pep8
+from models.engine.mapped_snapshot import MappedSnapshot
+
+
+class TestMappedSnapshot_pep8(unittest.TestCase):
+    """Unittest for MappedSnapshot class docs and style"""
+
+    def test_docstring(self):
+        """checks for docstrings"""
+        self.assertIsNotNone(MappedSnapshot.__doc__)
+        self.assertIsNotNone(MappedSnapshot.get.__doc__)
+        self.assertIsNotNone(MappedSnapshot.related.__doc__)
+        self.assertIsNotNone(MappedSnapshot.dump.__doc__)
+
+    def test_pep8(self):
+        """Checks PEP8 compliance"""
+        msg = "PEP8 incompliant, errors found"
+        style = pep8.StyleGuide()
+        res = style.check_files(["models/engine/mapped_snapshot.py"])
+        self.assertEqual(res.total_errors, 0, msg)
+
+
+class TestMappedSnapshot(unittest.TestCase):
+    """Unittest for MappedSnapshot class"""
+
+    def setUp(self):
+        self.objs = {'State.b': {'id': 'b', '__class__': 'State'},
+                     'State.a': {'id': 'a', '__class__': 'State',
+                                 'name': 'Étaples'}}
+        for i in range(5):
+            self.objs['City.{}'.format(i)] = {
+                'id': str(i), '__class__': 'City',
+                'state_id': 'ab'[i % 2]}
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'file.snap')
+        with open(self.path, 'wb') as f:
+            f.writelines(MappedSnapshot.dump(self.objs.items()))
+        self.file = open(self.path, 'rb')
+        self.snapshot = MappedSnapshot(self.file)
+
+    def tearDown(self):
+        self.snapshot.close()
+        self.file.close()
+        self.tmp.cleanup()
+
+    def test_get(self):
+        self.assertEqual(self.snapshot.get('State.a'), self.objs['State.a'])
+        self.assertEqual(self.snapshot.get('City.3'), self.objs['City.3'])
+        self.assertIsNone(self.snapshot.get('State.c'))
+        self.assertIsNone(self.snapshot.get('User.a'))
+        self.assertIn('City.4', self.snapshot)
+
+    def test_items_and_count(self):
+        self.assertEqual(dict(self.snapshot.items()), self.objs)
+        self.assertEqual([key for key, val in self.snapshot.items('State')],
+                         ['State.a', 'State.b'])
+        self.assertEqual(self.snapshot.count(), 7)
+        self.assertEqual(self.snapshot.count('City'), 5)
+        self.assertEqual(self.snapshot.count('User'), 0)
+
+    def test_related(self):
+        found = self.snapshot.related('City', 'state_id', 'a')
+        self.assertEqual(sorted(key for key, val in found),
+                         ['City.0', 'City.2', 'City.4'])
+        self.assertEqual(self.snapshot.related('City', 'state_id', 'z'), [])
+        self.assertIsNone(self.snapshot.related('City', 'name', 'a'))
+
+    def test_in_memory_file(self):
+        with open(self.path, 'rb') as f:
+            snapshot = MappedSnapshot(io.BytesIO(f.read()))
+        self.assertEqual(snapshot.get('State.b'), self.objs['State.b'])
+
+    def test_bad_magic(self):
+        with self.assertRaises(ValueError):
+            MappedSnapshot(io.BytesIO(b'\0' * 24))
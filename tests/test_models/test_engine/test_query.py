@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+"""Test Module for the query builder"""
+import unittest
+import pep8
+from models.engine.query import Query
+
+
+class TestQuery_pep8(unittest.TestCase):
+    """Unittest for Query class docs and style"""
+
+    def test_docstring(self):
+        """checks for docstrings"""
+        self.assertIsNotNone(Query.__doc__)
+        self.assertIsNotNone(Query.filter.__doc__)
+        self.assertIsNotNone(Query.order_by.__doc__)
+
+    def test_pep8(self):
+        """Checks PEP8 compliance"""
+        msg = "PEP8 incompliant, errors found"
+        style = pep8.StyleGuide()
+        res = style.check_files(["models/engine/query.py"])
+        self.assertEqual(res.total_errors, 0, msg)
+
+
+class TestQuery(unittest.TestCase):
+    """Unittest for Query class"""
+
+    def setUp(self):
+        self.runs = []
+        self.query = Query('Place', self.execute, lambda query: 42)
+
+    def execute(self, query):
+        self.runs.append(query)
+        return ['a', 'b'][query.start:][:query.stop]
+
+    def test_builder_returns_new_queries(self):
+        query = self.query.filter(max_guest=(4, None))
+        page = query.filter(city_id='c').order_by('-price', 'name') \
+            .only('id').offset(20).limit(10)
+        self.assertEqual(self.query.conditions, {})
+        self.assertEqual(query.conditions, {'max_guest': (4, None)})
+        self.assertEqual(page.conditions, {'max_guest': (4, None),
+                                           'city_id': 'c'})
+        self.assertEqual(page.ordering, (('price', True), ('name', False)))
+        self.assertEqual((page.fields, page.start, page.stop),
+                         (('id',), 20, 10))
+        self.assertEqual((query.ordering, query.start, query.stop),
+                         ((), 0, None))
+        self.assertEqual(self.runs, [])
+
+    def test_load_accumulates(self):
+        query = self.query.load('cities')
+        loaded = query.load('reviews', 'user').filter(name='a')
+        self.assertEqual(self.query.loads, ())
+        self.assertEqual(query.loads, ('cities',))
+        self.assertEqual(loaded.loads, ('cities', 'reviews', 'user'))
+
+    def test_terminals(self):
+        self.assertEqual(self.query.all(), ['a', 'b'])
+        self.assertEqual(list(self.query.offset(1)), ['b'])
+        self.assertEqual(self.query.first(), 'a')
+        self.assertIsNone(self.query.offset(2).first())
+        self.assertEqual(self.query.count(), 42)
+
+    def test_sort_key(self):
+        rows = [{'price': 80, 'name': 'b'}, {'price': None, 'name': 'a'},
+                {'price': 80, 'name': 'a'}, {'price': 120, 'name': 'c'}]
+        key = self.query.order_by('-price', 'name') \
+            .sort_key(lambda row, field: row[field])
+        self.assertEqual([(row['price'], row['name'])
+                          for row in sorted(rows, key=key)],
+                         [(120, 'c'), (80, 'a'), (80, 'b'), (None, 'a')])
+        key = self.query.order_by('price').sort_key(
+            lambda row, field: row[field])
+        self.assertEqual([row['price'] for row in sorted(rows, key=key)],
+                         [80, 80, 120, None])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+#!/usr/bin/python3
+"""Test Module for the object registry"""
+import unittest
+import pep8
+from models.engine.registry import Registry
+
+
+class TestRegistry_pep8(unittest.TestCase):
+    """Unittest for Registry class docs and style"""
+
+    def test_docstring(self):
+        """checks for docstrings"""
+        self.assertIsNotNone(Registry.__doc__)
+        self.assertIsNotNone(Registry.partition.__doc__)
+        self.assertIsNotNone(Registry.count.__doc__)
+
+    def test_pep8(self):
+        """Checks PEP8 compliance"""
+        msg = "PEP8 incompliant, errors found"
+        style = pep8.StyleGuide()
+        res = style.check_files(["models/engine/registry.py"])
+        self.assertEqual(res.total_errors, 0, msg)
+
+
+class TestRegistry(unittest.TestCase):
+    """Unittest for Registry class"""
+
+    def setUp(self):
+        self.reg = Registry({'State.1': 's1', 'City.1': 'c1'})
+        self.reg['State.2'] = 's2'
+
+    def test_flat_view(self):
+        self.assertIsInstance(self.reg, dict)
+        self.assertEqual(self.reg, {'State.1': 's1', 'City.1': 'c1',
+                                    'State.2': 's2'})
+
+    def test_partition(self):
+        self.assertEqual(self.reg.partition('State'),
+                         {'State.1': 's1', 'State.2': 's2'})
+        self.assertEqual(self.reg.partition('Review'), {})
+
+    def test_count(self):
+        self.assertEqual(self.reg.count(), 3)
+        self.assertEqual(self.reg.count('State'), 2)
+        self.assertEqual(self.reg.count('Review'), 0)
+
+    def test_removals_update_partitions(self):
+        del self.reg['State.1']
+        self.assertEqual(self.reg.pop('City.1'), 'c1')
+        self.assertIsNone(self.reg.pop('City.1', None))
+        self.assertEqual(self.reg.partition('State'), {'State.2': 's2'})
+        self.assertEqual(self.reg.classes, {'State': {'State.2': 's2'}})
+        self.reg.clear()
+        self.assertEqual(self.reg.count('State'), 0)
+
+    def test_pop_missing_key(self):
+        with self.assertRaises(KeyError):
+            self.reg.pop('Place.1')
+
+    def test_update_and_setdefault(self):
+        self.reg.update({'City.2': 'c2'})
+        self.reg |= {'City.3': 'c3'}
+        self.assertEqual(self.reg.setdefault('City.2', 'x'), 'c2')
+        self.assertEqual(self.reg.count('City'), 3)
+
+
+class Obj:
+    """Minimal stand-in for a stored model"""
+
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class TestRegistryLinks(unittest.TestCase):
+    """Unittest for the foreign key indexes of Registry"""
+
+    def setUp(self):
+        self.reg = Registry()
+        self.c1 = Obj(state_id='s1')
+        self.c2 = Obj(state_id='s1')
+        self.reg['City.1'] = self.c1
+        self.reg['City.2'] = self.c2
+
+    def test_related(self):
+        self.assertEqual(self.reg.related('City', 'state_id', 's1'),
+                         {'City.1': self.c1, 'City.2': self.c2})
+        self.assertEqual(self.reg.related('City', 'state_id', 's2'), {})
+        self.assertEqual(self.reg.related('Review', 'place_id', 'p1'), {})
+
+    def test_related_not_indexed(self):
+        self.assertIsNone(self.reg.related('City', 'name', 'x'))
+
+    def test_relink(self):
+        self.c1.state_id = 's2'
+        self.reg.relink('City.1', 'name')
+        self.assertIn('City.1', self.reg.related('City', 'state_id', 's1'))
+        self.reg.relink('City.1', 'state_id')
+        self.assertEqual(self.reg.related('City', 'state_id', 's1'),
+                         {'City.2': self.c2})
+        self.assertEqual(self.reg.related('City', 'state_id', 's2'),
+                         {'City.1': self.c1})
+
+    def test_delete_unlinks(self):
+        del self.reg['City.1']
+        self.reg.pop('City.2')
+        self.assertEqual(self.reg.links, {('City', 'state_id'): {}})
+
+    def test_deferred_objects(self):
+        self.reg.defer()
+        c3 = self.reg['City.3'] = Obj(state_id='s2')
+        self.reg['City.1'] = self.c1 = Obj(state_id='s2')
+        self.reg['Place.1'] = Obj(city_id='City.3', price_by_night=80)
+        self.assertNotIn('City.3', self.reg.links[('City', 'state_id')]
+                         .get('s2', {}))
+        self.assertEqual(self.reg.related('City', 'state_id', 's2'),
+                         {'City.3': c3, 'City.1': self.c1})
+        self.assertEqual(self.reg.related('City', 'state_id', 's1'),
+                         {'City.2': self.c2})
+        self.assertEqual(self.reg.columns['Place'].keys, [])
+        self.reg.defer(False)
+        self.assertEqual(self.reg.columns['Place'].keys, ['Place.1'])
+        self.reg['City.4'] = Obj(state_id='s1')
+        self.assertEqual(len(self.reg.related('City', 'state_id', 's1')), 2)
+
+    def test_deferred_delete(self):
+        self.reg.defer()
+        self.reg['City.3'] = Obj(state_id='s2')
+        del self.reg['City.3']
+        self.reg.pop('City.1')
+        self.reg.defer(False)
+        self.assertEqual(self.reg.related('City', 'state_id', 's1'),
+                         {'City.2': self.c2})
+        self.assertEqual(self.reg.related('City', 'state_id', 's2'), {})
+
+
+class TestRegistryColumns(unittest.TestCase):
+    """Unittest for the numeric columns of Registry"""
+
+    def setUp(self):
+        self.reg = Registry()
+        self.p1 = Obj(price_by_night=80, max_guest=2)
+        self.reg['Place.1'] = self.p1
+        self.reg['Place.2'] = Obj(price_by_night=200, max_guest=6)
+
+    def test_columns_follow_objects(self):
+        store = self.reg.columns['Place']
+        self.assertEqual(store.where(price_by_night=(None, 100)), ['Place.1'])
+        self.p1.price_by_night = 300
+        self.reg.relink('Place.1', 'price_by_night')
+        self.assertEqual(store.where(price_by_night=(None, 100)), [])
+        del self.reg['Place.2']
+        self.assertEqual(store.keys, ['Place.1'])
+        self.reg.clear()
+        self.assertEqual(len(store), 0)
+
+    def test_locations_follow_objects(self):
+        index = self.reg.geo['Place']
+        self.p1.latitude, self.p1.longitude = 48.85, 2.35
+        self.reg.relink('Place.1', 'latitude')
+        self.assertEqual(index.within_bbox(48, 2, 49, 3), ['Place.1'])
+        self.p1.latitude = None
+        self.reg.relink('Place.1')
+        self.assertEqual(index.within_bbox(48, 2, 49, 3), [])
+        self.reg.clear()
+        self.assertEqual(len(index), 0)
+
+    def test_class_coordinates_are_no_location(self):
+        Located = type('Located', (Obj,), {'latitude': 0.0,
+                                           'longitude': 0.0})
+        self.reg['Place.3'] = Located()
+        self.assertNotIn('Place.3', self.reg.geo['Place'])
+        self.assertIsNone(Registry.own_value(self.reg['Place.3'], 'latitude'))
+
+    def test_bitmaps_follow_objects(self):
+        bitmap = self.reg.bitmaps['Place']
+        self.assertEqual(bitmap.all_of([]), ['Place.1', 'Place.2'])
+        self.p1.amenity_ids = ['wifi', 'pool']
+        self.reg.relink('Place.1', 'amenity_ids')
+        self.assertEqual(bitmap.all_of(['wifi', 'pool']), ['Place.1'])
+        del self.reg['Place.1']
+        self.assertEqual(bitmap.any_of(['wifi']), [])
+
+    def test_texts_follow_objects(self):
+        self.assertEqual(self.reg.texts, {})
+        index = self.reg.text_index('Place')
+        self.assertIs(self.reg.texts['Place'], index)
+        self.assertEqual(len(index), 2)
+        self.p1.name, self.p1.description = "Loft", "Roof terrace"
+        self.reg.relink('Place.1', 'description')
+        self.assertEqual(index.search("terrace"), index.search("loft"))
+        self.assertEqual([key for score, key in index.search("loft")],
+                         ['Place.1'])
+        self.reg.pop('Place.1')
+        self.assertEqual(index.search("loft"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
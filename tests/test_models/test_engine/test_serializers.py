@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""Test Module for the storage snapshot formats"""
+import unittest
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+from datetime import datetime
+import pep8
+from models.engine.serializers import BinarySerializer, JsonSerializer, \
+    convert, serializer
+
+
+class TestSerializers_pep8(unittest.TestCase):
+    """Unittest for the serializers docs and style"""
+
+    def test_docstring(self):
+        """checks for docstrings"""
+        self.assertIsNotNone(JsonSerializer.__doc__)
+        self.assertIsNotNone(BinarySerializer.__doc__)
+        self.assertIsNotNone(BinarySerializer.dump.__doc__)
+        self.assertIsNotNone(BinarySerializer.load.__doc__)
+
+    def test_pep8(self):
+        """Checks PEP8 compliance"""
+        msg = "PEP8 incompliant, errors found"
+        style = pep8.StyleGuide()
+        res = style.check_files(["models/engine/serializers.py"])
+        self.assertEqual(res.total_errors, 0, msg)
+
+
+class TestBinarySerializer(unittest.TestCase):
+    """Unittest for BinarySerializer class"""
+
+    def setUp(self):
+        self.objs = {}
+        for i in range(3):
+            oid = str(uuid.uuid4())
+            self.objs['Place.' + oid] = {
+                'id': oid, '__class__': 'Place',
+                'created_at': '2023-12-07T09:49:07.936066',
+                'updated_at': '2023-12-07T09:49:0{}.000000'.format(i),
+                'city_id': str(uuid.uuid4()), 'name': 'Chez {} é'.format(i),
+                'number_rooms': i, 'latitude': 37.5 + i,
+                'amenity_ids': [str(uuid.uuid4())]}
+        self.objs['Place.' + oid]['description'] = 'only one has it'
+        self.objs['State.CA'] = {'id': 'CA', '__class__': 'State',
+                                 'name': 'California'}
+
+    def round_trip(self, objs):
+        data = b''.join(BinarySerializer().dump(objs.items()))
+        return data, dict(BinarySerializer().load(io.BytesIO(data)))
+
+    def test_round_trip(self):
+        data, back = self.round_trip(self.objs)
+        self.assertEqual(json.loads(''.join(JsonSerializer().dump(
+                         back.items()))), self.objs)
+
+    def test_timestamps_come_back_as_datetime(self):
+        data, back = self.round_trip(self.objs)
+        for val in back.values():
+            if 'created_at' in val:
+                self.assertEqual(type(val['created_at']), datetime)
+
+    def test_non_uuid_ids_are_kept(self):
+        data, back = self.round_trip(self.objs)
+        self.assertEqual(back['State.CA']['id'], 'CA')
+
+    def test_smaller_than_json(self):
+        data, back = self.round_trip(self.objs)
+        text = ''.join(JsonSerializer().dump(self.objs.items()))
+        self.assertLess(len(data), len(text.encode()))
+
+    def test_bad_magic(self):
+        with self.assertRaises(ValueError):
+            list(BinarySerializer().load(io.BytesIO(b'{}')))
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            serializer('xml')
+
+
+class TestConvert(unittest.TestCase):
+    """Unittest for the snapshot converter"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_json_to_binary_and_back(self):
+        objs = {'State.1': {'id': '1', '__class__': 'State', 'name': 'CA',
+                            'created_at': '2023-12-07T09:49:07.936066'}}
+        paths = [os.path.join(self.tmp.name, name)
+                 for name in ('file.json', 'file.bin', 'back.json')]
+        with open(paths[0], 'w') as f:
+            json.dump(objs, f)
+        convert(paths[0], paths[1])
+        convert(paths[1], paths[2])
+        with open(paths[1], 'rb') as f:
+            self.assertEqual(f.read(len(BinarySerializer.magic)),
+                             BinarySerializer.magic)
+        with open(paths[2]) as f:
+            self.assertEqual(json.load(f), objs)
+
+    def test_convert_snapshot_script(self):
+        script = os.path.join(os.path.dirname(__file__), '..', '..', '..',
+                              'convert_snapshot.py')
+        with open(os.path.join(self.tmp.name, 'file.json'), 'w') as f:
+            # the storage of the current directory is not loaded
+            f.write('not a snapshot')
+        with open(os.path.join(self.tmp.name, 'in.json'), 'w') as f:
+            json.dump({'State.1': {'id': '1', '__class__': 'State'}}, f)
+        out = subprocess.run([sys.executable, os.path.abspath(script),
+                              'in.json', 'out.snap'], cwd=self.tmp.name,
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                             check=True)
+        self.assertEqual((out.stdout, out.stderr), (b'', b''))
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name,
+                                                    'out.snap')))
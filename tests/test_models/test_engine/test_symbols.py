@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""Test Module for the storage symbol table"""
+import unittest
+import sys
+import pep8
+from models.engine.symbols import SymbolTable
+
+
+class TestSymbolTable_pep8(unittest.TestCase):
+    """Unittest for SymbolTable class docs and style"""
+
+    def test_docstring(self):
+        """checks for docstrings"""
+        self.assertIsNotNone(SymbolTable.__doc__)
+        self.assertIsNotNone(SymbolTable.intern.__doc__)
+        self.assertIsNotNone(SymbolTable.stats.__doc__)
+
+    def test_pep8(self):
+        """Checks PEP8 compliance"""
+        msg = "PEP8 incompliant, errors found"
+        style = pep8.StyleGuide()
+        res = style.check_files(["models/engine/symbols.py"])
+        self.assertEqual(res.total_errors, 0, msg)
+
+
+class TestSymbolTable(unittest.TestCase):
+    """Unittest for SymbolTable class"""
+
+    def test_intern(self):
+        table = SymbolTable()
+        first = ''.join(['state', '-1'])
+        second = ''.join(['state', '-1'])
+        self.assertIsNot(first, second)
+        self.assertIs(table.intern(first), first)
+        self.assertIs(table.intern(second), first)
+        self.assertEqual(len(table), 1)
+
+    def test_other_types_pass_through(self):
+        table = SymbolTable()
+        self.assertIsNone(table.intern(None))
+        self.assertEqual(table.intern(3), 3)
+        self.assertEqual(table.stats()['lookups'], 0)
+
+    def test_stats(self):
+        table = SymbolTable()
+        for i in range(3):
+            table.intern(''.join(['state', '-1']))
+        value = 'state-1'
+        self.assertEqual(table.stats(), {
+                         'symbols': 1, 'lookups': 3, 'duplicates': 2,
+                         'bytes_saved': 2 * sys.getsizeof(value),
+                         'bytes_held': sys.getsizeof(value)})
+        table.clear()
+        self.assertEqual(table.stats()['lookups'], 0)
+        self.assertEqual(len(table), 0)
+
+    def test_sweep_drops_unused_strings(self):
+        table = SymbolTable()
+        kept = table.intern(''.join(['state', '-1']))
+        table.intern(''.join(['state', '-2']))
+        holder = {'state_id': table.intern(''.join(['state', '-3']))}
+        self.assertEqual(table.sweep(), 1)
+        self.assertEqual(len(table), 2)
+        self.assertIs(table.intern(''.join(['state', '-1'])), kept)
+        self.assertIs(table.intern(''.join(['state', '-3'])),
+                      holder['state_id'])
+        self.assertEqual(table.stats()['bytes_held'],
+                         2 * sys.getsizeof(kept))
+
+    def test_table_is_swept_as_it_grows(self):
+        table = SymbolTable()
+        for i in range(5000):
+            table.intern('state-{}'.format(i))
+        self.assertLess(len(table), 2048)
+        kept = [table.intern('city-{}'.format(i)) for i in range(5000)]
+        self.assertGreaterEqual(len(table), 5000)
+        self.assertTrue(all(table.intern(''.join(['city-', str(i)])) is value
+                            for i, value in enumerate(kept)))
@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""Test Module for the full-text index"""
+import unittest
+from unittest.mock import patch
+import pep8
+from models.engine.text_index import TextIndex, stem
+
+
+class TestTextIndex_pep8(unittest.TestCase):
+    """Unittest for TextIndex class docs and style"""
+
+    def test_docstring(self):
+        """checks for docstrings"""
+        self.assertIsNotNone(TextIndex.__doc__)
+        self.assertIsNotNone(TextIndex.put.__doc__)
+        self.assertIsNotNone(TextIndex.search.__doc__)
+
+    def test_pep8(self):
+        """Checks PEP8 compliance"""
+        msg = "PEP8 incompliant, errors found"
+        style = pep8.StyleGuide()
+        res = style.check_files(["models/engine/text_index.py"])
+        self.assertEqual(res.total_errors, 0, msg)
+
+
+class TestTextIndex(unittest.TestCase):
+    """Unittest for TextIndex class"""
+
+    def setUp(self):
+        self.index = TextIndex()
+        self.index.put('a', "Sunny loft with a pool and a view of the bay")
+        self.index.put('b', "Quiet house, pools nearby, pool table inside")
+        self.index.put('c', "Cozy cabin in the woods")
+        self.index.put('d', None)
+
+    def keys(self, query, limit=None):
+        return [key for score, key in self.index.search(query, limit)]
+
+    def test_stem(self):
+        self.assertEqual(stem("houses"), stem("house"))
+        self.assertEqual(stem("housing"), stem("house"))
+        self.assertEqual(stem("swimming"), stem("swim"))
+        self.assertEqual(stem("cities"), "city")
+        self.assertEqual(stem("bus"), "bus")
+
+    def test_tokens(self):
+        self.assertEqual(self.index.tokens("The Pools, of_Paris 42!"),
+                         ['pool', 'paris', '42'])
+        with patch.object(TextIndex, 'stemming', False):
+            self.assertEqual(self.index.tokens("The Pools"), ['pools'])
+
+    def test_search_ranks_with_bm25(self):
+        self.assertEqual(self.keys("pool"), ['b', 'a'])
+        self.assertEqual(self.keys("pool", 1), ['b'])
+        self.assertEqual(self.keys("cabin pool"), ['c', 'b', 'a'])
+        self.assertEqual(self.keys("the"), [])
+        self.assertEqual(self.keys("castle"), [])
+
+    def test_put_replaces_and_remove_drops(self):
+        self.index.put('c', "Cabin with a pool")
+        self.assertEqual(self.keys("woods"), [])
+        self.assertIn('c', self.keys("pool"))
+        self.index.remove('b')
+        self.index.remove('b')
+        self.assertEqual(sorted(self.keys("pools")), ['a', 'c'])
+        self.assertNotIn('pool', [term for term in self.index.postings
+                                  if 'b' in self.index.postings[term]])
+        self.index.clear()
+        self.assertEqual(self.keys("pool"), [])
+
+    def test_dump_and_load(self):
+        data = self.index.dump()
+        index = TextIndex()
+        self.assertTrue(index.load(data))
+        self.assertFalse(index.changed)
+        self.assertEqual(index.search("pool"), self.index.search("pool"))
+        index.put('a', "Sunny loft with a pool and a view of the bay")
+        self.assertFalse(index.changed)
+        with patch.object(TextIndex, 'stemming', False):
+            self.assertFalse(TextIndex().load(data))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -186,6 +186,20 @@ class TestState(unittest.TestCase):
         cities = self.inst.cities
         self.assertTrue(list, type(cities))
 
+    @unittest.skipIf(os.getenv('HBNB_TYPE_STORAGE') == 'db',
+                     "Testing FileStorage")
+    def test_cities_follow_state_id(self):
+        """Test cities are looked up through the state_id index"""
+        state = State(name="Nevada")
+        city = City(name="Reno", state_id=state.id)
+        self.filestorage.new(city)
+        self.assertEqual(state.cities, [city])
+        city.state_id = self.inst.id
+        self.assertEqual(state.cities, [])
+        self.assertIn(city, self.inst.cities)
+        self.filestorage.delete(city)
+        self.assertNotIn(city, self.inst.cities)
+
     @unittest.skipIf(
             os.getenv("HBNB_TYPE_STORAGE") == 'db',
             "testing file_storage")
@@ -18,7 +18,7 @@ def teardown(exception):
 @app.route('/hbnb_filters', strict_slashes=False)
 def hbnb_filters():
     """ displays the states, cities & amenities """
-    states = storage.all(State).values()
+    states = storage.query(State).load('cities').all()
     amenities = storage.all(Amenity).values()
 
     return render_template('10-hbnb_filters.html',
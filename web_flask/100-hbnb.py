@@ -1,6 +1,6 @@
 #!/usr/bin/python3
 """starts a Flask web application"""
-from flask import Flask, abort, render_template
+from flask import Flask, abort, render_template, request
 from models import storage
 from models.state import State
 from models.amenity import Amenity
@@ -18,10 +18,16 @@ def teardown(exception):
 
 @app.route('/hbnb', strict_slashes=False)
 def hbnb():
-    """ displays the states, cities & amenities """
-    states = storage.all(State).values()
+    """ displays the states, cities & amenities, and the places offering
+    every ?amenity=<id> given, or any of them with ?match=any """
+    states = storage.query(State).load('cities').all()
     amenities = storage.all(Amenity).values()
-    places = storage.all(Place).values()
+    wanted = request.args.getlist('amenity')
+    if wanted:
+        places = storage.with_amenities(
+            wanted, match_any=request.args.get('match') == 'any')
+    else:
+        places = storage.all(Place).values()
 
     return render_template('100-hbnb.html',
                            states=states, amenities=amenities,
@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+"""starts a Flask web application"""
+from flask import Flask, abort, jsonify, request
+from models import storage
+from models.engine.geo_index import distance
+
+
+app = Flask(__name__)
+
+
+@app.teardown_appcontext
+def teardown(exception):
+    """ Remove the current SQLAlchemy Session """
+    storage.close()
+
+
+def coordinate(name, default=None):
+    """ returns the float query argument name, 400 if it is not one """
+    value = request.args.get(name, default, type=float)
+    if value is None:
+        abort(400)
+    return value
+
+
+@app.route('/places/nearby', strict_slashes=False)
+def places_nearby():
+    """ lists the places within radius km of lat, lon, nearest first """
+    lat, lon = coordinate('lat'), coordinate('lon')
+    radius = coordinate('radius', 10.0)
+    limit = request.args.get('limit', 50, type=int)
+    places = []
+    for place in storage.nearby(lat, lon, radius, limit):
+        item = place.to_dict()
+        item['distance_km'] = round(distance(lat, lon, place.latitude,
+                                             place.longitude), 3)
+        places.append(item)
+    return jsonify(places)
+
+
+@app.route('/places/within', strict_slashes=False)
+def places_within():
+    """ lists the places inside the south, west, north, east box """
+    box = [coordinate(side) for side in ('south', 'west', 'north', 'east')]
+    return jsonify([place.to_dict() for place in storage.within_bbox(*box)])
+
+
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=5000)
@@ -0,0 +1,29 @@
+#!/usr/bin/python3
+"""starts a Flask web application"""
+from flask import Flask, abort, jsonify, request
+from models import storage
+
+
+app = Flask(__name__)
+
+
+@app.teardown_appcontext
+def teardown(exception):
+    """ Remove the current SQLAlchemy Session """
+    storage.close()
+
+
+@app.route('/search', strict_slashes=False, defaults={'cls': 'Place'})
+@app.route('/search/<cls>', strict_slashes=False)
+def search(cls):
+    """ lists the places, or the reviews, best matching ?q=, best first """
+    if cls not in ('Place', 'Review'):
+        abort(404)
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', 10, type=int)
+    return jsonify([obj.to_dict()
+                    for obj in storage.search(cls, query, limit)])
+
+
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=5000)
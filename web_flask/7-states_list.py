@@ -17,8 +17,7 @@ def teardown(exception):
 @app.route('/states_list', strict_slashes=False)
 def states_list():
     """ displays a list of the states """
-    states = storage.all(State).values()
-    sorted_states = sorted(states, key=lambda x: x.name)
+    sorted_states = storage.query(State).order_by('name').all()
 
     return render_template('7-states_list.html', states=sorted_states)
 
@@ -17,7 +17,7 @@ def teardown(exception):
 @app.route('/cities_by_states', strict_slashes=False)
 def cities_by_states():
     """ displays a list of the cities by states """
-    states = storage.all(State).values()
+    states = storage.query(State).load('cities').all()
 
     return render_template('8-cities_by_states.html', states=states)
 
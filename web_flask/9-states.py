@@ -18,16 +18,12 @@ def teardown(exception):
 @app.route('/states/<id>', strict_slashes=False)
 def state_cities(id):
     """ displace the cities of a state id """
-    states = storage.all(State).values()
-    sorted_states = sorted(states, key=lambda x: x.name)
     if id is None:
+        sorted_states = storage.query(State).order_by('name').all()
         return render_template('7-states_list.html', states=sorted_states)
 
-    for state in sorted_states:
-        if state.id == id:
-            return render_template('9-states.html', state=state)
-
-    return render_template('9-states.html', state=None)
+    state = storage.get(State, id)
+    return render_template('9-states.html', state=state)
 
 
 if __name__ == '__main__':